@@ -0,0 +1,107 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'template'))
+
+# 같은 답변으로 반복 요청하므로 response cache 를 켜 두면 생성 없이 cache 에서 바로 응답해서 측정이 의미 없어짐
+os.environ.setdefault("POLYGLOT_RESPONSE_CACHE_ENABLED", "0")
+
+from user_defined_protocol.command_scheduler import CommandScheduler
+from user_defined_protocol.protocol import UserDefinedProtocolNumber
+from user_defined_protocol.register import UserDefinedProtocolRegister
+
+# DART / OpenAI 호출 없이 보고서 생성의 부하 모양(동기 응답 대기 + HTML 파싱)만 흉내 냄
+REPORT_SECONDS = float(os.getenv("BENCHMARK_REPORT_SECONDS", "10"))
+
+WARMUP_USER_ANSWER = "저는 팀 프로젝트에서 백엔드 API 설계와 구현을 맡았고, 팀원들과 매일 진행 상황을 공유했습니다."
+WARMUP_NEXT_INTENT = "협업 능력"
+
+
+class SimulatedReportService:
+    async def makingReport(self, request=None):
+        endTime = time.perf_counter() + REPORT_SECONDS
+        while time.perf_counter() < endTime:
+            time.sleep(0.05)
+            "".join(f"<tr><td>{index}</td></tr>" for index in range(2000)).split("</tr>")
+
+        return {"aiResult": {}}
+
+
+def percentile(valueList, percent):
+    sortedValueList = sorted(valueList)
+    index = min(len(sortedValueList) - 1, int(round(percent / 100 * (len(sortedValueList) - 1))))
+
+    return round(sortedValueList[index], 3)
+
+async def dispatchCommand(useScheduler, protocolNumber, handler, *arg):
+    # 스케줄러를 쓰지 않으면 기존처럼 공유 이벤트 루프에서 handler 를 바로 실행
+    if useScheduler:
+        return await CommandScheduler.getInstance().run(protocolNumber, handler, *arg)
+
+    return await handler(*arg)
+
+async def measureInterviewLatency(useScheduler, interviewCount, intervalSeconds):
+    questionService = UserDefinedProtocolRegister.loadPolyglotQuestionService()
+    loop = asyncio.get_running_loop()
+
+    async def requestQuestion(arrivalTime):
+        await dispatchCommand(useScheduler, UserDefinedProtocolNumber.POLYGLOT_QUESTION,
+                              questionService.generateNextQuestion, WARMUP_USER_ANSWER, WARMUP_NEXT_INTENT)
+        return time.perf_counter() - arrivalTime
+
+    # 세션들이 일정 간격으로 다음 질문을 요청하는 상황 - socket 수신처럼 이벤트 루프 밖의 thread 에서 도착시켜서
+    # 이벤트 루프가 막혀 있던 시간도 지연 시간에 포함되게 함
+    def sendInterviewCommand():
+        futureList = []
+        for _ in range(interviewCount):
+            futureList.append(asyncio.run_coroutine_threadsafe(requestQuestion(time.perf_counter()), loop))
+            time.sleep(intervalSeconds)
+
+        return futureList
+
+    futureList = await asyncio.to_thread(sendInterviewCommand)
+    latencyList = await asyncio.gather(*[asyncio.wrap_future(future) for future in futureList])
+
+    return {"p50Latency": percentile(latencyList, 50), "p95Latency": percentile(latencyList, 95)}
+
+async def measureScenario(useScheduler, interviewCount, intervalSeconds, reportCount):
+    reportService = SimulatedReportService()
+
+    idleResult = await measureInterviewLatency(useScheduler, interviewCount, intervalSeconds)
+
+    # 면접 요청이 이어지는 도중에 보고서 생성 명령이 들어오는 상황
+    busyTask = asyncio.create_task(measureInterviewLatency(useScheduler, interviewCount, intervalSeconds))
+    await asyncio.sleep(intervalSeconds)
+    reportTaskList = [asyncio.create_task(dispatchCommand(useScheduler, UserDefinedProtocolNumber.REPORT_MAKING,
+                                                          reportService.makingReport, None))
+                      for _ in range(reportCount)]
+    busyResult = await busyTask
+    await asyncio.gather(*reportTaskList)
+
+    return {"idle": idleResult, "duringReport": busyResult}
+
+def compareScheduling(interviewCount, intervalSeconds, reportCount):
+    from polyglot_model.service.polyglot_model_service_impl import PolyglotModelServiceImpl
+
+    PolyglotModelServiceImpl.getInstance().loadModel()
+    asyncio.run(UserDefinedProtocolRegister.loadPolyglotQuestionService().warmup())
+
+    return {
+        "schedulerStatus": CommandScheduler.getInstance().getStatus(),
+        "withoutScheduler": asyncio.run(measureScenario(False, interviewCount, intervalSeconds, reportCount)),
+        "withScheduler": asyncio.run(measureScenario(True, interviewCount, intervalSeconds, reportCount)),
+    }
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="보고서 생성 중 면접 질문 생성 지연 시간 (protocol 우선순위 스케줄링 전후)")
+    parser.add_argument("--interviews", type=int, default=20)
+    parser.add_argument("--interval", type=float, default=0.2)
+    parser.add_argument("--reports", type=int, default=2)
+    args = parser.parse_args()
+
+    # 마지막 줄은 항상 한 줄짜리 JSON 으로 출력해서 다른 프로세스가 결과를 읽을 수 있도록 함
+    print(json.dumps(compareScheduling(args.interviews, args.interval, args.reports), ensure_ascii=False))
@@ -0,0 +1,52 @@
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'template'))
+
+from polyglot_benchmark.repository.polyglot_benchmark_repository_impl import PolyglotBenchmarkRepositoryImpl
+from polyglot_benchmark.service.polyglot_benchmark_service_impl import PolyglotBenchmarkServiceImpl
+from polyglot_model.service.polyglot_model_service_impl import PolyglotModelServiceImpl
+
+polyglotModelService = PolyglotModelServiceImpl.getInstance()
+polyglotBenchmarkRepository = PolyglotBenchmarkRepositoryImpl.getInstance()
+polyglotBenchmarkService = PolyglotBenchmarkServiceImpl.getInstance()
+
+def exportMergedModel(dtypeName):
+    # models/cache 의 base model 에 interview / score adapter 를 병합해서 safetensors 로 저장
+    return polyglotModelService.exportMergedModel(dtypeName)
+
+def exportOnnxModel(promptFilePath, maxNewTokens):
+    # parity 확인은 benchmark 용 고정 프롬프트를 adapter 별로 나눠서 사용
+    paritySourceDict = {}
+    for promptData in polyglotBenchmarkRepository.readPromptList(promptFilePath):
+        adapterName = polyglotBenchmarkRepository.ADAPTER_NAME_DICT[promptData["protocol"]]
+        paritySourceDict.setdefault(adapterName, []).append(polyglotBenchmarkRepository.buildSource(promptData))
+
+    parityReportDict = polyglotModelService.exportOnnxModel(paritySourceDict)
+
+    # 단일 sequence logits 비교만으로는 engine 이 넘기는 padding / 합쳐진 cache 입력을 확인할 수 없으므로
+    # continuous batching engine 경로로 PyTorch 와 생성 결과를 비교해서 통과해야 onnx backend 로 적재됨
+    parityReportDict["engine"] = polyglotBenchmarkService.checkOnnxEngineParity(promptFilePath, maxNewTokens)
+
+    return parityReportDict
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="LoRA adapter 를 병합한 반 정밀도 safetensors 또는 ONNX 모델 생성")
+    parser.add_argument("--format", choices=["safetensors", "onnx"], default="safetensors")
+    parser.add_argument("--dtype", choices=["bfloat16", "float16"], default="bfloat16")
+    parser.add_argument("--prompt-file", default=polyglotBenchmarkRepository.DEFAULT_PROMPT_FILE_PATH)
+    parser.add_argument("--max-new-tokens", type=int, default=32, help="engine 경로 parity 확인에서 생성할 토큰 수")
+    args = parser.parse_args()
+
+    if args.format == "onnx":
+        parityReportDict = exportOnnxModel(args.prompt_file, args.max_new_tokens)
+        print(f"engine parity: {parityReportDict['engine']}")
+        if parityReportDict["engine"]["isPassed"]:
+            print("POLYGLOT_BACKEND=onnx 로 설정하면 AI client 가 ONNX Runtime 으로 추론합니다")
+        else:
+            print("engine 경로 parity 확인에 실패해서 onnx backend 로 적재할 수 없습니다")
+            sys.exit(1)
+    else:
+        exportMergedModel(args.dtype)
+        print("POLYGLOT_MODEL_FORMAT=merged 로 설정하면 AI client 가 병합된 모델을 사용합니다")
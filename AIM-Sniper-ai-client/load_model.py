@@ -1,19 +1,11 @@
 import os
+import sys
 
-from transformers import AutoModelForCausalLM, AutoTokenizer
+sys.path.append(os.path.join(os.path.dirname(__file__), 'template'))
 
-cacheDir = os.path.join("models", "cache")  # 원하는 경로로 변경 가능
+from polyglot_model.service.polyglot_model_service_impl import PolyglotModelServiceImpl
 
-# 모델 다운로드
-model = AutoModelForCausalLM.from_pretrained(
-    "EleutherAI/polyglot-ko-1.3b",
-    cache_dir=cacheDir,
-    trust_remote_code=True
-)
-
-# 토크나이저 다운로드
-tokenizer = AutoTokenizer.from_pretrained(
-    "EleutherAI/polyglot-ko-1.3b",
-    cache_dir=cacheDir,
-    trust_remote_code=True
-)
\ No newline at end of file
+# AI client 기동 시에도 같은 확인 / 다운로드를 하므로, 이미지 빌드 등에서 미리 받아둘 때만 실행
+# (models/cache 에 base model 을 받고, adapter 등 나머지 모델 파일이 준비되어 있는지 확인)
+polyglotModelService = PolyglotModelServiceImpl.getInstance()
+polyglotModelService.prefetchModel()
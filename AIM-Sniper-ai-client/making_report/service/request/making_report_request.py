@@ -5,15 +5,16 @@ from user_defined_protocol.protocol import UserDefinedProtocolNumber
 class MakingReportRequest(BaseRequest):
     def __init__(self, **kwargs):
         self.__protocolNumber = UserDefinedProtocolNumber.REPORT_MAKING.value
-
+        self.requestId = kwargs.get('requestId')
 
     def getProtocolNumber(self):
         return self.__protocolNumber
 
     def toDictionary(self):
         return {
-            "protocolNumber": self.__protocolNumber
+            "protocolNumber": self.__protocolNumber,
+            "requestId": self.requestId
         }
 
     def __str__(self):
-        return f"MakingReportRequest(protocolNumber={self.__protocolNumber})"
\ No newline at end of file
+        return f"MakingReportRequest(protocolNumber={self.__protocolNumber}, requestId={self.requestId})"
\ No newline at end of file
@@ -0,0 +1,23 @@
+from abc import ABC, abstractmethod
+
+
+class PipelineMetricsRepository(ABC):
+    @abstractmethod
+    def increment(self, name, labelDict, amount=1):
+        pass
+
+    @abstractmethod
+    def setGauge(self, name, labelDict, value):
+        pass
+
+    @abstractmethod
+    def observe(self, name, labelDict, value, bucketList=None):
+        pass
+
+    @abstractmethod
+    def registerGaugeProvider(self, gaugeProvider):
+        pass
+
+    @abstractmethod
+    def snapshot(self):
+        pass
@@ -0,0 +1,121 @@
+import bisect
+import threading
+
+from pipeline_metrics.repository.pipeline_metrics_repository import PipelineMetricsRepository
+
+
+class PipelineMetricsRepositoryImpl(PipelineMetricsRepository):
+    __instance = None
+
+    # 처리 시간 histogram 의 기본 구간(초) - decode step 같은 수 ms 단위부터 보고서 생성 같은 수 분 단위까지
+    DEFAULT_BUCKET_LIST = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+    # AI client 가 기록하는 metric 목록 (FastAPI /metrics 의 HELP 로 그대로 표시됨)
+    METRIC_HELP_DICT = {
+        "command_total": "protocol 명령 처리 결과별 개수 (ok / rejected / error)",
+        "command_stage_seconds": "protocol 명령의 단계별 시간 (queue: scheduler slot 대기, execute: handler 실행)",
+        "command_running": "scheduler slot 을 잡고 실행 중인 명령 수",
+        "command_waiting": "scheduler slot 을 기다리는 protocol 별 명령 수",
+        "protocol_service_load_total": "protocol 서비스(모델 포함)를 처음 적재한 횟수",
+        "protocol_service_load_seconds": "protocol 서비스를 처음 적재하는 데 걸린 시간",
+        "model_load_total": "polyglot 모델 적재 횟수",
+        "model_load_seconds": "polyglot 모델 적재 시간",
+        "inference_queue_seconds": "sequence 가 제출된 뒤 prefill 로 batch 에 합류하기까지의 시간",
+        "inference_prefill_seconds": "sequence group 하나의 prefill 시간",
+        "inference_decode_step_seconds": "decoding batch 한 step 의 시간",
+        "inference_sequence_seconds": "sequence 하나가 제출부터 생성 완료까지 걸린 시간",
+        "inference_generated_tokens_total": "adapter 별 생성 토큰 수 (rate 가 tokens/sec)",
+        "inference_tokens_per_second": "최근 decode step 의 adapter 별 생성 속도",
+        "inference_pending_groups": "inference engine 에 합류를 기다리는 sequence group 수",
+        "inference_running_sequences": "adapter 별 decoding batch 에 올라가 있는 sequence 수",
+        "stage_workers": "단계별 worker thread 수",
+        "stage_utilization": "단계별 worker 사용률 (auto tuner 가 마지막으로 잰 구간)",
+        "stream_send_seconds": "token stream frame 하나의 직렬화 + 전송 시간",
+        "stream_sent_bytes_total": "token stream 으로 보낸 frame 크기 합",
+        "response_cache_lookup_total": "질문 생성 / 채점 response cache 조회 결과별 개수 (exact / semantic / miss)",
+        "response_cache_entries": "response cache 에 저장된 응답 수",
+        "response_cache_hit_ratio": "프로세스 시작 이후 response cache 적중률",
+    }
+
+    def __new__(cls):
+        if cls.__instance is None:
+            cls.__instance = super().__new__(cls)
+            cls.__instance.__lock = threading.Lock()
+
+            # (이름, 정렬된 label 목록) → 값 (histogram 은 구간 / 구간별 개수 / 합 / 개수)
+            cls.__instance.__counterDict = {}
+            cls.__instance.__gaugeDict = {}
+            cls.__instance.__histogramDict = {}
+
+            # snapshot 을 만들 때마다 호출해서 (이름, label, 값) 목록을 돌려받는 함수 (대기열 길이처럼 그때그때 읽는 값)
+            cls.__instance.__gaugeProviderList = []
+
+        return cls.__instance
+
+    @classmethod
+    def getInstance(cls):
+        if cls.__instance is None:
+            cls.__instance = cls()
+
+        return cls.__instance
+
+    @staticmethod
+    def __toKey(name, labelDict):
+        return name, tuple(sorted((str(key), str(value)) for key, value in labelDict.items()))
+
+    def increment(self, name, labelDict, amount=1):
+        key = self.__toKey(name, labelDict)
+        with self.__lock:
+            self.__counterDict[key] = self.__counterDict.get(key, 0) + amount
+
+    def setGauge(self, name, labelDict, value):
+        with self.__lock:
+            self.__gaugeDict[self.__toKey(name, labelDict)] = value
+
+    def observe(self, name, labelDict, value, bucketList=None):
+        key = self.__toKey(name, labelDict)
+        with self.__lock:
+            histogram = self.__histogramDict.get(key)
+            if histogram is None:
+                bucketList = tuple(bucketList or self.DEFAULT_BUCKET_LIST)
+                histogram = {"bucketList": bucketList, "countList": [0] * len(bucketList), "sum": 0.0, "count": 0}
+                self.__histogramDict[key] = histogram
+
+            bucketIndex = bisect.bisect_left(histogram["bucketList"], value)
+            if bucketIndex < len(histogram["bucketList"]):
+                histogram["countList"][bucketIndex] += 1
+            histogram["sum"] += value
+            histogram["count"] += 1
+
+    def registerGaugeProvider(self, gaugeProvider):
+        self.__gaugeProviderList.append(gaugeProvider)
+
+    def snapshot(self):
+        # 누적 값 그대로 보내므로 받는 쪽은 노드별 최신 snapshot 으로 교체만 하면 됨
+        # (msgpack 은 dict key 로 tuple 을 쓸 수 없어서 series 는 목록으로 보냄)
+        gaugeList = [{"name": name, "labels": {str(key): str(label) for key, label in labelDict.items()},
+                      "value": value}
+                     for gaugeProvider in self.__gaugeProviderList for name, labelDict, value in gaugeProvider()]
+
+        with self.__lock:
+            histogramList = []
+            for (name, labelList), histogram in self.__histogramDict.items():
+                cumulativeCountList = []
+                cumulativeCount = 0
+                for count in histogram["countList"]:
+                    cumulativeCount += count
+                    cumulativeCountList.append(cumulativeCount)
+
+                histogramList.append({"name": name, "labels": dict(labelList),
+                                      "bucketList": list(histogram["bucketList"]),
+                                      "bucketCountList": cumulativeCountList,
+                                      "sum": histogram["sum"], "count": histogram["count"]})
+
+            return {
+                "helpDict": self.METRIC_HELP_DICT,
+                "counterList": [{"name": name, "labels": dict(labelList), "value": value}
+                                for (name, labelList), value in self.__counterDict.items()],
+                "gaugeList": gaugeList + [{"name": name, "labels": dict(labelList), "value": value}
+                                          for (name, labelList), value in self.__gaugeDict.items()],
+                "histogramList": histogramList,
+            }
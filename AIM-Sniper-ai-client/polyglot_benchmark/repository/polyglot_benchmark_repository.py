@@ -0,0 +1,63 @@
+from abc import ABC, abstractmethod
+
+
+class PolyglotBenchmarkRepository(ABC):
+    @abstractmethod
+    def readPromptList(self, promptFilePath):
+        pass
+
+    @abstractmethod
+    def buildSource(self, promptData):
+        pass
+
+    @abstractmethod
+    def getGenerationSetting(self, protocol):
+        pass
+
+    @abstractmethod
+    def getPromptPrefix(self, protocol):
+        pass
+
+    @abstractmethod
+    def getResidentMemoryMB(self):
+        pass
+
+    @abstractmethod
+    def getProcessTreeMemoryMB(self):
+        pass
+
+    @abstractmethod
+    def getPeakResidentMemoryMB(self):
+        pass
+
+    @abstractmethod
+    def measureReferenceWorkloadMs(self):
+        pass
+
+    @abstractmethod
+    def getHostDict(self):
+        pass
+
+    @abstractmethod
+    def runBenchmarkInSubprocess(self, benchmarkName, environmentDict, argumentList=()):
+        pass
+
+    @abstractmethod
+    def measureGeneration(self, model, tokenizer, source, maxNewTokens):
+        pass
+
+    @abstractmethod
+    def buildTinyModel(self, tinyModelPath, promptList):
+        pass
+
+    @abstractmethod
+    def appendResult(self, resultFilePath, result):
+        pass
+
+    @abstractmethod
+    def readBaseline(self, baselineFilePath):
+        pass
+
+    @abstractmethod
+    def writeBaseline(self, baselineFilePath, result):
+        pass
@@ -0,0 +1,271 @@
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import time
+
+import psutil
+import torch
+from peft import LoraConfig, get_peft_model
+from tokenizers import Tokenizer, decoders, models, pre_tokenizers, trainers
+from transformers import GPTNeoXConfig, GPTNeoXForCausalLM, PreTrainedTokenizerFast
+
+from polyglot_benchmark.repository.polyglot_benchmark_repository import PolyglotBenchmarkRepository
+from polyglot_model.repository.polyglot_model_repository_impl import PolyglotModelRepositoryImpl
+from polyglot_question.repository.polyglot_question_repository_impl import PolyglotQuestionRepositoryImpl
+from polyglot_score.repository.polyglot_score_repository_impl import PolyglotScoreRepositoryImpl
+
+
+class PolyglotBenchmarkRepositoryImpl(PolyglotBenchmarkRepository):
+    __instance = None
+
+    DEFAULT_PROMPT_FILE_PATH = os.path.join("assets", "polyglot_benchmark_prompt.jsonl")
+
+    # benchmark 프롬프트의 protocol 값과 사용하는 LoRA adapter 이름의 대응
+    ADAPTER_NAME_DICT = {
+        "question": "interview",
+        "score": "score",
+    }
+
+    DEFAULT_TINY_MODEL_PATH = os.path.join("models", "tiny-polyglot")
+
+    # polyglot-ko-1.3b 와 같은 GPT-NeoX 구조(rotary 절반 적용, parallel residual, gelu)를 크기만 줄인 random weight 모델
+    # - 출력 품질이 아니라 적재 / prefill / decode 경로의 상대적인 성능 변화를 GPU 와 network 없이 재기 위한 용도
+    TINY_MODEL_CONFIG = {
+        "hidden_size": 128,
+        "num_hidden_layers": 4,
+        "num_attention_heads": 4,
+        "intermediate_size": 512,
+        "rotary_pct": 0.5,
+        "rotary_emb_base": 10000,
+        "max_position_embeddings": 2048,
+        "use_parallel_residual": True,
+        "hidden_act": "gelu",
+        "layer_norm_eps": 1e-5,
+        "tie_word_embeddings": False,
+    }
+    TINY_VOCAB_SIZE = 2048
+    TINY_LORA_CONFIG = {"r": 8, "lora_alpha": 16, "target_modules": ["query_key_value"], "lora_dropout": 0.0}
+    TINY_MODEL_SEED = 1234
+    TINY_EOS_TOKEN = "<|endoftext|>"
+
+    # host 속도 기준값을 재는 고정 작업 - 작은 모델의 hidden 크기 정도의 행렬 곱을 반복
+    REFERENCE_MATRIX_SIZE = 128
+    REFERENCE_MATMUL_COUNT = 200
+    REFERENCE_REPEAT_COUNT = 7
+
+    def __new__(cls):
+        if cls.__instance is None:
+            cls.__instance = super().__new__(cls)
+
+        return cls.__instance
+
+    @classmethod
+    def getInstance(cls):
+        if cls.__instance is None:
+            cls.__instance = cls()
+
+        return cls.__instance
+
+    def readPromptList(self, promptFilePath):
+        with open(promptFilePath, "r", encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def buildSource(self, promptData):
+        if promptData["protocol"] == "question":
+            return PolyglotQuestionRepositoryImpl.prompt.format_map(
+                dict(answer=promptData["userAnswer"], intent=promptData["nextIntent"]))
+
+        return PolyglotScoreRepositoryImpl.prompt.format_map(
+            dict(question=promptData["question"], answer=promptData["userAnswer"], intent=promptData["intent"]))
+
+    def getGenerationSetting(self, protocol):
+        if protocol == "question":
+            return PolyglotQuestionRepositoryImpl.QUESTION_MAX_NEW_TOKENS, PolyglotQuestionRepositoryImpl.STOP_SEQUENCE_LIST
+
+        return PolyglotScoreRepositoryImpl.SCORE_MAX_NEW_TOKENS, PolyglotScoreRepositoryImpl.STOP_SEQUENCE_LIST
+
+    def getPromptPrefix(self, protocol):
+        if protocol == "question":
+            return PolyglotQuestionRepositoryImpl.promptPrefix
+
+        return PolyglotScoreRepositoryImpl.promptPrefix
+
+    def getResidentMemoryMB(self):
+        return round(psutil.Process(os.getpid()).memory_info().rss / (1024 ** 2), 1)
+
+    def getProcessTreeMemoryMB(self):
+        # fork 된 worker 는 weight 를 공유하므로 RSS 합계는 중복 집계됨
+        # PSS(공유 page 를 나눠서 집계) / USS(프로세스 고유 page) 합계가 실제 사용량에 가까움 (Linux 에서만 PSS 제공)
+        process = psutil.Process(os.getpid())
+        processList = [process] + process.children(recursive=True)
+
+        memoryDict = {"processCount": len(processList), "rssMB": 0.0, "pssMB": 0.0, "ussMB": 0.0}
+        for eachProcess in processList:
+            memoryInfo = eachProcess.memory_full_info()
+            memoryDict["rssMB"] += memoryInfo.rss / (1024 ** 2)
+            memoryDict["pssMB"] += getattr(memoryInfo, "pss", memoryInfo.uss) / (1024 ** 2)
+            memoryDict["ussMB"] += memoryInfo.uss / (1024 ** 2)
+
+        return {key: round(value, 1) for key, value in memoryDict.items()}
+
+    def getPeakResidentMemoryMB(self):
+        process = psutil.Process(os.getpid())
+
+        # Windows 는 psutil 이 최대 working set 을 제공하고, 그 외에는 getrusage 의 ru_maxrss 를 사용
+        if hasattr(process.memory_info(), "peak_wset"):
+            return round(process.memory_info().peak_wset / (1024 ** 2), 1)
+
+        import resource
+        maxResidentMemory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        if sys.platform == "darwin":
+            return round(maxResidentMemory / (1024 ** 2), 1)
+
+        return round(maxResidentMemory / 1024, 1)
+
+    def measureReferenceWorkloadMs(self):
+        # 모델과 무관한 고정 작업(작은 행렬 곱 반복)의 시간 - 같은 실행 안에서 재서 host 속도 차이를 나누는 기준값으로 씀
+        # (decode 와 비슷하게 작은 행렬 곱이 연속되는 작업이고, 흔들림을 줄이려고 여러 번 재서 중앙값을 사용)
+        generator = torch.Generator().manual_seed(0)
+        left = torch.randn(self.REFERENCE_MATRIX_SIZE, self.REFERENCE_MATRIX_SIZE, generator=generator)
+        right = torch.randn(self.REFERENCE_MATRIX_SIZE, self.REFERENCE_MATRIX_SIZE, generator=generator)
+
+        elapsedTimeList = []
+        with torch.inference_mode():
+            for _ in range(self.REFERENCE_REPEAT_COUNT + 1):
+                startTime = time.perf_counter()
+                for _ in range(self.REFERENCE_MATMUL_COUNT):
+                    torch.matmul(left, right)
+                elapsedTimeList.append(time.perf_counter() - startTime)
+
+        # 첫 번째 실행은 warm-up 이므로 제외
+        elapsedTimeList = sorted(elapsedTimeList[1:])
+        return round(elapsedTimeList[len(elapsedTimeList) // 2] * 1000, 3)
+
+    def getHostDict(self):
+        processorName = platform.processor()
+        if os.path.exists("/proc/cpuinfo"):
+            with open("/proc/cpuinfo", "r", encoding="utf-8") as cpuInfoFile:
+                for line in cpuInfoFile:
+                    if line.startswith("model name"):
+                        processorName = line.split(":", 1)[1].strip()
+                        break
+
+        return {
+            "machine": platform.machine(),
+            "processor": processorName,
+            "cpuCount": os.cpu_count(),
+        }
+
+    def runBenchmarkInSubprocess(self, benchmarkName, environmentDict, argumentList=()):
+        # cold start / RSS 는 모델이 올라가지 않은 새 프로세스에서 측정해야 의미가 있음
+        projectRootPath = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        completedProcess = subprocess.run(
+            [sys.executable, "polyglot_benchmark_runner.py", benchmarkName, *argumentList],
+            cwd=projectRootPath,
+            env={**os.environ, **environmentDict},
+            capture_output=True,
+            text=True,
+            check=True)
+
+        return json.loads(completedProcess.stdout.strip().splitlines()[-1])
+
+    def measureGeneration(self, model, tokenizer, source, maxNewTokens):
+        input = tokenizer([source], return_tensors="pt", return_token_type_ids=False).to(model.device)
+
+        # 토큰 수를 고정해야 tokens/sec 비교가 의미 있으므로 min_new_tokens 를 함께 지정
+        generationStartTime = time.perf_counter()
+        with torch.no_grad():
+            output = model.generate(**input, max_new_tokens=maxNewTokens, min_new_tokens=maxNewTokens,
+                                    pad_token_id=tokenizer.pad_token_id)
+        elapsedTime = time.perf_counter() - generationStartTime
+
+        generatedTokenCount = output.shape[-1] - input["input_ids"].shape[-1]
+
+        return {"generatedTokenCount": generatedTokenCount, "elapsedTime": elapsedTime}
+
+    def __buildTinyTokenizer(self, corpusList):
+        # polyglot-ko 와 같은 byte-level BPE 를 benchmark 프롬프트로 학습 (byte 단위라 어떤 한글 입력도 토큰화됨)
+        tokenizer = Tokenizer(models.BPE())
+        tokenizer.pre_tokenizer = pre_tokenizers.ByteLevel(add_prefix_space=False)
+        tokenizer.decoder = decoders.ByteLevel()
+        tokenizer.train_from_iterator(corpusList, trainers.BpeTrainer(
+            vocab_size=self.TINY_VOCAB_SIZE, special_tokens=[self.TINY_EOS_TOKEN],
+            initial_alphabet=pre_tokenizers.ByteLevel.alphabet(), show_progress=False))
+
+        return PreTrainedTokenizerFast(tokenizer_object=tokenizer, bos_token=self.TINY_EOS_TOKEN,
+                                       eos_token=self.TINY_EOS_TOKEN, unk_token=self.TINY_EOS_TOKEN)
+
+    def buildTinyModel(self, tinyModelPath, promptList):
+        # PolyglotModelRepositoryImpl 이 POLYGLOT_BASE_MODEL / POLYGLOT_MODEL_ROOT 로 그대로 적재할 수 있는 배치로 저장
+        # (base model 은 base/, adapter 는 실제 모델과 같은 상대 경로)
+        fixtureSetting = {
+            "modelConfig": self.TINY_MODEL_CONFIG,
+            "vocabSize": self.TINY_VOCAB_SIZE,
+            "loraConfig": self.TINY_LORA_CONFIG,
+            "seed": self.TINY_MODEL_SEED,
+            "promptList": promptList,
+        }
+        fixtureFilePath = os.path.join(tinyModelPath, "fixture.json")
+        basePath = os.path.join(tinyModelPath, "base")
+        adapterPathDict = {
+            adapterName: os.path.join(tinyModelPath, os.path.relpath(adapterPath, PolyglotModelRepositoryImpl.modelRootPath))
+            for adapterName, adapterPath in PolyglotModelRepositoryImpl.adapterPathDict.items()
+        }
+
+        # 설정이 같으면 이전에 만든 모델을 재사용 - 매번 같은 weight 로 측정해야 결과를 baseline 과 비교할 수 있음
+        if os.path.exists(fixtureFilePath):
+            with open(fixtureFilePath, "r", encoding="utf-8") as f:
+                if json.load(f) == fixtureSetting:
+                    return {"tinyModelPath": tinyModelPath, "isBuilt": False, "buildTime": 0.0}
+
+            shutil.rmtree(tinyModelPath)
+
+        buildStartTime = time.perf_counter()
+        corpusList = [self.buildSource(promptData) for promptData in promptList]
+        tokenizer = self.__buildTinyTokenizer(corpusList)
+        tokenizer.save_pretrained(basePath)
+
+        torch.manual_seed(self.TINY_MODEL_SEED)
+        modelConfig = GPTNeoXConfig(vocab_size=len(tokenizer), bos_token_id=tokenizer.eos_token_id,
+                                    eos_token_id=tokenizer.eos_token_id, **self.TINY_MODEL_CONFIG)
+        GPTNeoXForCausalLM(modelConfig).save_pretrained(basePath, safe_serialization=True)
+
+        # LoRA B 를 0 이 아닌 random 값으로 초기화해야 adapter 마다 출력이 달라져서 실제 전환 / 병합 비용이 생김
+        for adapterIndex, (adapterName, adapterPath) in enumerate(adapterPathDict.items()):
+            torch.manual_seed(self.TINY_MODEL_SEED + adapterIndex + 1)
+            adapterModel = get_peft_model(GPTNeoXForCausalLM.from_pretrained(basePath), LoraConfig(
+                task_type="CAUSAL_LM", init_lora_weights=False, **self.TINY_LORA_CONFIG))
+            adapterModel.save_pretrained(adapterPath)
+
+        with open(fixtureFilePath, "w", encoding="utf-8") as f:
+            json.dump(fixtureSetting, f, ensure_ascii=False, indent=2)
+
+        return {"tinyModelPath": tinyModelPath, "isBuilt": True,
+                "buildTime": round(time.perf_counter() - buildStartTime, 3)}
+
+    def appendResult(self, resultFilePath, result):
+        # 실행마다 한 줄씩 쌓아서 commit 간 추이를 볼 수 있도록 JSON Lines 로 저장
+        resultDirectoryPath = os.path.dirname(resultFilePath)
+        if resultDirectoryPath:
+            os.makedirs(resultDirectoryPath, exist_ok=True)
+
+        with open(resultFilePath, "a", encoding="utf-8") as f:
+            f.write(json.dumps(result, ensure_ascii=False) + "\n")
+
+    def readBaseline(self, baselineFilePath):
+        if not os.path.exists(baselineFilePath):
+            return None
+
+        with open(baselineFilePath, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def writeBaseline(self, baselineFilePath, result):
+        baselineDirectoryPath = os.path.dirname(baselineFilePath)
+        if baselineDirectoryPath:
+            os.makedirs(baselineDirectoryPath, exist_ok=True)
+
+        with open(baselineFilePath, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
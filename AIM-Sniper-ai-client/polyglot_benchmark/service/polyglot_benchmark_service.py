@@ -0,0 +1,76 @@
+from abc import ABC, abstractmethod
+
+
+class PolyglotBenchmarkService(ABC):
+    @abstractmethod
+    def compareMergedAndAdapterSwitching(self, promptFilePath, maxNewTokens):
+        pass
+
+    @abstractmethod
+    def measureColdStart(self):
+        pass
+
+    @abstractmethod
+    def compareColdStart(self, modelFormatList):
+        pass
+
+    @abstractmethod
+    def compareContinuousBatching(self, promptFilePath, sessionCount, maxNewTokens):
+        pass
+
+    @abstractmethod
+    def compareBatchedScoring(self, promptFilePath, answerCount):
+        pass
+
+    @abstractmethod
+    def compareStopSequence(self, promptFilePath):
+        pass
+
+    @abstractmethod
+    def comparePrefixCache(self, promptFilePath):
+        pass
+
+    @abstractmethod
+    def measureInferenceSetting(self, promptFilePath, maxNewTokens):
+        pass
+
+    @abstractmethod
+    def compareQuantization(self, promptFilePath, maxNewTokens, environmentDict=None):
+        pass
+
+    @abstractmethod
+    def compareBackend(self, promptFilePath, maxNewTokens):
+        pass
+
+    @abstractmethod
+    def measureTimeToFirstToken(self, promptFilePath):
+        pass
+
+    @abstractmethod
+    def measureEngineParity(self, promptFilePath, maxNewTokens):
+        pass
+
+    @abstractmethod
+    def checkOnnxEngineParity(self, promptFilePath, maxNewTokens, environmentDict=None):
+        pass
+
+    @abstractmethod
+    def measureWorkerPool(self, promptFilePath, sessionCount, maxNewTokens):
+        pass
+
+    @abstractmethod
+    def compareWorkerPool(self, promptFilePath, maxWorkerCount, sessionCount, maxNewTokens):
+        pass
+
+    @abstractmethod
+    def measureMicroBenchmark(self, promptFilePath):
+        pass
+
+    @abstractmethod
+    def runMicroBenchmark(self, promptFilePath, tinyModelPath, resultFilePath, baselineFilePath, tolerance,
+                          updateBaseline):
+        pass
+
+    @abstractmethod
+    def checkTinyModelQuantization(self, promptFilePath, tinyModelPath, maxNewTokens):
+        pass
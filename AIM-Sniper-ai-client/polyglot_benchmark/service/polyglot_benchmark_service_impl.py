@@ -0,0 +1,769 @@
+import asyncio
+import os
+import platform
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import torch
+import transformers
+
+from polyglot_benchmark.repository.polyglot_benchmark_repository_impl import PolyglotBenchmarkRepositoryImpl
+from polyglot_benchmark.service.polyglot_benchmark_service import PolyglotBenchmarkService
+from polyglot_inference.repository.polyglot_inference_repository_impl import PolyglotInferenceRepositoryImpl
+from polyglot_inference.service.polyglot_inference_service_impl import PolyglotInferenceServiceImpl
+from polyglot_inference.utility.stop_sequence_criteria import StopSequenceCriteria
+from polyglot_inference.utility.streaming_text_decoder import StreamingTextDecoder
+from pipeline_metrics.repository.pipeline_metrics_repository_impl import PipelineMetricsRepositoryImpl
+from polyglot_model.repository.polyglot_model_repository_impl import PolyglotModelRepositoryImpl
+from polyglot_question.repository.polyglot_question_repository_impl import PolyglotQuestionRepositoryImpl
+from polyglot_score.repository.polyglot_score_repository_impl import PolyglotScoreRepositoryImpl
+
+
+class PolyglotBenchmarkServiceImpl(PolyglotBenchmarkService):
+    __instance = None
+
+    # micro benchmark 결과 중 baseline 과 비교하는 값 - tokensPerSecond 만 클수록 좋고 나머지는 작을수록 좋음
+    # (p95 prefill 은 프롬프트 몇 개의 ms 단위 값이라 흔들림이 커서 출력만 함)
+    MICRO_METRIC_LIST = ["modelLoadSeconds", "prefillMs", "questionLatencyMs", "scoreListLatencyMs",
+                         "interviewDecodeStepMs", "scoreDecodeStepMs", "tokensPerSecond", "peakResidentMemoryMB"]
+    HIGHER_IS_BETTER_METRIC_SET = {"tokensPerSecond"}
+    # 시간 값은 같은 실행에서 잰 기준 작업 시간으로 나눈 상대값으로 비교해서 host 가 달라도 비교할 수 있게 함
+    # 메모리는 host 속도와 무관하므로 절대값으로 비교하되, host / library 가 baseline 과 같을 때만 비교
+    ABSOLUTE_METRIC_SET = {"peakResidentMemoryMB"}
+    MICRO_HOST_KEY_LIST = ["machine", "processor", "cpuCount", "python", "torch", "transformers", "device"]
+
+    # engine parity 확인에서 다음 group 을 제출하기 전에 앞 group 이 만들어야 하는 토큰 수
+    ENGINE_PARITY_JOIN_TOKEN_COUNT = 3
+
+    def __new__(cls):
+        if cls.__instance is None:
+            cls.__instance = super().__new__(cls)
+            cls.__instance.__polyglotBenchmarkRepository = PolyglotBenchmarkRepositoryImpl.getInstance()
+            cls.__instance.__polyglotModelRepository = PolyglotModelRepositoryImpl.getInstance()
+
+        return cls.__instance
+
+    @classmethod
+    def getInstance(cls):
+        if cls.__instance is None:
+            cls.__instance = cls()
+
+        return cls.__instance
+
+    def __summarize(self, measurementList):
+        generatedTokenCount = sum(measurement["generatedTokenCount"] for measurement in measurementList)
+        elapsedTime = sum(measurement["elapsedTime"] for measurement in measurementList)
+
+        return {
+            "requestCount": len(measurementList),
+            "generatedTokenCount": generatedTokenCount,
+            "elapsedTime": round(elapsedTime, 3),
+            "tokensPerSecond": round(generatedTokenCount / elapsedTime, 2) if elapsedTime else 0.0,
+        }
+
+    def __percentile(self, valueList, percent):
+        sortedValueList = sorted(valueList)
+        index = min(len(sortedValueList) - 1, int(round(percent / 100 * (len(sortedValueList) - 1))))
+
+        return round(sortedValueList[index], 3)
+
+    def __interleaveByProtocol(self, promptList):
+        # question / score 요청을 번갈아 배치해서 매 요청마다 adapter 전환이 일어나도록 함
+        questionList = [promptData for promptData in promptList if promptData["protocol"] == "question"]
+        scoreList = [promptData for promptData in promptList if promptData["protocol"] == "score"]
+
+        interleavedList = []
+        for index in range(max(len(questionList), len(scoreList))):
+            for protocolPromptList in (questionList, scoreList):
+                if index < len(protocolPromptList):
+                    interleavedList.append(protocolPromptList[index])
+
+        return interleavedList
+
+    def compareMergedAndAdapterSwitching(self, promptFilePath, maxNewTokens):
+        repository = self.__polyglotBenchmarkRepository
+        promptList = self.__interleaveByProtocol(repository.readPromptList(promptFilePath))
+        tokenizer = self.__polyglotModelRepository.getTokenizer()
+
+        # 1) 하나의 base model 위에서 adapter 를 전환하는 방식
+        adapterMeasurementList = []
+        for promptData in promptList:
+            adapterName = repository.ADAPTER_NAME_DICT[promptData["protocol"]]
+            with self.__polyglotModelRepository.useAdapter(adapterName) as model:
+                adapterMeasurementList.append(
+                    repository.measureGeneration(model, tokenizer, repository.buildSource(promptData), maxNewTokens))
+
+        adapterResidentMemoryMB = repository.getResidentMemoryMB()
+
+        # 2) adapter 별로 병합된 사본을 따로 올리는 기존 방식
+        mergedModelDict = {
+            adapterName: self.__polyglotModelRepository.loadMergedModel(adapterName)
+            for adapterName in repository.ADAPTER_NAME_DICT.values()
+        }
+        mergedResidentMemoryMB = repository.getResidentMemoryMB()
+
+        mergedMeasurementList = []
+        for promptData in promptList:
+            model = mergedModelDict[repository.ADAPTER_NAME_DICT[promptData["protocol"]]]
+            mergedMeasurementList.append(
+                repository.measureGeneration(model, tokenizer, repository.buildSource(promptData), maxNewTokens))
+
+        return {
+            "adapterSwitching": {
+                **self.__summarize(adapterMeasurementList),
+                "residentMemoryMB": adapterResidentMemoryMB,
+            },
+            "merged": {
+                **self.__summarize(mergedMeasurementList),
+                "additionalResidentMemoryMB": round(mergedResidentMemoryMB - adapterResidentMemoryMB, 1),
+            },
+        }
+
+    def measureColdStart(self):
+        repository = self.__polyglotBenchmarkRepository
+        promptList = repository.readPromptList(repository.DEFAULT_PROMPT_FILE_PATH)
+        questionPromptData = next(promptData for promptData in promptList if promptData["protocol"] == "question")
+        scorePromptData = next(promptData for promptData in promptList if promptData["protocol"] == "score")
+
+        coldStartTime = time.perf_counter()
+        loadReport = self.__polyglotModelRepository.loadModel()
+
+        # 실제 요청 경로(PolyglotQuestionRepositoryImpl / PolyglotScoreRepositoryImpl)로 첫 응답까지의 시간 측정
+        questionStartTime = time.perf_counter()
+        asyncio.run(PolyglotQuestionRepositoryImpl.getInstance().generateQuestion(
+            questionPromptData["userAnswer"], questionPromptData["nextIntent"]))
+        firstQuestionTime = time.perf_counter() - questionStartTime
+
+        scoreRepository = PolyglotScoreRepositoryImpl.getInstance()
+        scoreStartTime = time.perf_counter()
+        scoreModel, tokenizer = asyncio.run(scoreRepository.loadScoreModel())
+        asyncio.run(scoreRepository.scoreUserAnswer(
+            scorePromptData["question"], scorePromptData["userAnswer"], scorePromptData["intent"],
+            scoreModel, tokenizer))
+        firstScoreTime = time.perf_counter() - scoreStartTime
+
+        return {
+            "modelFormat": loadReport["modelFormat"],
+            "loadTime": loadReport["loadTime"],
+            "firstQuestionTime": round(firstQuestionTime, 3),
+            "firstScoreTime": round(firstScoreTime, 3),
+            "coldStartTime": round(time.perf_counter() - coldStartTime, 3),
+            "peakResidentMemoryMB": repository.getPeakResidentMemoryMB(),
+        }
+
+    def compareColdStart(self, modelFormatList):
+        return {
+            modelFormat: self.__polyglotBenchmarkRepository.runBenchmarkInSubprocess(
+                "cold-start-once", {"POLYGLOT_MODEL_FORMAT": modelFormat})
+            for modelFormat in modelFormatList
+        }
+
+    def __runSessionList(self, sessionList, maxNewTokens, workerCount):
+        inferenceRepository = PolyglotInferenceRepositoryImpl.getInstance()
+
+        def runSession(session):
+            adapterName, source = session
+            requestStartTime = time.perf_counter()
+            generatedIdList = inferenceRepository.generate(adapterName, source, maxNewTokens)
+
+            return {"generatedTokenCount": len(generatedIdList),
+                    "elapsedTime": time.perf_counter() - requestStartTime}
+
+        wallStartTime = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workerCount) as executor:
+            measurementList = list(executor.map(runSession, sessionList))
+        wallTime = time.perf_counter() - wallStartTime
+
+        latencyList = [measurement["elapsedTime"] for measurement in measurementList]
+        generatedTokenCount = sum(measurement["generatedTokenCount"] for measurement in measurementList)
+
+        return {
+            "sessionCount": len(sessionList),
+            "generatedTokenCount": generatedTokenCount,
+            "wallTime": round(wallTime, 3),
+            "aggregateTokensPerSecond": round(generatedTokenCount / wallTime, 2),
+            "p50Latency": self.__percentile(latencyList, 50),
+            "p95Latency": self.__percentile(latencyList, 95),
+        }
+
+    def compareContinuousBatching(self, promptFilePath, sessionCount, maxNewTokens):
+        repository = self.__polyglotBenchmarkRepository
+        promptList = repository.readPromptList(promptFilePath)
+        self.__polyglotModelRepository.loadModel()
+
+        sessionList = [
+            (repository.ADAPTER_NAME_DICT[promptData["protocol"]], repository.buildSource(promptData))
+            for promptData in (promptList[index % len(promptList)] for index in range(sessionCount))
+        ]
+
+        # 첫 호출의 lazy 초기화 비용이 측정에 섞이지 않도록 한 번 먼저 실행
+        self.__runSessionList(sessionList[:1], maxNewTokens, 1)
+
+        # 한 명씩 처리하는 경우(기존 CommandExecutor 가 prompt 하나씩 generate 하던 상황)와
+        # 동시에 sessionCount 명이 요청해서 engine 이 decoding batch 를 합치는 경우를 비교
+        return {
+            "singleUser": self.__runSessionList(sessionList, maxNewTokens, 1),
+            "concurrentSessions": self.__runSessionList(sessionList, maxNewTokens, sessionCount),
+        }
+
+    def compareBatchedScoring(self, promptFilePath, answerCount):
+        repository = self.__polyglotBenchmarkRepository
+        scorePromptList = [promptData for promptData in repository.readPromptList(promptFilePath)
+                           if promptData["protocol"] == "score"]
+        interviewList = [
+            (promptData["question"], promptData["userAnswer"], promptData["intent"])
+            for promptData in (scorePromptList[index % len(scorePromptList)] for index in range(answerCount))
+        ]
+
+        scoreRepository = PolyglotScoreRepositoryImpl.getInstance()
+        scoreModel, tokenizer = asyncio.run(scoreRepository.loadScoreModel())
+        asyncio.run(scoreRepository.scoreUserAnswer(*interviewList[0], scoreModel, tokenizer))
+
+        async def scoreSequentially():
+            return [await scoreRepository.scoreUserAnswer(*interview, scoreModel, tokenizer)
+                    for interview in interviewList]
+
+        # 답변 하나를 채점하는 시간 대비 면접 종료 시 전체 채점 시간이 몇 배인지 비교
+        singleStartTime = time.perf_counter()
+        asyncio.run(scoreRepository.scoreUserAnswer(*interviewList[0], scoreModel, tokenizer))
+        singleAnswerTime = time.perf_counter() - singleStartTime
+
+        sequentialStartTime = time.perf_counter()
+        asyncio.run(scoreSequentially())
+        sequentialTime = time.perf_counter() - sequentialStartTime
+
+        batchedStartTime = time.perf_counter()
+        asyncio.run(scoreRepository.scoreUserAnswerList(interviewList))
+        batchedTime = time.perf_counter() - batchedStartTime
+
+        return {
+            "answerCount": answerCount,
+            "singleAnswerTime": round(singleAnswerTime, 3),
+            "sequentialTime": round(sequentialTime, 3),
+            "sequentialRatio": round(sequentialTime / singleAnswerTime, 2),
+            "batchedTime": round(batchedTime, 3),
+            "batchedRatio": round(batchedTime / singleAnswerTime, 2),
+        }
+
+    def __measureFixtureGeneration(self, promptList, useStopSequence):
+        repository = self.__polyglotBenchmarkRepository
+        inferenceRepository = PolyglotInferenceRepositoryImpl.getInstance()
+        tokenizer = self.__polyglotModelRepository.getTokenizer()
+
+        generatedTokenCountList = []
+        latencyList = []
+        for promptData in promptList:
+            maxNewTokens, stopSequenceList = repository.getGenerationSetting(promptData["protocol"])
+            stoppingCriteria = StopSequenceCriteria(tokenizer, stopSequenceList) if useStopSequence else None
+
+            requestStartTime = time.perf_counter()
+            generatedIdList = inferenceRepository.generate(
+                repository.ADAPTER_NAME_DICT[promptData["protocol"]], repository.buildSource(promptData),
+                maxNewTokens, stoppingCriteria)
+            latencyList.append(time.perf_counter() - requestStartTime)
+            generatedTokenCountList.append(len(generatedIdList))
+
+        return {
+            "averageGeneratedTokenCount": round(sum(generatedTokenCountList) / len(generatedTokenCountList), 1),
+            "averageLatency": round(sum(latencyList) / len(latencyList), 3),
+            "p95Latency": self.__percentile(latencyList, 95),
+        }
+
+    def compareStopSequence(self, promptFilePath):
+        promptList = self.__polyglotBenchmarkRepository.readPromptList(promptFilePath)
+        self.__measureFixtureGeneration(promptList[:1], True)
+
+        # eos 또는 max_new_tokens 까지 생성하던 기존 방식 vs 프로토콜별 stop sequence 에서 멈추는 방식
+        return {
+            "withoutStopSequence": self.__measureFixtureGeneration(promptList, False),
+            "withStopSequence": self.__measureFixtureGeneration(promptList, True),
+        }
+
+    def __measurePrefill(self, promptList, usePrefixCache):
+        repository = self.__polyglotBenchmarkRepository
+        inferenceRepository = PolyglotInferenceRepositoryImpl.getInstance()
+
+        # 토큰 하나만 생성하면 요청 지연 시간의 대부분이 prefill 시간임
+        prefillTimeList = []
+        for promptData in promptList:
+            promptPrefix = repository.getPromptPrefix(promptData["protocol"]) if usePrefixCache else None
+
+            requestStartTime = time.perf_counter()
+            inferenceRepository.generate(
+                repository.ADAPTER_NAME_DICT[promptData["protocol"]], repository.buildSource(promptData),
+                1, None, promptPrefix)
+            prefillTimeList.append(time.perf_counter() - requestStartTime)
+
+        return {
+            "averagePrefillTime": round(sum(prefillTimeList) / len(prefillTimeList), 4),
+            "p95PrefillTime": self.__percentile(prefillTimeList, 95),
+        }
+
+    def comparePrefixCache(self, promptFilePath):
+        repository = self.__polyglotBenchmarkRepository
+        promptList = repository.readPromptList(promptFilePath)
+        self.__polyglotModelRepository.loadModel()
+        tokenizer = self.__polyglotModelRepository.getTokenizer()
+
+        # 프롬프트 전체 토큰 중 고정 prefix 가 차지하는 비율 (prefill 시간이 줄어드는 기대치)
+        prefixShareList = [
+            len(tokenizer(repository.getPromptPrefix(promptData["protocol"]))["input_ids"])
+            / len(tokenizer(repository.buildSource(promptData))["input_ids"])
+            for promptData in promptList
+        ]
+
+        # lazy 초기화와 adapter 별 prefix KV cache 계산이 측정에 섞이지 않도록 먼저 한 번씩 실행
+        self.__measurePrefill(promptList, False)
+        self.__measurePrefill(promptList, True)
+
+        return {
+            "averagePrefixShare": round(sum(prefixShareList) / len(prefixShareList), 3),
+            "withoutPrefixCache": self.__measurePrefill(promptList, False),
+            "withPrefixCache": self.__measurePrefill(promptList, True),
+        }
+
+    def measureTimeToFirstToken(self, promptFilePath):
+        repository = self.__polyglotBenchmarkRepository
+        inferenceRepository = PolyglotInferenceRepositoryImpl.getInstance()
+        promptList = repository.readPromptList(promptFilePath)
+        tokenizer = self.__polyglotModelRepository.getTokenizer()
+        inferenceRepository.generate(repository.ADAPTER_NAME_DICT[promptList[0]["protocol"]],
+                                     repository.buildSource(promptList[0]), 1)
+
+        # 사용자가 첫 글자를 보기까지의 시간(스트리밍) vs 전체 생성이 끝나기까지의 시간(기존 방식),
+        # 그리고 조각을 이어 붙인 결과가 스트리밍하지 않은 최종 텍스트와 같은지 확인
+        firstChunkTimeList = []
+        latencyList = []
+        identicalCount = 0
+        for promptData in promptList:
+            maxNewTokens, stopSequenceList = repository.getGenerationSetting(promptData["protocol"])
+            stoppingCriteria = StopSequenceCriteria(tokenizer, stopSequenceList)
+            decoder = StreamingTextDecoder(tokenizer, stoppingCriteria, strip=promptData["protocol"] == "question")
+            chunkList = []
+            firstChunkTime = []
+
+            def collectChunk(generatedIdList):
+                chunk = decoder.putToken(generatedIdList)
+                if chunk:
+                    chunkList.append(chunk)
+                    if not firstChunkTime:
+                        firstChunkTime.append(time.perf_counter())
+
+            requestStartTime = time.perf_counter()
+            generatedIdList = inferenceRepository.submit(
+                repository.ADAPTER_NAME_DICT[promptData["protocol"]], repository.buildSource(promptData),
+                maxNewTokens, stoppingCriteria, repository.getPromptPrefix(promptData["protocol"]),
+                collectChunk).result()
+            requestEndTime = time.perf_counter()
+
+            finalText = decoder.finalizeText(generatedIdList)
+            lastChunk = decoder.finish(finalText)
+            identicalCount += lastChunk is not None and "".join(chunkList) + lastChunk == finalText
+
+            latencyList.append(requestEndTime - requestStartTime)
+            firstChunkTimeList.append((firstChunkTime[0] if firstChunkTime else requestEndTime) - requestStartTime)
+
+        return {
+            "averageTimeToFirstChunk": round(sum(firstChunkTimeList) / len(firstChunkTimeList), 3),
+            "p95TimeToFirstChunk": self.__percentile(firstChunkTimeList, 95),
+            "averageLatency": round(sum(latencyList) / len(latencyList), 3),
+            "p95Latency": self.__percentile(latencyList, 95),
+            "identicalTextRatio": round(identicalCount / len(promptList), 3),
+        }
+
+    def measureInferenceSetting(self, promptFilePath, maxNewTokens):
+        repository = self.__polyglotBenchmarkRepository
+        inferenceRepository = PolyglotInferenceRepositoryImpl.getInstance()
+        promptList = repository.readPromptList(promptFilePath)
+        loadReport = self.__polyglotModelRepository.loadModel()
+
+        sessionList = [(repository.ADAPTER_NAME_DICT[promptData["protocol"]], repository.buildSource(promptData))
+                       for promptData in promptList]
+        inferenceRepository.generate(*sessionList[0], 1)
+
+        # 출력 일치율을 비교해야 하므로 stop sequence 없이 같은 길이만큼 greedy 생성
+        generatedIdListList = []
+        latencyList = []
+        for adapterName, source in sessionList:
+            requestStartTime = time.perf_counter()
+            generatedIdListList.append(inferenceRepository.generate(adapterName, source, maxNewTokens))
+            latencyList.append(time.perf_counter() - requestStartTime)
+
+        generatedTokenCount = sum(len(generatedIdList) for generatedIdList in generatedIdListList)
+
+        return {
+            "backend": loadReport["backend"],
+            "quantization": loadReport["quantization"],
+            "loadTime": loadReport["loadTime"],
+            "generatedTokenCount": generatedTokenCount,
+            "tokensPerSecond": round(generatedTokenCount / sum(latencyList), 2),
+            "averageLatency": round(sum(latencyList) / len(latencyList), 3),
+            "p95Latency": self.__percentile(latencyList, 95),
+            "residentMemoryMB": repository.getResidentMemoryMB(),
+            "generatedIdListList": generatedIdListList,
+        }
+
+    def __measureAgreement(self, referenceIdListList, generatedIdListList):
+        # 첫 번째로 달라지는 토큰 이전까지를 일치한 토큰으로 봄 (greedy 에서는 한 번 갈라지면 이후는 비교 의미 없음)
+        agreedTokenCount = 0
+        for referenceIdList, generatedIdList in zip(referenceIdListList, generatedIdListList):
+            for referenceId, generatedId in zip(referenceIdList, generatedIdList):
+                if referenceId != generatedId:
+                    break
+                agreedTokenCount += 1
+
+        referenceTokenCount = sum(len(referenceIdList) for referenceIdList in referenceIdListList)
+        exactMatchCount = sum(referenceIdList == generatedIdList for referenceIdList, generatedIdList
+                              in zip(referenceIdListList, generatedIdListList))
+
+        return {
+            "tokenAgreementRate": round(agreedTokenCount / referenceTokenCount, 3) if referenceTokenCount else 1.0,
+            "exactMatchRate": round(exactMatchCount / len(referenceIdListList), 3),
+        }
+
+    def compareQuantization(self, promptFilePath, maxNewTokens, environmentDict=None):
+        # 양자화는 적재 시점에 모델을 바꾸므로 모드별로 새 프로세스에서 측정
+        resultDict = {
+            quantization: self.__polyglotBenchmarkRepository.runBenchmarkInSubprocess(
+                "inference-once", {**(environmentDict or {}), "POLYGLOT_QUANTIZATION": quantization},
+                ["--prompt-file", promptFilePath, "--max-new-tokens", str(maxNewTokens)])
+            for quantization in ["none", "int8"]
+        }
+
+        referenceIdListList = resultDict["none"].pop("generatedIdListList")
+        quantizedIdListList = resultDict["int8"].pop("generatedIdListList")
+        resultDict["int8"].update(self.__measureAgreement(referenceIdListList, quantizedIdListList))
+
+        return resultDict
+
+    def compareBackend(self, promptFilePath, maxNewTokens):
+        # PyTorch eager 와 ONNX Runtime 을 각각 새 프로세스에서 같은 프롬프트로 측정
+        resultDict = {
+            backend: self.__polyglotBenchmarkRepository.runBenchmarkInSubprocess(
+                "inference-once", {"POLYGLOT_BACKEND": backend},
+                ["--prompt-file", promptFilePath, "--max-new-tokens", str(maxNewTokens)])
+            for backend in ["torch", "onnx"]
+        }
+
+        referenceIdListList = resultDict["torch"].pop("generatedIdListList")
+        onnxIdListList = resultDict["onnx"].pop("generatedIdListList")
+        resultDict["onnx"].update(self.__measureAgreement(referenceIdListList, onnxIdListList))
+        resultDict["onnx"]["latencyReduction"] = round(
+            1 - resultDict["onnx"]["averageLatency"] / resultDict["torch"]["averageLatency"], 3)
+
+        return resultDict
+
+    def measureEngineParity(self, promptFilePath, maxNewTokens):
+        repository = self.__polyglotBenchmarkRepository
+        inferenceRepository = PolyglotInferenceRepositoryImpl.getInstance()
+        promptList = repository.readPromptList(promptFilePath)
+        loadReport = self.__polyglotModelRepository.loadModel()
+
+        # 실제 서비스와 같이 engine 을 거치도록, 길이가 다른 group 을 prefix cache 사용 여부를 번갈아 가며 제출하고
+        # 다음 group 은 앞 group 이 토큰을 몇 개 만든 뒤에 제출해서 실행 중인 batch 에 padding 되어 합류하도록 함
+        # (합류 시점을 step 수로 정하므로 backend 가 달라도 같은 batch 구성으로 생성됨)
+        protocolSourceDict = {}
+        for promptData in promptList:
+            protocolSourceDict.setdefault(promptData["protocol"], []).append(repository.buildSource(promptData))
+
+        futureList = []
+        joinEvent = None
+        for index, promptData in enumerate(self.__interleaveByProtocol(promptList)):
+            if joinEvent is not None:
+                joinEvent.wait()
+
+            joinEvent = threading.Event()
+            promptPrefix = repository.getPromptPrefix(promptData["protocol"]) if index % 2 == 0 else None
+            groupSize = index % 3 + 1
+            sourceList = protocolSourceDict[promptData["protocol"]]
+            groupSourceList = [sourceList[(index + offset) % len(sourceList)] for offset in range(groupSize)]
+
+            def signalJoin(generatedIdList, joinEvent=joinEvent):
+                if len(generatedIdList) >= self.ENGINE_PARITY_JOIN_TOKEN_COUNT:
+                    joinEvent.set()
+
+            groupFutureList = inferenceRepository.submitGroup(
+                repository.ADAPTER_NAME_DICT[promptData["protocol"]], groupSourceList,
+                maxNewTokens + index, None, promptPrefix, [signalJoin] + [None] * (groupSize - 1))
+            groupFutureList[0].add_done_callback(lambda _, joinEvent=joinEvent: joinEvent.set())
+            futureList.extend(groupFutureList)
+
+        return {
+            "backend": loadReport["backend"],
+            "sequenceCount": len(futureList),
+            "generatedIdListList": [future.result() for future in futureList],
+        }
+
+    def checkOnnxEngineParity(self, promptFilePath, maxNewTokens, environmentDict=None):
+        # engine 경로(padding / batch 합류 / prefix cache 로 넘기는 legacy tuple past_key_values)에서 ONNX Runtime 이
+        # PyTorch 와 같은 토큰을 만드는지 backend 별 새 프로세스에서 확인 - 확인용 프로세스만 parity 확인 없이 ONNX 를 적재
+        resultDict = {
+            backend: self.__polyglotBenchmarkRepository.runBenchmarkInSubprocess(
+                "onnx-engine-parity-once",
+                {**(environmentDict or {}), "POLYGLOT_BACKEND": backend, "POLYGLOT_WORKER_COUNT": "0",
+                 "POLYGLOT_REQUIRE_ONNX_ENGINE_PARITY": "false"},
+                ["--prompt-file", promptFilePath, "--max-new-tokens", str(maxNewTokens)])
+            for backend in ["torch", "onnx"]
+        }
+
+        referenceIdListList = resultDict["torch"].pop("generatedIdListList")
+        onnxIdListList = resultDict["onnx"].pop("generatedIdListList")
+        parityReport = {
+            "sequenceCount": len(referenceIdListList),
+            "maxNewTokens": maxNewTokens,
+            **self.__measureAgreement(referenceIdListList, onnxIdListList),
+        }
+        parityReport["isPassed"] = parityReport["exactMatchRate"] == 1.0
+
+        # 결과를 ONNX 모델 경로에 남겨서 통과한 모델만 onnx backend 로 적재되도록 함
+        for adapterName in self.__polyglotModelRepository.onnxModelPathDict.keys():
+            self.__polyglotModelRepository.writeOnnxEngineParity(adapterName, parityReport)
+
+        return parityReport
+
+    def measureWorkerPool(self, promptFilePath, sessionCount, maxNewTokens):
+        repository = self.__polyglotBenchmarkRepository
+        promptList = repository.readPromptList(promptFilePath)
+        self.__polyglotModelRepository.loadModel()
+        isWorkerPoolStarted = PolyglotInferenceServiceImpl.getInstance().startWorkerPool()
+        workerCount = PolyglotInferenceRepositoryImpl.getInstance().getStatus()["workerCount"]
+
+        sessionList = [
+            (repository.ADAPTER_NAME_DICT[promptData["protocol"]], repository.buildSource(promptData))
+            for promptData in (promptList[index % len(promptList)] for index in range(sessionCount))
+        ]
+
+        # worker 마다 첫 forward 의 초기화 비용이 있으므로 worker 수만큼 동시에 먼저 실행
+        warmupCount = max(1, workerCount)
+        self.__runSessionList(sessionList[:warmupCount], maxNewTokens, warmupCount)
+
+        # 동시에 요청하는 thread 들이 CommandExecutor 역할을 하고, 요청은 worker 프로세스로 분배됨
+        return {
+            "workerCount": workerCount if isWorkerPoolStarted else 0,
+            **self.__runSessionList(sessionList, maxNewTokens, sessionCount),
+            **repository.getProcessTreeMemoryMB(),
+        }
+
+    def compareWorkerPool(self, promptFilePath, maxWorkerCount, sessionCount, maxNewTokens):
+        # worker 수별로 새 프로세스에서 측정 (0 은 worker 없이 프로세스 하나의 engine thread 로 처리하는 기존 방식)
+        return {
+            str(workerCount): self.__polyglotBenchmarkRepository.runBenchmarkInSubprocess(
+                "worker-pool-once", {"POLYGLOT_WORKER_COUNT": str(workerCount)},
+                ["--prompt-file", promptFilePath, "--sessions", str(sessionCount),
+                 "--max-new-tokens", str(maxNewTokens)])
+            for workerCount in range(maxWorkerCount + 1)
+        }
+
+    def __readInferenceMetric(self):
+        # inference engine 이 pipeline metric 으로 남기는 adapter 별 decode step 시간 / 생성 토큰 수의 누적 값
+        metricSnapshot = PipelineMetricsRepositoryImpl.getInstance().snapshot()
+        inferenceMetricDict = {}
+        for histogram in metricSnapshot["histogramList"]:
+            if histogram["name"] == "inference_decode_step_seconds":
+                adapterMetric = inferenceMetricDict.setdefault(histogram["labels"]["adapter"], {})
+                adapterMetric.update(decodeStepSeconds=histogram["sum"], decodeStepCount=histogram["count"])
+
+        for counter in metricSnapshot["counterList"]:
+            if counter["name"] == "inference_generated_tokens_total":
+                inferenceMetricDict.setdefault(counter["labels"]["adapter"], {})["generatedTokenCount"] = counter["value"]
+
+        return inferenceMetricDict
+
+    def __getInferenceMetricDelta(self, beforeMetricDict, afterMetricDict, adapterName, key):
+        return (afterMetricDict.get(adapterName, {}).get(key, 0)
+                - beforeMetricDict.get(adapterName, {}).get(key, 0))
+
+    def measureMicroBenchmark(self, promptFilePath):
+        repository = self.__polyglotBenchmarkRepository
+        promptList = repository.readPromptList(promptFilePath)
+        questionPromptList = [promptData for promptData in promptList if promptData["protocol"] == "question"]
+        interviewList = [(promptData["question"], promptData["userAnswer"], promptData["intent"])
+                         for promptData in promptList if promptData["protocol"] == "score"]
+        loadReport = self.__polyglotModelRepository.loadModel()
+        referenceMsList = [repository.measureReferenceWorkloadMs()]
+
+        questionRepository = PolyglotQuestionRepositoryImpl.getInstance()
+        scoreRepository = PolyglotScoreRepositoryImpl.getInstance()
+
+        # lazy 초기화와 adapter 별 prefix KV cache 계산이 측정에 섞이지 않도록 먼저 한 번씩 실행
+        self.__measurePrefill(promptList, True)
+        prefillMeasurement = self.__measurePrefill(promptList, True)
+
+        # 실제 요청 경로(PolyglotQuestionRepositoryImpl / PolyglotScoreRepositoryImpl)로 생성하고,
+        # 토큰당 decode 시간은 engine 이 decode step 마다 남기는 metric 의 증가분으로 계산
+        beforeMetricDict = self.__readInferenceMetric()
+
+        questionLatencyList = []
+        for promptData in questionPromptList:
+            questionStartTime = time.perf_counter()
+            asyncio.run(questionRepository.generateQuestion(promptData["userAnswer"], promptData["nextIntent"]))
+            questionLatencyList.append(time.perf_counter() - questionStartTime)
+
+        scoreStartTime = time.perf_counter()
+        asyncio.run(scoreRepository.scoreUserAnswerList(interviewList))
+        scoreListLatency = time.perf_counter() - scoreStartTime
+
+        afterMetricDict = self.__readInferenceMetric()
+        referenceMsList.append(repository.measureReferenceWorkloadMs())
+
+        decodeStepMsDict = {}
+        generatedTokenCount = 0
+        for adapterName in repository.ADAPTER_NAME_DICT.values():
+            decodeStepCount = self.__getInferenceMetricDelta(beforeMetricDict, afterMetricDict, adapterName,
+                                                             "decodeStepCount")
+            decodeStepSeconds = self.__getInferenceMetricDelta(beforeMetricDict, afterMetricDict, adapterName,
+                                                               "decodeStepSeconds")
+            decodeStepMsDict[adapterName] = round(decodeStepSeconds / decodeStepCount * 1000, 3) \
+                if decodeStepCount else None
+            generatedTokenCount += self.__getInferenceMetricDelta(beforeMetricDict, afterMetricDict, adapterName,
+                                                                  "generatedTokenCount")
+
+        generationTime = sum(questionLatencyList) + scoreListLatency
+        # 측정 전후 기준 작업 시간의 평균 - 측정 도중 host 부하가 바뀌는 경우를 조금이나마 흡수
+        referenceMs = round(sum(referenceMsList) / len(referenceMsList), 3)
+
+        metricDict = {
+                "modelLoadSeconds": loadReport["loadTime"],
+                "prefillMs": round(prefillMeasurement["averagePrefillTime"] * 1000, 3),
+                "p95PrefillMs": round(prefillMeasurement["p95PrefillTime"] * 1000, 3),
+                "questionLatencyMs": round(sum(questionLatencyList) / len(questionLatencyList) * 1000, 3),
+                "scoreListLatencyMs": round(scoreListLatency * 1000, 3),
+                "interviewDecodeStepMs": decodeStepMsDict["interview"],
+                "scoreDecodeStepMs": decodeStepMsDict["score"],
+                "tokensPerSecond": round(generatedTokenCount / generationTime, 2),
+                "peakResidentMemoryMB": repository.getPeakResidentMemoryMB(),
+        }
+
+        return {
+            "metricDict": metricDict,
+            "referenceMs": referenceMs,
+            "relativeMetricDict": self.__getRelativeMetricDict(metricDict, referenceMs),
+            "generatedTokenCount": generatedTokenCount,
+            "questionCount": len(questionPromptList),
+            "answerCount": len(interviewList),
+            "environment": {
+                "python": platform.python_version(),
+                "torch": torch.__version__,
+                "transformers": transformers.__version__,
+                "torchThreadCount": torch.get_num_threads(),
+                **repository.getHostDict(),
+                "device": loadReport["device"],
+            },
+        }
+
+    def __getRelativeMetricDict(self, metricDict, referenceMs):
+        # 시간 값은 기준 작업 몇 번 분량인지, tokensPerSecond 는 기준 작업 한 번 동안 만드는 토큰 수로 바꿈
+        relativeMetricDict = {}
+        for metricName in self.MICRO_METRIC_LIST:
+            value = metricDict.get(metricName)
+            if value is None or metricName in self.ABSOLUTE_METRIC_SET:
+                continue
+
+            if metricName in self.HIGHER_IS_BETTER_METRIC_SET:
+                relativeMetricDict[metricName] = round(value * referenceMs / 1000, 4)
+            elif metricName.endswith("Seconds"):
+                relativeMetricDict[metricName] = round(value * 1000 / referenceMs, 4)
+            else:
+                relativeMetricDict[metricName] = round(value / referenceMs, 4)
+
+        return relativeMetricDict
+
+    def __getCommitId(self):
+        try:
+            return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                  check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    def __compareWithBaseline(self, result, baselineResult, tolerance):
+        # 변화율이 tolerance 를 넘어 나빠진 값만 회귀로 봄 (작은 모델이라 측정마다 흔들림이 있으므로 여유를 둠)
+        isSameHost = all(result["environment"].get(key) == baselineResult.get("environment", {}).get(key)
+                         for key in self.MICRO_HOST_KEY_LIST)
+        comparisonDict = {}
+        regressionList = []
+        skippedMetricList = []
+        for metricName in self.MICRO_METRIC_LIST:
+            if metricName in self.ABSOLUTE_METRIC_SET:
+                if not isSameHost:
+                    skippedMetricList.append(metricName)
+                    continue
+                current = result["metricDict"].get(metricName)
+                baseline = baselineResult["metricDict"].get(metricName)
+            else:
+                current = result["relativeMetricDict"].get(metricName)
+                baseline = baselineResult.get("relativeMetricDict", {}).get(metricName)
+
+            if current is None or not baseline:
+                skippedMetricList.append(metricName)
+                continue
+
+            change = current / baseline - 1
+            isRegression = (change < -tolerance if metricName in self.HIGHER_IS_BETTER_METRIC_SET
+                            else change > tolerance)
+            comparisonDict[metricName] = {"baseline": baseline, "current": current, "change": round(change, 3),
+                                          "isRegression": isRegression}
+            if isRegression:
+                regressionList.append(metricName)
+
+        return {"tolerance": tolerance, "isSameHost": isSameHost, "comparisonDict": comparisonDict,
+                "regressionList": regressionList, "skippedMetricList": skippedMetricList}
+
+    def __getTinyModelEnvironmentDict(self, tinyModelPath):
+        # buildTinyModel 로 만든 모델을 GPU / network 없이 실제 적재 경로로 올리기 위한 환경 변수
+        absoluteTinyModelPath = os.path.abspath(tinyModelPath)
+
+        return {
+            "POLYGLOT_BASE_MODEL": os.path.join(absoluteTinyModelPath, "base"),
+            "POLYGLOT_MODEL_ROOT": absoluteTinyModelPath,
+            "POLYGLOT_MODEL_FORMAT": "adapter",
+            "POLYGLOT_BACKEND": "torch",
+            "POLYGLOT_WORKER_COUNT": "0",
+            "HF_HUB_OFFLINE": "1",
+            "TRANSFORMERS_OFFLINE": "1",
+            "CUDA_VISIBLE_DEVICES": "",
+        }
+
+    def runMicroBenchmark(self, promptFilePath, tinyModelPath, resultFilePath, baselineFilePath, tolerance,
+                          updateBaseline):
+        repository = self.__polyglotBenchmarkRepository
+        buildReport = repository.buildTinyModel(tinyModelPath, repository.readPromptList(promptFilePath))
+
+        # 작은 모델을 실제 모델 자리에 두고 새 프로세스에서 측정 (적재 시간 / peak RSS 는 새 프로세스여야 의미가 있음)
+        result = repository.runBenchmarkInSubprocess("micro-once", {
+            **self.__getTinyModelEnvironmentDict(tinyModelPath),
+            "POLYGLOT_QUANTIZATION": "none",
+        }, ["--prompt-file", os.path.abspath(promptFilePath)])
+
+        result = {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "commitId": self.__getCommitId(),
+            **result,
+            "fixture": buildReport,
+        }
+
+        if resultFilePath:
+            repository.appendResult(resultFilePath, result)
+
+        baseline = repository.readBaseline(baselineFilePath)
+        baselineComparison = self.__compareWithBaseline(result, baseline, tolerance) if baseline else None
+
+        if updateBaseline:
+            repository.writeBaseline(baselineFilePath, result)
+
+        return {**result, "baselineComparison": baselineComparison}
+
+    def checkTinyModelQuantization(self, promptFilePath, tinyModelPath, maxNewTokens):
+        # int8 모드로 adapter 병합 → 양자화 → inference engine 생성까지 실제 경로를 작은 모델로 끝까지 실행
+        # (적재나 생성이 실패하면 하위 프로세스가 실패하고, 생성된 토큰이 없어도 실패로 봄)
+        repository = self.__polyglotBenchmarkRepository
+        buildReport = repository.buildTinyModel(tinyModelPath, repository.readPromptList(promptFilePath))
+        resultDict = self.compareQuantization(os.path.abspath(promptFilePath), maxNewTokens,
+                                              self.__getTinyModelEnvironmentDict(tinyModelPath))
+
+        return {
+            **resultDict,
+            "fixture": buildReport,
+            "isPassed": all(result["generatedTokenCount"] > 0 for result in resultDict.values()),
+        }
@@ -0,0 +1,160 @@
+import argparse
+import json
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'template'))
+
+from polyglot_benchmark.service.polyglot_benchmark_service_impl import PolyglotBenchmarkServiceImpl
+
+polyglotBenchmarkService = PolyglotBenchmarkServiceImpl.getInstance()
+
+def compareAdapterSwitching(promptFilePath, maxNewTokens):
+    return polyglotBenchmarkService.compareMergedAndAdapterSwitching(promptFilePath, maxNewTokens)
+
+def compareContinuousBatching(promptFilePath, sessionCount, maxNewTokens):
+    return polyglotBenchmarkService.compareContinuousBatching(promptFilePath, sessionCount, maxNewTokens)
+
+def compareBatchedScoring(promptFilePath, answerCount):
+    return polyglotBenchmarkService.compareBatchedScoring(promptFilePath, answerCount)
+
+def compareStopSequence(promptFilePath):
+    return polyglotBenchmarkService.compareStopSequence(promptFilePath)
+
+def comparePrefixCache(promptFilePath):
+    return polyglotBenchmarkService.comparePrefixCache(promptFilePath)
+
+def measureTimeToFirstToken(promptFilePath):
+    return polyglotBenchmarkService.measureTimeToFirstToken(promptFilePath)
+
+def compareQuantization(promptFilePath, maxNewTokens):
+    return polyglotBenchmarkService.compareQuantization(promptFilePath, maxNewTokens)
+
+def compareBackend(promptFilePath, maxNewTokens):
+    return polyglotBenchmarkService.compareBackend(promptFilePath, maxNewTokens)
+
+def measureInferenceSetting(promptFilePath, maxNewTokens):
+    return polyglotBenchmarkService.measureInferenceSetting(promptFilePath, maxNewTokens)
+
+def checkOnnxEngineParity(promptFilePath, maxNewTokens):
+    return polyglotBenchmarkService.checkOnnxEngineParity(promptFilePath, maxNewTokens)
+
+def measureEngineParity(promptFilePath, maxNewTokens):
+    return polyglotBenchmarkService.measureEngineParity(promptFilePath, maxNewTokens)
+
+def compareWorkerPool(promptFilePath, maxWorkerCount, sessionCount, maxNewTokens):
+    return polyglotBenchmarkService.compareWorkerPool(promptFilePath, maxWorkerCount, sessionCount, maxNewTokens)
+
+def measureWorkerPool(promptFilePath, sessionCount, maxNewTokens):
+    return polyglotBenchmarkService.measureWorkerPool(promptFilePath, sessionCount, maxNewTokens)
+
+def compareColdStart():
+    return polyglotBenchmarkService.compareColdStart(["adapter", "merged"])
+
+def measureColdStart():
+    return polyglotBenchmarkService.measureColdStart()
+
+def runMicroBenchmark(promptFilePath, tinyModelPath, resultFilePath, baselineFilePath, tolerance, updateBaseline):
+    return polyglotBenchmarkService.runMicroBenchmark(promptFilePath, tinyModelPath, resultFilePath, baselineFilePath,
+                                                      tolerance, updateBaseline)
+
+def checkTinyModelQuantization(promptFilePath, tinyModelPath, maxNewTokens):
+    return polyglotBenchmarkService.checkTinyModelQuantization(promptFilePath, tinyModelPath, maxNewTokens)
+
+def measureMicroBenchmark(promptFilePath):
+    return polyglotBenchmarkService.measureMicroBenchmark(promptFilePath)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="polyglot-ko 추론 성능 측정")
+    parser.add_argument("benchmark", choices=["adapter", "batching", "scoring", "stop-sequence", "prefix-cache", "streaming", "quantization", "backend", "inference-once", "onnx-engine-parity", "onnx-engine-parity-once", "worker-pool", "worker-pool-once", "cold-start", "cold-start-once", "micro", "micro-once", "tiny-quantization"])
+    parser.add_argument("--prompt-file", default=os.path.join("assets", "polyglot_benchmark_prompt.jsonl"))
+    parser.add_argument("--max-new-tokens", type=int, default=32)
+    parser.add_argument("--sessions", type=int, default=12)
+    parser.add_argument("--answers", type=int, default=6)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--tiny-model-path", default=os.path.join("models", "tiny-polyglot"))
+    parser.add_argument("--result-file", default=None, help="micro 결과를 한 줄씩 덧붙일 JSON Lines 파일")
+    parser.add_argument("--baseline-file", default=os.path.join("assets", "polyglot_micro_benchmark_baseline.json"))
+    parser.add_argument("--tolerance", type=float, default=0.2, help="baseline 대비 이 비율 이상 나빠지면 회귀로 봄")
+    parser.add_argument("--update-baseline", action="store_true", help="이번 micro 결과를 새 baseline 으로 저장")
+    args = parser.parse_args()
+
+    # merged 사본 vs 단일 base model + adapter 전환 방식의 tokens/sec 비교
+    if args.benchmark == "adapter":
+        result = compareAdapterSwitching(args.prompt_file, args.max_new_tokens)
+
+    # 동시 세션 수에 따른 continuous batching engine 의 처리량 / 지연 시간
+    elif args.benchmark == "batching":
+        result = compareContinuousBatching(args.prompt_file, args.sessions, args.max_new_tokens)
+
+    # 면접 종료 시 답변 N 개를 하나씩 채점 vs 길이별 bucket 으로 묶어서 채점
+    elif args.benchmark == "scoring":
+        result = compareBatchedScoring(args.prompt_file, args.answers)
+
+    # stop sequence 적용 전후의 평균 생성 토큰 수와 요청당 지연 시간
+    elif args.benchmark == "stop-sequence":
+        result = compareStopSequence(args.prompt_file)
+
+    # 고정 프롬프트 prefix 의 KV cache 재사용 전후 요청당 prefill 시간
+    elif args.benchmark == "prefix-cache":
+        result = comparePrefixCache(args.prompt_file)
+
+    # 스트리밍 시 첫 조각까지의 시간 vs 전체 생성 시간, 조각을 이어 붙인 텍스트와 최종 텍스트의 일치 여부
+    elif args.benchmark == "streaming":
+        result = measureTimeToFirstToken(args.prompt_file)
+
+    # fp32 vs int8 dynamic quantization 의 tokens/sec, RSS, 출력 일치율 (모드별 새 프로세스)
+    elif args.benchmark == "quantization":
+        result = compareQuantization(args.prompt_file, args.max_new_tokens)
+
+    # PyTorch eager vs ONNX Runtime 의 CPU 지연 시간과 출력 일치율 (backend 별 새 프로세스)
+    elif args.benchmark == "backend":
+        result = compareBackend(args.prompt_file, args.max_new_tokens)
+
+    # 현재 환경 변수 설정(backend / quantization)으로 한 번 측정 - 위 비교들이 하위 프로세스로 실행
+    elif args.benchmark == "inference-once":
+        result = measureInferenceSetting(args.prompt_file, args.max_new_tokens)
+
+    # continuous batching engine 경로에서 ONNX Runtime 과 PyTorch 의 생성 토큰이 같은지 확인 (backend 별 새 프로세스)
+    # 결과는 ONNX 모델 경로에 남고 통과해야 onnx backend 로 적재됨 - 실패하면 종료 코드 1
+    elif args.benchmark == "onnx-engine-parity":
+        result = checkOnnxEngineParity(args.prompt_file, args.max_new_tokens)
+
+    elif args.benchmark == "onnx-engine-parity-once":
+        result = measureEngineParity(args.prompt_file, args.max_new_tokens)
+
+    # inference worker 프로세스 수(0 ~ N)에 따른 처리량과 전체 RSS / PSS (worker 수별 새 프로세스)
+    elif args.benchmark == "worker-pool":
+        result = compareWorkerPool(args.prompt_file, args.workers, args.sessions, args.max_new_tokens)
+
+    elif args.benchmark == "worker-pool-once":
+        result = measureWorkerPool(args.prompt_file, args.sessions, args.max_new_tokens)
+
+    # adapter 병합 적재 vs 미리 병합해 둔 safetensors 적재의 cold start 시간 / peak RSS 비교 (모드별 새 프로세스)
+    elif args.benchmark == "cold-start":
+        result = compareColdStart()
+
+    elif args.benchmark == "cold-start-once":
+        result = measureColdStart()
+
+    # offline 으로 만든 작은 GPT-NeoX + LoRA adapter 로 적재 / prefill / 토큰당 decode / tokens/sec / peak RSS 측정
+    # (GPU 와 network 없이 실행되며, baseline 파일이 있으면 회귀 여부를 함께 출력하고 회귀 시 종료 코드 1)
+    elif args.benchmark == "micro":
+        result = runMicroBenchmark(args.prompt_file, args.tiny_model_path, args.result_file, args.baseline_file,
+                                   args.tolerance, args.update_baseline)
+
+    elif args.benchmark == "micro-once":
+        result = measureMicroBenchmark(args.prompt_file)
+
+    # 작은 모델로 int8 양자화 적재(adapter 병합 후 양자화)와 생성이 되는지 확인 - 실패하면 종료 코드 1
+    else:
+        result = checkTinyModelQuantization(args.prompt_file, args.tiny_model_path, args.max_new_tokens)
+
+    # 마지막 줄은 항상 한 줄짜리 JSON 으로 출력해서 다른 프로세스가 결과를 읽을 수 있도록 함
+    print(json.dumps(result, ensure_ascii=False))
+
+    if args.benchmark == "micro" and result["baselineComparison"] and result["baselineComparison"]["regressionList"]:
+        sys.exit(1)
+
+    if args.benchmark in ("tiny-quantization", "onnx-engine-parity") and not result["isPassed"]:
+        sys.exit(1)
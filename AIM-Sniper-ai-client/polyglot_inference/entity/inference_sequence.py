@@ -0,0 +1,47 @@
+import time
+from concurrent.futures import Future
+
+import torch
+
+
+class InferenceSequence:
+    def __init__(self, adapterName, inputIdList, maxNewTokens, stoppingCriteria=None, promptPrefix=None,
+                 tokenCallback=None):
+        self.adapterName = adapterName
+        self.inputIdList = inputIdList
+        self.maxNewTokens = maxNewTokens
+        self.stoppingCriteria = stoppingCriteria
+
+        # 고정 prefix 의 KV cache 를 재사용할 수 있을 때만 값이 있음 (prefix 이후 토큰만 prefill)
+        self.promptPrefix = promptPrefix
+        self.prefixLength = 0
+
+        # 토큰이 생성될 때마다 지금까지 생성된 토큰 id 를 받는 함수 (스트리밍용, engine thread 에서 호출됨)
+        self.tokenCallback = tokenCallback
+
+        self.generatedIdList = []
+        self.future = Future()
+        self.submittedTime = time.perf_counter()
+
+    def appendToken(self, tokenId):
+        self.generatedIdList.append(tokenId)
+
+        if self.tokenCallback is not None:
+            try:
+                self.tokenCallback(tuple(self.generatedIdList))
+            except Exception:
+                # 스트리밍 실패는 생성 결과에 영향을 주지 않도록 이후 조각 전송만 멈춤
+                self.tokenCallback = None
+
+    def isStopSequenceGenerated(self):
+        if self.stoppingCriteria is None or not self.generatedIdList:
+            return False
+
+        return bool(self.stoppingCriteria(torch.tensor([self.generatedIdList]), None).all())
+
+    def getGeneratedTokenCount(self):
+        return len(self.generatedIdList)
+
+    def __str__(self):
+        return (f"InferenceSequence(adapterName={self.adapterName}, inputLength={len(self.inputIdList)}, "
+                f"generated={len(self.generatedIdList)}/{self.maxNewTokens})")
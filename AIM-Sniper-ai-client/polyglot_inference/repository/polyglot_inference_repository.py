@@ -0,0 +1,29 @@
+from abc import ABC, abstractmethod
+
+
+class PolyglotInferenceRepository(ABC):
+    @abstractmethod
+    def startWorkerPool(self, workerCount):
+        pass
+
+    @abstractmethod
+    def isWorkerPoolStarted(self):
+        pass
+
+    @abstractmethod
+    def submit(self, adapterName, source, maxNewTokens, stoppingCriteria=None, promptPrefix=None,
+               tokenCallback=None):
+        pass
+
+    @abstractmethod
+    def submitGroup(self, adapterName, sourceList, maxNewTokens, stoppingCriteria=None, promptPrefix=None,
+                    tokenCallbackList=None):
+        pass
+
+    @abstractmethod
+    def generate(self, adapterName, source, maxNewTokens, stoppingCriteria=None, promptPrefix=None):
+        pass
+
+    @abstractmethod
+    def getStatus(self):
+        pass
@@ -0,0 +1,590 @@
+import itertools
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from functools import partial
+
+import torch
+from dotenv import load_dotenv
+
+from polyglot_inference.entity.inference_sequence import InferenceSequence
+from polyglot_inference.repository.polyglot_inference_repository import PolyglotInferenceRepository
+from polyglot_inference.utility.inference_executor import InferenceExecutor
+from polyglot_inference.utility.stop_sequence_criteria import StopSequenceCriteria
+from pipeline_metrics.repository.pipeline_metrics_repository_impl import PipelineMetricsRepositoryImpl
+from polyglot_model.repository.polyglot_model_repository_impl import PolyglotModelRepositoryImpl
+
+load_dotenv()
+
+
+# 아래 함수들은 fork 된 worker 프로세스에서 실행됨
+def runInferenceWorker(workerIndex, requestQueue, responseQueue, torchThreadCount):
+    # worker 끼리 물리 코어를 나눠 쓰도록 intra-op thread 수를 줄임
+    torch.set_num_threads(torchThreadCount)
+
+    inferenceRepository = PolyglotInferenceRepositoryImpl.getInstance()
+    tokenizer = PolyglotModelRepositoryImpl.getInstance().getTokenizer()
+    responseQueue.put(("ready", workerIndex, None, os.getpid()))
+
+    # 요청은 이 프로세스의 engine 에 넣기만 하고 결과를 기다리지 않음 - engine thread 가 계속 돌면서 생성 중인 batch 에
+    # 새 요청을 합류시키므로 worker 안에서도 continuous batching 이 유지되고, 결과는 sequence 가 끝나는 대로 보냄
+    while True:
+        request = requestQueue.get()
+        if request is None:
+            return
+
+        requestId, adapterName, sourceList, maxNewTokens, stopSequenceList, promptPrefix, streamIndexList = request
+        try:
+            # tokenizer 를 들고 있는 stopping criteria 는 넘겨받을 수 없으므로 stop sequence 목록으로 다시 만듦
+            stoppingCriteria = StopSequenceCriteria(tokenizer, stopSequenceList) if stopSequenceList else None
+            tokenCallbackList = [partial(sendWorkerToken, responseQueue, requestId, index)
+                                 if index in streamIndexList else None for index in range(len(sourceList))]
+            futureList = inferenceRepository.submitGroup(adapterName, sourceList, maxNewTokens, stoppingCriteria,
+                                                         promptPrefix, tokenCallbackList)
+        except Exception as exception:
+            for index in range(len(sourceList)):
+                responseQueue.put(("error", requestId, index, repr(exception)))
+            continue
+
+        for index, future in enumerate(futureList):
+            future.add_done_callback(partial(sendWorkerResult, responseQueue, requestId, index))
+
+
+def sendWorkerToken(responseQueue, requestId, index, generatedIdList):
+    # 스트리밍하는 sequence 만 매 토큰마다 마지막 토큰을 보내고, 부모 프로세스에서 이어 붙여 callback 을 호출
+    responseQueue.put(("token", requestId, index, generatedIdList[-1]))
+
+
+def sendWorkerResult(responseQueue, requestId, index, future):
+    if future.exception() is not None:
+        responseQueue.put(("error", requestId, index, repr(future.exception())))
+        return
+
+    responseQueue.put(("result", requestId, index, future.result()))
+
+
+class PolyglotInferenceRepositoryImpl(PolyglotInferenceRepository):
+    __instance = None
+
+    # 하나의 decoding batch 에 함께 올릴 수 있는 최대 sequence 수
+    MAX_BATCH_SIZE = int(os.getenv("POLYGLOT_MAX_BATCH_SIZE", "8"))
+
+    # 처리할 sequence 가 없을 때 대기열을 다시 확인하는 주기(초)
+    IDLE_WAIT_SECONDS = 0.5
+
+    # 기동 시 warmup 생성에서 만들 토큰 수 (lazy 초기화와 메모리 할당을 첫 사용자 요청 전에 끝내는 용도)
+    WARMUP_MAX_NEW_TOKENS = int(os.getenv("POLYGLOT_WARMUP_MAX_NEW_TOKENS", "16"))
+
+    # 0 이면 이 프로세스의 engine thread 에서 처리, N 이면 모델을 올린 뒤 fork 한 N 개의 worker 프로세스에서 처리
+    # (worker 마다 자기 engine thread 를 계속 돌리므로 worker 안에서도 요청이 생성 중인 batch 에 합류함)
+    WORKER_COUNT = int(os.getenv("POLYGLOT_WORKER_COUNT", "0"))
+
+    def __new__(cls):
+        if cls.__instance is None:
+            cls.__instance = super().__new__(cls)
+            cls.__instance.__polyglotModelRepository = PolyglotModelRepositoryImpl.getInstance()
+            cls.__instance.__pendingQueue = queue.Queue()
+            cls.__instance.__deferredGroupList = []
+            cls.__instance.__runningBatchDict = {}
+            cls.__instance.__prefixCacheDict = {}
+            cls.__instance.__engineThread = None
+            cls.__instance.__engineLock = threading.Lock()
+            cls.__instance.__workerList = []
+            cls.__instance.__workerCount = 0
+            cls.__instance.__workerResponseQueue = None
+            cls.__instance.__workerRequestDict = {}
+            cls.__instance.__workerRequestIdCounter = itertools.count()
+            cls.__instance.__workerRequestLock = threading.Lock()
+
+            # worker 프로세스 모드에서는 자식 프로세스의 engine 지표가 부모로 오지 않으므로 worker 별 생성 중인 sequence 수만 보임
+            cls.__instance.__pipelineMetricsRepository = PipelineMetricsRepositoryImpl.getInstance()
+            cls.__instance.__pipelineMetricsRepository.registerGaugeProvider(cls.__instance.__getGaugeList)
+
+            # fork 시점에 다른 thread 가 잡고 있던 lock / 대기열은 자식에서 풀리지 않으므로 새로 만듦
+            if hasattr(os, "register_at_fork"):
+                os.register_at_fork(after_in_child=cls.__instance.__resetAfterFork)
+
+        return cls.__instance
+
+    @classmethod
+    def getInstance(cls):
+        if cls.__instance is None:
+            cls.__instance = cls()
+
+        return cls.__instance
+
+    def __startEngineIfNeeded(self):
+        with self.__engineLock:
+            if self.__engineThread is not None and self.__engineThread.is_alive():
+                return
+
+            self.__engineThread = threading.Thread(target=self.__runEngine, name="PolyglotInferenceEngine",
+                                                   daemon=True)
+            self.__engineThread.start()
+
+    def __resetAfterFork(self):
+        # 부모가 계산해 둔 prefix KV cache 는 모델 weight 와 함께 copy-on-write 로 그대로 공유
+        self.__pendingQueue = queue.Queue()
+        self.__deferredGroupList = []
+        self.__runningBatchDict = {}
+        self.__engineThread = None
+        self.__engineLock = threading.Lock()
+        self.__workerList = []
+        self.__workerCount = 0
+        self.__workerResponseQueue = None
+        self.__workerRequestDict = {}
+        self.__workerRequestLock = threading.Lock()
+
+    def startWorkerPool(self, workerCount):
+        with self.__engineLock:
+            if self.__workerList:
+                return self.__workerList
+
+            # 부모에서 모델을 먼저 올려둬야 fork 된 worker 들이 weight 를 다시 읽지 않고 copy-on-write 로 공유함
+            self.__polyglotModelRepository.loadModel()
+
+            torchThreadCount = max(1, InferenceExecutor.PHYSICAL_CORE_COUNT // workerCount)
+            context = multiprocessing.get_context("fork")
+            responseQueue = context.Queue()
+
+            # worker 마다 요청 대기열을 따로 두고, 결과 / 스트리밍 토큰은 하나의 응답 대기열로 모아서 받음
+            workerList = []
+            for workerIndex in range(workerCount):
+                requestQueue = context.Queue()
+                process = context.Process(target=runInferenceWorker, name=f"PolyglotInferenceWorker-{workerIndex}",
+                                          args=(workerIndex, requestQueue, responseQueue, torchThreadCount),
+                                          daemon=True)
+                process.start()
+                workerList.append({"process": process, "requestQueue": requestQueue, "runningCount": 0})
+
+            # 모든 worker 가 요청을 받을 준비가 된 뒤에 응답 수신 thread 를 띄움
+            for _ in range(workerCount):
+                responseQueue.get()
+
+            self.__workerResponseQueue = responseQueue
+            self.__workerList = workerList
+            self.__workerCount = workerCount
+            threading.Thread(target=self.__receiveWorkerResponse, name="PolyglotInferenceWorkerReceiver",
+                             daemon=True).start()
+
+            return workerList
+
+    def isWorkerPoolStarted(self):
+        return bool(self.__workerList)
+
+    def __submitGroupToWorker(self, adapterName, sourceList, maxNewTokens, stoppingCriteria, promptPrefix,
+                              tokenCallbackList):
+        stopSequenceList = getattr(stoppingCriteria, "stopSequenceList", None)
+        tokenCallbackList = tokenCallbackList or [None] * len(sourceList)
+        workerRequest = {
+            "futureList": [Future() for _ in sourceList],
+            "tokenCallbackList": list(tokenCallbackList),
+            "generatedIdListList": [[] for _ in sourceList],
+            "remainingCount": len(sourceList),
+        }
+
+        with self.__workerRequestLock:
+            # 생성 중인 sequence 가 가장 적은 worker 로 보내서 worker 별 batch 크기를 고르게 유지
+            aliveWorkerIndexList = [workerIndex for workerIndex, worker in enumerate(self.__workerList)
+                                    if worker["process"].is_alive()]
+            if not aliveWorkerIndexList:
+                raise RuntimeError("실행 중인 inference worker 가 없습니다")
+
+            workerIndex = min(aliveWorkerIndexList, key=lambda index: self.__workerList[index]["runningCount"])
+            worker = self.__workerList[workerIndex]
+            worker["runningCount"] += len(sourceList)
+
+            requestId = next(self.__workerRequestIdCounter)
+            workerRequest["workerIndex"] = workerIndex
+            self.__workerRequestDict[requestId] = workerRequest
+
+        streamIndexList = [index for index, tokenCallback in enumerate(tokenCallbackList) if tokenCallback is not None]
+        worker["requestQueue"].put(
+            (requestId, adapterName, sourceList, maxNewTokens, stopSequenceList, promptPrefix, streamIndexList))
+
+        return workerRequest["futureList"]
+
+    def __receiveWorkerResponse(self):
+        lastHealthCheckTime = time.perf_counter()
+        while True:
+            try:
+                messageType, requestId, index, payload = self.__workerResponseQueue.get(
+                    timeout=self.IDLE_WAIT_SECONDS)
+                self.__handleWorkerResponse(messageType, requestId, index, payload)
+            except queue.Empty:
+                pass
+
+            # 요청을 처리하던 worker 가 죽으면 결과가 오지 않으므로 기다리던 요청을 실패로 끝냄
+            if time.perf_counter() - lastHealthCheckTime >= self.IDLE_WAIT_SECONDS:
+                lastHealthCheckTime = time.perf_counter()
+                self.__failDeadWorkerRequest()
+
+    def __handleWorkerResponse(self, messageType, requestId, index, payload):
+        workerRequest = self.__workerRequestDict.get(requestId)
+        if workerRequest is None:
+            return
+
+        if messageType == "token":
+            generatedIdList = workerRequest["generatedIdListList"][index]
+            generatedIdList.append(payload)
+
+            tokenCallback = workerRequest["tokenCallbackList"][index]
+            if tokenCallback is not None:
+                try:
+                    tokenCallback(tuple(generatedIdList))
+                except Exception:
+                    # 스트리밍 실패는 생성 결과에 영향을 주지 않도록 이후 조각 전송만 멈춤
+                    workerRequest["tokenCallbackList"][index] = None
+        elif messageType == "result":
+            self.__completeWorkerSequence(requestId, index, result=payload)
+        else:
+            self.__completeWorkerSequence(requestId, index, exception=RuntimeError(payload))
+
+    def __completeWorkerSequence(self, requestId, index, result=None, exception=None):
+        with self.__workerRequestLock:
+            workerRequest = self.__workerRequestDict.get(requestId)
+            if workerRequest is None or workerRequest["futureList"][index].done():
+                return
+
+            self.__workerList[workerRequest["workerIndex"]]["runningCount"] -= 1
+            workerRequest["remainingCount"] -= 1
+            if workerRequest["remainingCount"] == 0:
+                del self.__workerRequestDict[requestId]
+
+        future = workerRequest["futureList"][index]
+        if exception is None:
+            future.set_result(result)
+        else:
+            future.set_exception(exception)
+
+    def __failDeadWorkerRequest(self):
+        for workerIndex, worker in enumerate(self.__workerList):
+            if worker["runningCount"] == 0 or worker["process"].is_alive():
+                continue
+
+            exception = RuntimeError(f"inference worker {workerIndex} 가 종료되었습니다 "
+                                     f"(exitcode={worker['process'].exitcode})")
+            for requestId, workerRequest in list(self.__workerRequestDict.items()):
+                if workerRequest["workerIndex"] != workerIndex:
+                    continue
+
+                for index in range(len(workerRequest["futureList"])):
+                    self.__completeWorkerSequence(requestId, index, exception=exception)
+
+    def submit(self, adapterName, source, maxNewTokens, stoppingCriteria=None, promptPrefix=None,
+               tokenCallback=None):
+        tokenCallbackList = None if tokenCallback is None else [tokenCallback]
+        return self.submitGroup(adapterName, [source], maxNewTokens, stoppingCriteria, promptPrefix,
+                                tokenCallbackList)[0]
+
+    def submitGroup(self, adapterName, sourceList, maxNewTokens, stoppingCriteria=None, promptPrefix=None,
+                    tokenCallbackList=None):
+        if not sourceList:
+            return []
+
+        # worker 프로세스에서 생성하는 경우 토큰 단위 callback 은 응답 수신 thread 에서 호출됨
+        if self.__workerList:
+            return self.__submitGroupToWorker(adapterName, sourceList, maxNewTokens, stoppingCriteria, promptPrefix,
+                                              tokenCallbackList)
+
+        # 함께 제출된 sequence 들은 한 번의 prefill 로 같이 batch 에 합류함
+        tokenizer = self.__polyglotModelRepository.getTokenizer()
+        inputIdListList = tokenizer(sourceList, return_token_type_ids=False)["input_ids"]
+
+        tokenCallbackList = tokenCallbackList or [None] * len(sourceList)
+        sequenceGroup = [InferenceSequence(adapterName, inputIdList, maxNewTokens, stoppingCriteria,
+                                           tokenCallback=tokenCallback)
+                         for inputIdList, tokenCallback in zip(inputIdListList, tokenCallbackList)]
+
+        if promptPrefix is not None:
+            prefixIdList = tokenizer(promptPrefix, return_token_type_ids=False)["input_ids"]
+
+            # prefix 를 따로 토크나이즈한 결과가 전체 프롬프트의 앞부분과 같을 때만 cache 를 재사용 (경계 토큰이 달라지면 출력이 바뀜)
+            if all(sequence.inputIdList[:len(prefixIdList)] == prefixIdList
+                   and len(sequence.inputIdList) > len(prefixIdList) for sequence in sequenceGroup):
+                for sequence in sequenceGroup:
+                    sequence.promptPrefix = promptPrefix
+                    sequence.prefixLength = len(prefixIdList)
+
+        self.__pendingQueue.put(sequenceGroup)
+        self.__startEngineIfNeeded()
+
+        return [sequence.future for sequence in sequenceGroup]
+
+    def generate(self, adapterName, source, maxNewTokens, stoppingCriteria=None, promptPrefix=None):
+        return self.submit(adapterName, source, maxNewTokens, stoppingCriteria, promptPrefix).result()
+
+    def getStatus(self):
+        return {
+            "workerCount": self.__workerCount,
+            "pendingGroupCount": self.__pendingQueue.qsize() + len(self.__deferredGroupList),
+            "runningCount": {adapterName: len(batch["sequenceList"])
+                             for adapterName, batch in self.__runningBatchDict.items()},
+            "workerRunningCount": [worker["runningCount"] for worker in self.__workerList],
+        }
+
+    def __getGaugeList(self):
+        status = self.getStatus()
+        gaugeList = [("inference_pending_groups", {}, status["pendingGroupCount"])]
+        gaugeList.extend(("inference_running_sequences", {"adapter": adapterName}, runningCount)
+                         for adapterName, runningCount in status["runningCount"].items())
+        gaugeList.extend(("inference_worker_running_sequences", {"worker": str(workerIndex)}, runningCount)
+                         for workerIndex, runningCount in enumerate(status["workerRunningCount"]))
+
+        return gaugeList
+
+    def __runEngine(self):
+        # token 한 step 단위로 새로 들어온 sequence 를 기존 batch 에 합류시키고, 끝난 sequence 는 바로 돌려줌
+        while True:
+            self.__admitPendingSequence(block=not self.__runningBatchDict)
+
+            for adapterName in list(self.__runningBatchDict.keys()):
+                batch = self.__runningBatchDict[adapterName]
+                try:
+                    self.__decodeStep(adapterName, batch)
+                except Exception as exception:
+                    self.__failBatch(batch, exception)
+                    del self.__runningBatchDict[adapterName]
+                    continue
+
+                if not batch["sequenceList"]:
+                    del self.__runningBatchDict[adapterName]
+
+    def __admitPendingSequence(self, block):
+        admittedGroupList = []
+        admittedCountDict = {}
+
+        # 지난 step 에 자리가 없어 미뤄진 group 을 새로 들어온 group 보다 먼저 검토
+        candidateGroupList = self.__deferredGroupList
+        self.__deferredGroupList = []
+        try:
+            if block and not candidateGroupList:
+                candidateGroupList.append(self.__pendingQueue.get(timeout=self.IDLE_WAIT_SECONDS))
+            while True:
+                candidateGroupList.append(self.__pendingQueue.get_nowait())
+        except queue.Empty:
+            pass
+
+        # adapter 별로 먼저 들어온 group 이 미뤄지면 뒤의 group 도 함께 미룸 - 그렇지 않으면 작은 요청이 계속 들어올 때
+        # 자리가 날 때마다 작은 요청이 먼저 채워서 큰 group 이 영원히 합류하지 못함
+        blockedAdapterNameSet = set()
+        for sequenceGroup in candidateGroupList:
+            adapterName = sequenceGroup[0].adapterName
+            runningCount = len(self.__runningBatchDict.get(adapterName, {}).get("sequenceList", []))
+            occupiedCount = runningCount + admittedCountDict.get(adapterName, 0)
+
+            # batch 에 자리가 없으면 다음 step 에 다시 시도, 단 batch 가 비어 있으면 크기와 무관하게 받아들임
+            if adapterName not in blockedAdapterNameSet and (
+                    occupiedCount == 0 or occupiedCount + len(sequenceGroup) <= self.MAX_BATCH_SIZE):
+                admittedGroupList.append(sequenceGroup)
+                admittedCountDict[adapterName] = admittedCountDict.get(adapterName, 0) + len(sequenceGroup)
+            else:
+                blockedAdapterNameSet.add(adapterName)
+                self.__deferredGroupList.append(sequenceGroup)
+
+        for sequenceGroup in admittedGroupList:
+            adapterName = sequenceGroup[0].adapterName
+            adapterLabelDict = {"adapter": adapterName}
+            prefillStartTime = time.perf_counter()
+            for sequence in sequenceGroup:
+                self.__pipelineMetricsRepository.observe("inference_queue_seconds", adapterLabelDict,
+                                                         prefillStartTime - sequence.submittedTime)
+
+            try:
+                newBatch = self.__prefill(adapterName, sequenceGroup)
+            except Exception as exception:
+                self.__failBatch({"sequenceList": sequenceGroup}, exception)
+                continue
+
+            self.__pipelineMetricsRepository.observe("inference_prefill_seconds", adapterLabelDict,
+                                                     time.perf_counter() - prefillStartTime)
+
+            runningBatch = self.__runningBatchDict.get(adapterName)
+            self.__runningBatchDict[adapterName] = newBatch if runningBatch is None \
+                else self.__mergeBatch(runningBatch, newBatch)
+
+    def __getEosTokenIdSet(self, model):
+        tokenizer = self.__polyglotModelRepository.getTokenizer()
+        eosTokenId = model.generation_config.eos_token_id
+        eosTokenIdList = eosTokenId if isinstance(eosTokenId, list) else [eosTokenId]
+
+        return {tokenId for tokenId in eosTokenIdList + [tokenizer.eos_token_id] if tokenId is not None}
+
+    def __toLegacyCache(self, pastKeyValues):
+        if hasattr(pastKeyValues, "to_legacy_cache"):
+            return pastKeyValues.to_legacy_cache()
+
+        return pastKeyValues
+
+    def __forward(self, model, inputIds, attentionMask, pastKeyValues=None):
+        # left padding 된 위치를 건너뛰도록 attention mask 누적합으로 position id 를 계산
+        positionIds = attentionMask.long().cumsum(-1) - 1
+        positionIds.masked_fill_(attentionMask == 0, 1)
+        positionIds = positionIds[:, -inputIds.shape[1]:]
+
+        with torch.no_grad():
+            output = model(input_ids=inputIds,
+                           attention_mask=attentionMask,
+                           position_ids=positionIds,
+                           past_key_values=pastKeyValues,
+                           use_cache=True)
+
+        nextTokenIds = output.logits[:, -1, :].argmax(dim=-1)
+
+        return nextTokenIds, self.__toLegacyCache(output.past_key_values)
+
+    def __getPrefixCache(self, adapterName, model, sequence):
+        # adapter 마다 K/V projection 이 다르므로 prefix cache 도 adapter 별로 따로 보관
+        prefixCacheKey = (adapterName, sequence.promptPrefix)
+        if prefixCacheKey not in self.__prefixCacheDict:
+            device = self.__polyglotModelRepository.device
+            prefixIds = torch.tensor([sequence.inputIdList[:sequence.prefixLength]], dtype=torch.long, device=device)
+            _, prefixPastKeyValues = self.__forward(model, prefixIds, torch.ones_like(prefixIds))
+            self.__prefixCacheDict[prefixCacheKey] = prefixPastKeyValues
+
+        return self.__prefixCacheDict[prefixCacheKey]
+
+    def __prefill(self, adapterName, sequenceList):
+        device = self.__polyglotModelRepository.device
+        tokenizer = self.__polyglotModelRepository.getTokenizer()
+        prefixLength = sequenceList[0].prefixLength
+
+        # prefix cache 를 쓰는 경우 prefix 뒤의 토큰만 left padding 해서 prefill
+        # (padding 이 prefix 와 본문 사이에 끼지만 attention mask 와 position id 가 이를 건너뜀)
+        suffixIdListList = [sequence.inputIdList[prefixLength:] for sequence in sequenceList]
+        maxInputLength = max(len(suffixIdList) for suffixIdList in suffixIdListList)
+        inputIds = torch.full((len(sequenceList), maxInputLength), tokenizer.pad_token_id, dtype=torch.long)
+        attentionMask = torch.zeros((len(sequenceList), maxInputLength), dtype=torch.long)
+        for index, suffixIdList in enumerate(suffixIdListList):
+            inputLength = len(suffixIdList)
+            inputIds[index, maxInputLength - inputLength:] = torch.tensor(suffixIdList)
+            attentionMask[index, maxInputLength - inputLength:] = 1
+
+        inputIds = inputIds.to(device)
+        attentionMask = attentionMask.to(device)
+
+        with self.__polyglotModelRepository.useAdapter(adapterName) as model:
+            pastKeyValues = None
+            if prefixLength:
+                prefixPastKeyValues = self.__getPrefixCache(adapterName, model, sequenceList[0])
+                pastKeyValues = tuple(
+                    tuple(layerCache.expand(len(sequenceList), -1, -1, -1) for layerCache in layer)
+                    for layer in prefixPastKeyValues)
+                attentionMask = torch.cat(
+                    [attentionMask.new_ones((len(sequenceList), prefixLength)), attentionMask], dim=-1)
+
+            nextTokenIds, pastKeyValues = self.__forward(model, inputIds, attentionMask, pastKeyValues)
+            eosTokenIdSet = self.__getEosTokenIdSet(model)
+
+        batch = {
+            "sequenceList": sequenceList,
+            "pastKeyValues": pastKeyValues,
+            "attentionMask": attentionMask,
+            "nextTokenIds": nextTokenIds,
+            "eosTokenIdSet": eosTokenIdSet,
+        }
+        self.__collectToken(batch)
+
+        return batch
+
+    def __decodeStep(self, adapterName, batch):
+        stepStartTime = time.perf_counter()
+        attentionMask = batch["attentionMask"]
+        attentionMask = torch.cat([attentionMask, attentionMask.new_ones((attentionMask.shape[0], 1))], dim=-1)
+
+        with self.__polyglotModelRepository.useAdapter(adapterName) as model:
+            nextTokenIds, pastKeyValues = self.__forward(
+                model, batch["nextTokenIds"].unsqueeze(-1), attentionMask, batch["pastKeyValues"])
+
+        batch["attentionMask"] = attentionMask
+        batch["pastKeyValues"] = pastKeyValues
+        batch["nextTokenIds"] = nextTokenIds
+
+        # batch 의 sequence 마다 한 토큰씩 만들었으므로 step 하나의 처리량은 batch 크기 / step 시간
+        stepSeconds = time.perf_counter() - stepStartTime
+        adapterLabelDict = {"adapter": adapterName}
+        self.__pipelineMetricsRepository.observe("inference_decode_step_seconds", adapterLabelDict, stepSeconds)
+        self.__pipelineMetricsRepository.setGauge("inference_tokens_per_second", adapterLabelDict,
+                                                  len(batch["sequenceList"]) / max(stepSeconds, 1e-9))
+        self.__collectToken(batch)
+
+    def __collectToken(self, batch):
+        keepIndexList = []
+        for index, (sequence, tokenId) in enumerate(zip(batch["sequenceList"], batch["nextTokenIds"].tolist())):
+            isEos = tokenId in batch["eosTokenIdSet"]
+            if not isEos:
+                sequence.appendToken(tokenId)
+                self.__pipelineMetricsRepository.increment("inference_generated_tokens_total",
+                                                           {"adapter": sequence.adapterName})
+
+            # eos, 최대 길이, 프로토콜별 stop sequence 중 하나라도 만나면 해당 sequence 만 batch 에서 내림
+            if (isEos or sequence.getGeneratedTokenCount() >= sequence.maxNewTokens
+                    or sequence.isStopSequenceGenerated()):
+                self.__pipelineMetricsRepository.observe("inference_sequence_seconds", {"adapter": sequence.adapterName},
+                                                         time.perf_counter() - sequence.submittedTime)
+                sequence.future.set_result(sequence.generatedIdList)
+            else:
+                keepIndexList.append(index)
+
+        if len(keepIndexList) != len(batch["sequenceList"]):
+            self.__selectBatch(batch, keepIndexList)
+
+    def __selectBatch(self, batch, keepIndexList):
+        batch["sequenceList"] = [batch["sequenceList"][index] for index in keepIndexList]
+        if not keepIndexList:
+            return
+
+        device = batch["attentionMask"].device
+        keepIndex = torch.tensor(keepIndexList, dtype=torch.long, device=device)
+        attentionMask = batch["attentionMask"].index_select(0, keepIndex)
+
+        # 남은 sequence 모두에게 padding 인 앞쪽 column 은 잘라내서 cache 크기를 줄임
+        paddingLength = int((attentionMask.sum(dim=0) == 0).long().cumprod(dim=0).sum().item())
+
+        batch["attentionMask"] = attentionMask[:, paddingLength:]
+        batch["nextTokenIds"] = batch["nextTokenIds"].index_select(0, keepIndex)
+        batch["pastKeyValues"] = tuple(
+            tuple(layerCache.index_select(0, keepIndex)[:, :, paddingLength:, :] for layerCache in layer)
+            for layer in batch["pastKeyValues"])
+
+    def __leftPadBatch(self, batch, targetLength):
+        paddingLength = targetLength - batch["attentionMask"].shape[1]
+        if paddingLength == 0:
+            return batch["attentionMask"], batch["pastKeyValues"]
+
+        attentionMask = torch.nn.functional.pad(batch["attentionMask"], (paddingLength, 0), value=0)
+        pastKeyValues = tuple(
+            tuple(torch.nn.functional.pad(layerCache, (0, 0, paddingLength, 0), value=0.0) for layerCache in layer)
+            for layer in batch["pastKeyValues"])
+
+        return attentionMask, pastKeyValues
+
+    def __mergeBatch(self, runningBatch, newBatch):
+        # 길이가 다른 두 batch 는 짧은 쪽 cache 앞에 padding 을 붙여서 길이를 맞춘 뒤 batch 차원으로 이어 붙임
+        if not runningBatch["sequenceList"]:
+            return newBatch
+        if not newBatch["sequenceList"]:
+            return runningBatch
+
+        targetLength = max(runningBatch["attentionMask"].shape[1], newBatch["attentionMask"].shape[1])
+        runningMask, runningCache = self.__leftPadBatch(runningBatch, targetLength)
+        newMask, newCache = self.__leftPadBatch(newBatch, targetLength)
+
+        return {
+            "sequenceList": runningBatch["sequenceList"] + newBatch["sequenceList"],
+            "pastKeyValues": tuple(
+                tuple(torch.cat([runningLayerCache, newLayerCache], dim=0)
+                      for runningLayerCache, newLayerCache in zip(runningLayer, newLayer))
+                for runningLayer, newLayer in zip(runningCache, newCache)),
+            "attentionMask": torch.cat([runningMask, newMask], dim=0),
+            "nextTokenIds": torch.cat([runningBatch["nextTokenIds"], newBatch["nextTokenIds"]], dim=0),
+            "eosTokenIdSet": runningBatch["eosTokenIdSet"],
+        }
+
+    def __failBatch(self, batch, exception):
+        for sequence in batch["sequenceList"]:
+            if not sequence.future.done():
+                sequence.future.set_exception(exception)
@@ -0,0 +1,11 @@
+from abc import ABC, abstractmethod
+
+
+class PolyglotInferenceService(ABC):
+    @abstractmethod
+    def startWorkerPool(self):
+        pass
+
+    @abstractmethod
+    def getStatus(self):
+        pass
@@ -0,0 +1,41 @@
+import multiprocessing
+
+from polyglot_inference.repository.polyglot_inference_repository_impl import PolyglotInferenceRepositoryImpl
+from polyglot_inference.service.polyglot_inference_service import PolyglotInferenceService
+from template.utility.color_print import ColorPrinter
+
+
+class PolyglotInferenceServiceImpl(PolyglotInferenceService):
+    __instance = None
+
+    def __new__(cls):
+        if cls.__instance is None:
+            cls.__instance = super().__new__(cls)
+            cls.__instance.__polyglotInferenceRepository = PolyglotInferenceRepositoryImpl.getInstance()
+
+        return cls.__instance
+
+    @classmethod
+    def getInstance(cls):
+        if cls.__instance is None:
+            cls.__instance = cls()
+
+        return cls.__instance
+
+    def startWorkerPool(self):
+        workerCount = self.__polyglotInferenceRepository.WORKER_COUNT
+        if workerCount <= 0:
+            return False
+
+        # weight 를 copy-on-write 로 공유하려면 fork 가 필요하므로 Windows 에서는 기존처럼 프로세스 하나로 처리
+        if "fork" not in multiprocessing.get_all_start_methods():
+            ColorPrinter.print_important_message("fork 를 지원하지 않는 운영체제라 inference worker pool 없이 실행합니다")
+            return False
+
+        self.__polyglotInferenceRepository.startWorkerPool(workerCount)
+        ColorPrinter.print_important_data("polyglot inference worker count", workerCount)
+
+        return True
+
+    def getStatus(self):
+        return self.__polyglotInferenceRepository.getStatus()
@@ -0,0 +1,52 @@
+import asyncio
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import psutil
+import torch
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+class InferenceExecutor:
+    __instance = None
+
+    # hyper-threading 으로 늘어난 논리 코어는 행렬 연산에 도움이 되지 않으므로 물리 코어 수를 기준으로 함
+    PHYSICAL_CORE_COUNT = psutil.cpu_count(logical=False) or os.cpu_count() or 1
+
+    # 모델 적재 / 토크나이즈 / 디코딩처럼 이벤트 루프를 멈추게 하는 작업을 처리하는 worker 수
+    WORKER_COUNT = int(os.getenv("POLYGLOT_INFERENCE_WORKER_COUNT", str(PHYSICAL_CORE_COUNT)))
+
+    # 실제 forward 는 inference engine thread 하나가 batch 단위로 수행하므로 intra-op thread 는 물리 코어 전체를 사용
+    TORCH_THREAD_COUNT = int(os.getenv("POLYGLOT_TORCH_THREAD_COUNT", str(PHYSICAL_CORE_COUNT)))
+
+    def __new__(cls):
+        if cls.__instance is None:
+            cls.__instance = super().__new__(cls)
+
+            torch.set_num_threads(cls.TORCH_THREAD_COUNT)
+            cls.__instance.__executor = ThreadPoolExecutor(max_workers=cls.WORKER_COUNT,
+                                                           thread_name_prefix="PolyglotInferenceWorker")
+
+        return cls.__instance
+
+    @classmethod
+    def getInstance(cls):
+        if cls.__instance is None:
+            cls.__instance = cls()
+
+        return cls.__instance
+
+    async def run(self, function, *args, **kwargs):
+        # 동기 함수를 worker 에서 실행하고, 끝날 때까지 이벤트 루프는 다른 protocol / socket I/O 를 계속 처리
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.__executor, functools.partial(function, *args, **kwargs))
+
+    async def waitFor(self, future):
+        # inference engine 이 돌려준 concurrent.futures.Future 를 이벤트 루프를 막지 않고 기다림
+        return await asyncio.wrap_future(future)
+
+    async def waitForAll(self, futureList):
+        return await asyncio.gather(*[asyncio.wrap_future(future) for future in futureList])
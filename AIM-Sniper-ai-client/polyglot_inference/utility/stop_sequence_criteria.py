@@ -0,0 +1,40 @@
+import torch
+from transformers import StoppingCriteria
+
+
+class StopSequenceCriteria(StoppingCriteria):
+    def __init__(self, tokenizer, stopSequenceList):
+        self.tokenizer = tokenizer
+        self.stopSequenceList = stopSequenceList
+
+        # 토큰 하나는 최소 한 글자 이상이므로 가장 긴 stop sequence 길이만큼만 끝에서 디코딩하면 충분함
+        # (한글은 byte 단위로 토큰이 쪼개질 수 있어 여유를 둠)
+        self.lookbackTokenCount = max(len(stopSequence) for stopSequence in stopSequenceList) + 2
+
+    def findStopIndex(self, text):
+        # 생성 결과가 빈 줄로 시작해도 "\n\n" 에서 바로 멈추지 않도록 앞쪽 공백 뒤에서부터 찾음
+        contentStartIndex = len(text) - len(text.lstrip())
+        stopIndexList = [stopIndex for stopIndex in (text.find(stopSequence, contentStartIndex)
+                                                     for stopSequence in self.stopSequenceList) if stopIndex >= 0]
+
+        return min(stopIndexList) if stopIndexList else -1
+
+    def __isStopped(self, inputIdList):
+        tailText = self.tokenizer.decode(inputIdList[-self.lookbackTokenCount:], skip_special_tokens=True)
+        if not any(stopSequence in tailText for stopSequence in self.stopSequenceList):
+            return False
+
+        # 끝부분에 stop sequence 가 있을 때만 전체를 디코딩해서 앞쪽 공백 안의 일치인지 확인
+        if len(inputIdList) <= self.lookbackTokenCount:
+            return self.findStopIndex(tailText) >= 0
+
+        return self.findStopIndex(self.tokenizer.decode(inputIdList, skip_special_tokens=True)) >= 0
+
+    def __call__(self, input_ids, scores, **kwargs):
+        return torch.tensor([self.__isStopped(inputIdList) for inputIdList in input_ids.tolist()],
+                            dtype=torch.bool, device=input_ids.device)
+
+    def trimStopSequence(self, text):
+        stopIndex = self.findStopIndex(text)
+
+        return text[:stopIndex] if stopIndex >= 0 else text
@@ -0,0 +1,52 @@
+class StreamingTextDecoder:
+    # 생성 중인 토큰을 글자 단위 조각으로 바꿔주되, 이어 붙인 결과가 스트리밍하지 않을 때의 최종 텍스트와 같도록
+    # 뒤에 올 토큰에 따라 바뀔 수 있는 끝부분(쪼개진 한글 byte, stop sequence 일부, strip 될 공백)은 보류함
+    def __init__(self, tokenizer, stoppingCriteria=None, strip=False):
+        self.tokenizer = tokenizer
+        self.stoppingCriteria = stoppingCriteria
+        self.strip = strip
+        self.emittedText = ""
+
+    def finalizeText(self, generatedIdList):
+        # 질문 / 채점 repository 가 스트리밍 없이 만드는 결과와 같은 방식으로 최종 텍스트를 만듦
+        text = self.tokenizer.decode(generatedIdList, skip_special_tokens=True)
+        if self.stoppingCriteria is not None:
+            text = self.stoppingCriteria.trimStopSequence(text)
+
+        return text.strip() if self.strip else text
+
+    def __getStableText(self, generatedIdList):
+        text = self.tokenizer.decode(generatedIdList, skip_special_tokens=True)
+        if self.stoppingCriteria is not None:
+            text = self.stoppingCriteria.trimStopSequence(text)
+
+            # 끝부분이 stop sequence 의 앞부분과 같으면 다음 토큰에서 잘려나갈 수 있음
+            holdLength = max((length for stopSequence in self.stoppingCriteria.stopSequenceList
+                              for length in range(1, len(stopSequence))
+                              if text.endswith(stopSequence[:length])), default=0)
+            text = text[:len(text) - holdLength]
+
+        # 아직 글자가 완성되지 않은 byte 토큰은 대체 문자로 디코딩됨
+        text = text.rstrip("�")
+
+        return text.strip() if self.strip else text
+
+    def putToken(self, generatedIdList):
+        stableText = self.__getStableText(generatedIdList)
+        if len(stableText) <= len(self.emittedText) or not stableText.startswith(self.emittedText):
+            return ""
+
+        chunk = stableText[len(self.emittedText):]
+        self.emittedText = stableText
+
+        return chunk
+
+    def finish(self, finalText):
+        # 보류했던 나머지를 돌려주고, 이미 보낸 조각이 최종 텍스트의 앞부분이 아니면 None 으로 알림
+        if not finalText.startswith(self.emittedText):
+            return None
+
+        chunk = finalText[len(self.emittedText):]
+        self.emittedText = finalText
+
+        return chunk
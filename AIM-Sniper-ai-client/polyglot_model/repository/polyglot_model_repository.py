@@ -0,0 +1,59 @@
+from abc import ABC, abstractmethod
+
+
+class PolyglotModelRepository(ABC):
+    @abstractmethod
+    def downloadPretrainedModel(self):
+        pass
+
+    @abstractmethod
+    def getMissingArtifactList(self):
+        pass
+
+    @abstractmethod
+    def loadModel(self):
+        pass
+
+    @abstractmethod
+    def loadMergedModel(self, adapterName):
+        pass
+
+    @abstractmethod
+    def exportMergedModel(self, adapterName, torchDtype):
+        pass
+
+    @abstractmethod
+    def exportOnnxModel(self, adapterName):
+        pass
+
+    @abstractmethod
+    def measureOnnxParity(self, adapterName, sourceList):
+        pass
+
+    @abstractmethod
+    def readOnnxEngineParity(self, adapterName):
+        pass
+
+    @abstractmethod
+    def writeOnnxEngineParity(self, adapterName, parityReport):
+        pass
+
+    @abstractmethod
+    def isLoaded(self):
+        pass
+
+    @abstractmethod
+    def getModel(self):
+        pass
+
+    @abstractmethod
+    def useAdapter(self, adapterName):
+        pass
+
+    @abstractmethod
+    def getTokenizer(self):
+        pass
+
+    @abstractmethod
+    def getLoadReport(self):
+        pass
@@ -0,0 +1,405 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+import psutil
+import torch
+from dotenv import load_dotenv
+from peft import PeftModel
+from transformers import AutoTokenizer, AutoModelForCausalLM
+
+from pipeline_metrics.repository.pipeline_metrics_repository_impl import PipelineMetricsRepositoryImpl
+from polyglot_model.repository.polyglot_model_repository import PolyglotModelRepository
+
+load_dotenv()
+
+
+class PolyglotModelRepositoryImpl(PolyglotModelRepository):
+    __instance = None
+
+    cacheDir = os.path.join("models", "cache")
+
+    # 다른 base model(로컬 경로 포함)과 adapter / 병합 / ONNX 모델 경로를 바꿔서 적재할 때 사용
+    # (polyglot_benchmark_runner.py micro 가 offline 으로 만든 작은 GPT-NeoX 모델을 같은 경로로 적재함)
+    modelRootPath = os.getenv("POLYGLOT_MODEL_ROOT", os.path.join("models", "polyglot-ko-1.3b"))
+
+    device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+
+    config = {
+        "pretrained_model_name_or_path": os.getenv("POLYGLOT_BASE_MODEL", "EleutherAI/polyglot-ko-1.3b"),
+        "trust_remote_code": True,
+        "local_files_only": True,
+        "padding_side": "left",
+        "max_token_length": 1024,
+        # adapter: base model + LoRA adapter 전환 / merged: export_model_runner.py 로 미리 병합해 둔 모델 사용
+        "model_format": os.getenv("POLYGLOT_MODEL_FORMAT", "adapter"),
+        # none: fp32 그대로 사용 / int8: 적재 시 Linear 레이어를 int8 dynamic quantization (CPU 전용)
+        "quantization": os.getenv("POLYGLOT_QUANTIZATION", "none"),
+        # torch: PyTorch eager 실행 / onnx: export_model_runner.py --format onnx 로 내보낸 모델을 ONNX Runtime(CPU)으로 실행
+        "backend": os.getenv("POLYGLOT_BACKEND", "torch"),
+        # onnx backend 는 inference engine 경로(padding / batch 합류 / prefix cache)의 parity 확인을 통과해야 적재함
+        # (polyglot_benchmark_runner.py onnx-engine-parity 가 확인용 하위 프로세스에서만 false 로 설정)
+        "require_onnx_engine_parity": os.getenv("POLYGLOT_REQUIRE_ONNX_ENGINE_PARITY", "true").lower() == "true",
+    }
+
+    # 프로토콜별 LoRA adapter - 병합하지 않고 하나의 base model 위에 함께 붙여서 전환하며 사용
+    adapterPathDict = {
+        "interview": os.path.join(modelRootPath, "interview", "final"),
+        "score": os.path.join(modelRootPath, "score", "r512-epoch100"),
+    }
+
+    # export_model_runner.py 가 adapter 별로 병합해서 저장하는 safetensors 모델 경로
+    mergedModelPathDict = {
+        "interview": os.path.join(modelRootPath, "merged", "interview"),
+        "score": os.path.join(modelRootPath, "merged", "score"),
+    }
+
+    # export_model_runner.py --format onnx 가 adapter 별로 병합해서 내보내는 ONNX 모델 경로 (past key value 입력 포함)
+    onnxModelPathDict = {
+        "interview": os.path.join(modelRootPath, "onnx", "interview"),
+        "score": os.path.join(modelRootPath, "onnx", "score"),
+    }
+
+    # ONNX 모델 경로마다 engine 경로 parity 확인 결과를 남기는 파일 이름
+    onnxEngineParityFileName = "engine_parity.json"
+
+    def __new__(cls):
+        if cls.__instance is None:
+            cls.__instance = super().__new__(cls)
+            cls.__instance.__loadLock = threading.Lock()
+            cls.__instance.__adapterLock = threading.RLock()
+            cls.__instance.__model = None
+            cls.__instance.__mergedModelDict = {}
+            cls.__instance.__tokenizer = None
+            cls.__instance.__loadReport = {}
+
+            # inference worker 를 fork 할 때 engine thread 가 잡고 있던 adapter lock 이 자식에 잠긴 채로 남지 않도록 함
+            if hasattr(os, "register_at_fork"):
+                os.register_at_fork(after_in_child=cls.__instance.__resetLockAfterFork)
+
+        return cls.__instance
+
+    @classmethod
+    def getInstance(cls):
+        if cls.__instance is None:
+            cls.__instance = cls()
+
+        return cls.__instance
+
+    def __resetLockAfterFork(self):
+        self.__loadLock = threading.Lock()
+        self.__adapterLock = threading.RLock()
+
+    def downloadPretrainedModel(self):
+        # 모델 다운로드
+        AutoModelForCausalLM.from_pretrained(
+            self.config['pretrained_model_name_or_path'],
+            cache_dir=self.cacheDir,
+            trust_remote_code=self.config['trust_remote_code']
+        )
+
+        # 토크나이저 다운로드
+        AutoTokenizer.from_pretrained(
+            self.config['pretrained_model_name_or_path'],
+            cache_dir=self.cacheDir,
+            trust_remote_code=self.config['trust_remote_code']
+        )
+
+    def getMissingArtifactList(self):
+        # 설정된 backend / model format 으로 적재할 때 필요한 경로 중 아직 없는 것
+        if self.config['backend'] == "onnx":
+            requiredPathList = list(self.onnxModelPathDict.values())
+        elif self.config['model_format'] == "merged":
+            requiredPathList = list(self.mergedModelPathDict.values())
+        else:
+            # base model 을 로컬 경로로 지정했으면 hub cache 대신 그 경로가 있어야 함
+            pretrainedModelNameOrPath = self.config['pretrained_model_name_or_path']
+            basePath = pretrainedModelNameOrPath if os.path.isdir(pretrainedModelNameOrPath) else self.cacheDir
+            requiredPathList = [basePath] + list(self.adapterPathDict.values())
+
+        return [requiredPath for requiredPath in requiredPathList if not os.path.exists(requiredPath)]
+
+    def __loadBaseModel(self):
+        return AutoModelForCausalLM.from_pretrained(
+            pretrained_model_name_or_path=self.config['pretrained_model_name_or_path'],
+            trust_remote_code=self.config['trust_remote_code'],
+            cache_dir=self.cacheDir,
+            local_files_only=self.config['local_files_only'])
+
+    def __loadTokenizer(self, pretrainedModelNameOrPath):
+        tokenizer = AutoTokenizer.from_pretrained(
+            pretrained_model_name_or_path=pretrainedModelNameOrPath,
+            trust_remote_code=self.config['trust_remote_code'],
+            cache_dir=self.cacheDir,
+            local_files_only=self.config['local_files_only'],
+            padding_side=self.config['padding_side'])
+
+        tokenizer.pad_token = tokenizer.eos_token
+        tokenizer.pad_token_id = tokenizer.eos_token_id
+        tokenizer.model_max_length = self.config['max_token_length']
+
+        return tokenizer
+
+    def __isQuantizationEnabled(self):
+        # dynamic quantization kernel 은 CPU 에서만 동작하므로 GPU 에서는 원래 모델을 그대로 사용
+        return self.config['quantization'] == "int8" and self.device.type == "cpu"
+
+    def __quantizeModel(self, model):
+        if not self.__isQuantizationEnabled():
+            return model
+
+        # int8 dynamic quantization 은 fp32 Linear 만 지원하므로 적재 시점에 fp32 로 올린 모델만 받음
+        # (peft 의 LoRA layer 는 base_layer.weight 를 직접 읽으므로 adapter 는 반드시 병합한 뒤에 양자화)
+        torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+
+        return model
+
+    def __loadAdapterModel(self):
+        model = self.__loadBaseModel()
+        tokenizer = self.__loadTokenizer(self.config['pretrained_model_name_or_path'])
+
+        adapterNameList = list(self.adapterPathDict.keys())
+        firstAdapterName = adapterNameList[0]
+        adapterModel = PeftModel.from_pretrained(model, self.adapterPathDict[firstAdapterName],
+                                                 adapter_name=firstAdapterName)
+        for adapterName in adapterNameList[1:]:
+            adapterModel.load_adapter(self.adapterPathDict[adapterName], adapter_name=adapterName)
+
+        adapterModel.eval()
+        adapterModel.to(self.device)
+
+        self.__tokenizer = tokenizer
+        self.__model = adapterModel
+
+    def __loadQuantizedAdapterModel(self):
+        # 양자화된 Linear 위에서는 adapter 를 전환 / 병합할 수 없으므로 adapter 별로 fp32 에서 병합한 모델을 양자화
+        # (int8 weight 는 fp32 의 1/4 이라 adapter 별 사본을 두어도 하나의 fp32 base model 보다 작음)
+        mergedModelDict = {
+            adapterName: self.__quantizeModel(self.loadMergedModel(adapterName))
+            for adapterName in self.adapterPathDict
+        }
+
+        self.__tokenizer = self.__loadTokenizer(self.config['pretrained_model_name_or_path'])
+        self.__mergedModelDict = mergedModelDict
+        self.__model = next(iter(mergedModelDict.values()))
+
+    def __loadPreMergedModel(self):
+        # safetensors 는 mmap 으로 읽히므로 low_cpu_mem_usage 와 함께 쓰면 병합 없이 page cache 에서 바로 적재됨
+        mergedModelDict = {}
+        for adapterName, mergedModelPath in self.mergedModelPathDict.items():
+            # 양자화할 때는 반 정밀도 파일을 처음부터 fp32 로 읽음 (적재 후 float() 로 바꾸면 두 사본이 잠시 함께 올라감)
+            mergedModel = AutoModelForCausalLM.from_pretrained(
+                mergedModelPath,
+                torch_dtype=torch.float32 if self.__isQuantizationEnabled() else "auto",
+                low_cpu_mem_usage=True,
+                use_safetensors=True,
+                local_files_only=True)
+
+            mergedModel.eval()
+            mergedModel.to(self.device)
+            mergedModelDict[adapterName] = self.__quantizeModel(mergedModel)
+
+        firstAdapterName = next(iter(mergedModelDict))
+        self.__tokenizer = self.__loadTokenizer(self.mergedModelPathDict[firstAdapterName])
+        self.__mergedModelDict = mergedModelDict
+        self.__model = mergedModelDict[firstAdapterName]
+
+    def __loadOnnxModel(self, onnxModelPath):
+        # onnxruntime / optimum 은 onnx backend 를 쓸 때만 필요하므로 여기서 import
+        from optimum.onnxruntime import ORTModelForCausalLM
+
+        return ORTModelForCausalLM.from_pretrained(
+            onnxModelPath,
+            use_cache=True,
+            use_io_binding=False,
+            provider="CPUExecutionProvider",
+            local_files_only=True)
+
+    def __checkOnnxEngineParity(self):
+        failedAdapterNameList = [
+            adapterName for adapterName in self.onnxModelPathDict.keys()
+            if not self.readOnnxEngineParity(adapterName).get("isPassed", False)
+        ]
+        if failedAdapterNameList:
+            raise RuntimeError(f"ONNX 모델이 inference engine 경로 parity 확인을 통과하지 않았습니다: {failedAdapterNameList} "
+                               f"(polyglot_benchmark_runner.py onnx-engine-parity 로 확인하거나 POLYGLOT_BACKEND=torch 로 실행)")
+
+    def __loadOnnxModelDict(self):
+        if self.config['require_onnx_engine_parity']:
+            self.__checkOnnxEngineParity()
+
+        # ORTModelForCausalLM 은 PyTorch 모델과 같은 forward 인터페이스(past_key_values 포함)를 제공하므로
+        # 병합된 모델과 똑같이 adapter 별로 두고 inference engine 에서 그대로 사용
+        onnxModelDict = {
+            adapterName: self.__loadOnnxModel(onnxModelPath)
+            for adapterName, onnxModelPath in self.onnxModelPathDict.items()
+        }
+
+        firstAdapterName = next(iter(onnxModelDict))
+        self.__tokenizer = self.__loadTokenizer(self.onnxModelPathDict[firstAdapterName])
+        self.__mergedModelDict = onnxModelDict
+        self.__model = onnxModelDict[firstAdapterName]
+
+    def loadModel(self):
+        # 여러 CommandExecutor 가 동시에 요청해도 모델은 프로세스당 한 번만 올라감
+        with self.__loadLock:
+            if self.__model is not None:
+                return self.__loadReport
+
+            process = psutil.Process(os.getpid())
+            rssBeforeLoad = process.memory_info().rss
+            loadStartTime = time.perf_counter()
+
+            if self.config['backend'] == "onnx":
+                self.__loadOnnxModelDict()
+            elif self.config['model_format'] == "merged":
+                self.__loadPreMergedModel()
+            elif self.__isQuantizationEnabled():
+                self.__loadQuantizedAdapterModel()
+            else:
+                self.__loadAdapterModel()
+
+            rssAfterLoad = process.memory_info().rss
+            self.__loadReport = {
+                "backend": self.config['backend'],
+                "modelFormat": self.config['model_format'],
+                "quantization": self.config['quantization'],
+                "loadTime": round(time.perf_counter() - loadStartTime, 3),
+                "residentMemoryMB": round(rssAfterLoad / (1024 ** 2), 1),
+                "loadedMemoryMB": round((rssAfterLoad - rssBeforeLoad) / (1024 ** 2), 1),
+                "device": str(self.device),
+                "adapterList": list(self.adapterPathDict.keys()),
+            }
+
+            pipelineMetricsRepository = PipelineMetricsRepositoryImpl.getInstance()
+            backendLabelDict = {"backend": self.config['backend'], "modelFormat": self.config['model_format']}
+            pipelineMetricsRepository.increment("model_load_total", backendLabelDict)
+            pipelineMetricsRepository.observe("model_load_seconds", backendLabelDict, self.__loadReport["loadTime"])
+
+            return self.__loadReport
+
+    def loadMergedModel(self, adapterName):
+        # 비교/내보내기용으로 adapter 하나를 base model 에 병합한 별도의 사본을 생성
+        model = self.__loadBaseModel()
+
+        mergedModel = PeftModel.from_pretrained(model, self.adapterPathDict[adapterName])
+        mergedModel = mergedModel.merge_and_unload()
+
+        mergedModel.eval()
+        mergedModel.to(self.device)
+
+        return mergedModel
+
+    def exportMergedModel(self, adapterName, torchDtype):
+        exportPath = self.mergedModelPathDict[adapterName]
+        os.makedirs(exportPath, exist_ok=True)
+
+        # LoRA delta 는 fp32 에서 병합한 뒤 반 정밀도로 변환해서 저장
+        mergedModel = self.loadMergedModel(adapterName)
+        mergedModel.to(torchDtype)
+        mergedModel.save_pretrained(exportPath, safe_serialization=True)
+
+        tokenizer = self.__loadTokenizer(self.config['pretrained_model_name_or_path'])
+        tokenizer.save_pretrained(exportPath)
+
+        return exportPath
+
+    def exportOnnxModel(self, adapterName):
+        from optimum.onnxruntime import ORTModelForCausalLM
+
+        exportPath = self.onnxModelPathDict[adapterName]
+        os.makedirs(exportPath, exist_ok=True)
+        tokenizer = self.__loadTokenizer(self.config['pretrained_model_name_or_path'])
+
+        # CPU 에서 실행하므로 fp32 로 병합한 모델을 임시 경로에 저장한 뒤 past key value 입력을 포함해서 export
+        with tempfile.TemporaryDirectory() as mergedModelPath:
+            mergedModel = self.loadMergedModel(adapterName)
+            mergedModel.save_pretrained(mergedModelPath, safe_serialization=True)
+            tokenizer.save_pretrained(mergedModelPath)
+            del mergedModel
+
+            onnxModel = ORTModelForCausalLM.from_pretrained(mergedModelPath, export=True, use_cache=True)
+            onnxModel.save_pretrained(exportPath)
+
+        tokenizer.save_pretrained(exportPath)
+
+        # 다시 export 한 모델은 engine 경로 parity 를 새로 확인해야 함
+        parityFilePath = os.path.join(exportPath, self.onnxEngineParityFileName)
+        if os.path.exists(parityFilePath):
+            os.remove(parityFilePath)
+
+        return exportPath
+
+    def measureOnnxParity(self, adapterName, sourceList):
+        tokenizer = self.__loadTokenizer(self.config['pretrained_model_name_or_path'])
+        eagerModel = self.loadMergedModel(adapterName)
+        onnxModel = self.__loadOnnxModel(self.onnxModelPathDict[adapterName])
+
+        # 같은 입력에 대한 마지막 위치 logits 의 최대 오차와 greedy 다음 토큰 일치 여부로 비교
+        maxAbsoluteDifference = 0.0
+        nextTokenMatchCount = 0
+        for source in sourceList:
+            input = tokenizer([source], return_tensors="pt", return_token_type_ids=False)
+            # export 된 그래프는 position_ids 를 필수 입력으로 받음
+            input["position_ids"] = torch.arange(input["input_ids"].shape[1]).unsqueeze(0)
+            with torch.no_grad():
+                eagerLogits = eagerModel(**input).logits[:, -1, :].float()
+                onnxLogits = onnxModel(**input).logits[:, -1, :].float()
+
+            maxAbsoluteDifference = max(maxAbsoluteDifference, (eagerLogits - onnxLogits).abs().max().item())
+            nextTokenMatchCount += int(eagerLogits.argmax(-1).item() == onnxLogits.argmax(-1).item())
+
+        return {
+            "maxAbsoluteDifference": round(maxAbsoluteDifference, 6),
+            "nextTokenMatchRate": round(nextTokenMatchCount / len(sourceList), 3),
+        }
+
+    def readOnnxEngineParity(self, adapterName):
+        parityFilePath = os.path.join(self.onnxModelPathDict[adapterName], self.onnxEngineParityFileName)
+        if not os.path.exists(parityFilePath):
+            return {}
+
+        with open(parityFilePath, "r", encoding="utf-8") as parityFile:
+            return json.load(parityFile)
+
+    def writeOnnxEngineParity(self, adapterName, parityReport):
+        parityFilePath = os.path.join(self.onnxModelPathDict[adapterName], self.onnxEngineParityFileName)
+        with open(parityFilePath, "w", encoding="utf-8") as parityFile:
+            json.dump(parityReport, parityFile, ensure_ascii=False, indent=2)
+
+    def isLoaded(self):
+        return self.__model is not None
+
+    def getModel(self):
+        if self.__model is None:
+            self.loadModel()
+
+        return self.__model
+
+    @contextmanager
+    def useAdapter(self, adapterName):
+        model = self.getModel()
+
+        # 병합된 모델은 adapter 별로 따로 있으므로 전환할 필요가 없음
+        if self.__mergedModelDict:
+            yield self.__mergedModelDict[adapterName]
+            return
+
+        # adapter 전환은 모델 전역 상태이므로 생성이 끝날 때까지 다른 adapter 로 바뀌지 않도록 잠금
+        with self.__adapterLock:
+            if model.active_adapter != adapterName:
+                model.set_adapter(adapterName)
+
+            yield model
+
+    def getTokenizer(self):
+        if self.__tokenizer is None:
+            self.loadModel()
+
+        return self.__tokenizer
+
+    def getLoadReport(self):
+        return self.__loadReport
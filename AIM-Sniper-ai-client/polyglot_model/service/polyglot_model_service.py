@@ -0,0 +1,23 @@
+from abc import ABC, abstractmethod
+
+
+class PolyglotModelService(ABC):
+    @abstractmethod
+    def prefetchModel(self):
+        pass
+
+    @abstractmethod
+    def loadModel(self):
+        pass
+
+    @abstractmethod
+    def getLoadReport(self):
+        pass
+
+    @abstractmethod
+    def exportMergedModel(self, dtypeName):
+        pass
+
+    @abstractmethod
+    def exportOnnxModel(self, paritySourceDict):
+        pass
@@ -0,0 +1,68 @@
+import torch
+
+from polyglot_model.repository.polyglot_model_repository_impl import PolyglotModelRepositoryImpl
+from polyglot_model.service.polyglot_model_service import PolyglotModelService
+from template.utility.color_print import ColorPrinter
+
+
+class PolyglotModelServiceImpl(PolyglotModelService):
+    __instance = None
+
+    def __new__(cls):
+        if cls.__instance is None:
+            cls.__instance = super().__new__(cls)
+            cls.__instance.__polyglotModelRepository = PolyglotModelRepositoryImpl.getInstance()
+
+        return cls.__instance
+
+    @classmethod
+    def getInstance(cls):
+        if cls.__instance is None:
+            cls.__instance = cls()
+
+        return cls.__instance
+
+    def prefetchModel(self):
+        # base model 은 받아올 수 있지만 LoRA adapter / 병합 / ONNX 모델은 직접 만들어 둬야 하므로 없으면 기동을 멈춤
+        if self.__polyglotModelRepository.cacheDir in self.__polyglotModelRepository.getMissingArtifactList():
+            self.__polyglotModelRepository.downloadPretrainedModel()
+
+        missingArtifactList = self.__polyglotModelRepository.getMissingArtifactList()
+        if missingArtifactList:
+            raise FileNotFoundError(f"polyglot 모델 파일이 준비되어 있지 않습니다: {missingArtifactList}")
+
+    def loadModel(self):
+        self.prefetchModel()
+
+        loadReport = self.__polyglotModelRepository.loadModel()
+        ColorPrinter.print_important_data("polyglot model load report", loadReport)
+
+        return loadReport
+
+    def getLoadReport(self):
+        return self.__polyglotModelRepository.getLoadReport()
+
+    def exportMergedModel(self, dtypeName):
+        torchDtype = getattr(torch, dtypeName)
+
+        exportPathList = []
+        for adapterName in self.__polyglotModelRepository.adapterPathDict.keys():
+            exportPath = self.__polyglotModelRepository.exportMergedModel(adapterName, torchDtype)
+            ColorPrinter.print_important_data(f"exported {adapterName} ({dtypeName})", exportPath)
+            exportPathList.append(exportPath)
+
+        return exportPathList
+
+    def exportOnnxModel(self, paritySourceDict):
+        # adapter 별로 export 한 뒤 eager PyTorch 와 출력이 같은지 바로 확인
+        parityReportDict = {}
+        for adapterName in self.__polyglotModelRepository.adapterPathDict.keys():
+            exportPath = self.__polyglotModelRepository.exportOnnxModel(adapterName)
+            ColorPrinter.print_important_data(f"exported {adapterName} (onnx)", exportPath)
+
+            parityReport = self.__polyglotModelRepository.measureOnnxParity(
+                adapterName, paritySourceDict[adapterName])
+            ColorPrinter.print_important_data(f"{adapterName} onnx parity", parityReport)
+            parityReportDict[adapterName] = parityReport
+
+        return parityReportDict
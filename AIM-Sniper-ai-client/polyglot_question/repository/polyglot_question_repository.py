@@ -3,9 +3,9 @@ from abc import ABC, abstractmethod
 
 class PolyglotQuestionRepository(ABC):
     @abstractmethod
-    def downloadPretrainedModel(self):
+    async def generateQuestion(self, userAnswer, nextIntent):
         pass
 
     @abstractmethod
-    def generateQuestion(self, userAnswer, nextIntent):
+    async def warmup(self):
         pass
@@ -1,32 +1,42 @@
-from polyglot_question.repository.polyglot_question_repository import PolyglotQuestionRepository
+import time
 
-from transformers import AutoTokenizer, AutoModelForCausalLM
-import torch
-from peft import PeftModel
+from polyglot_inference.repository.polyglot_inference_repository_impl import PolyglotInferenceRepositoryImpl
+from polyglot_inference.utility.inference_executor import InferenceExecutor
+from polyglot_inference.utility.stop_sequence_criteria import StopSequenceCriteria
+from polyglot_model.repository.polyglot_model_repository_impl import PolyglotModelRepositoryImpl
+from polyglot_question.repository.polyglot_question_repository import PolyglotQuestionRepository
+from template.utility.color_print import ColorPrinter
+from token_stream.repository.token_stream_repository_impl import TokenStreamRepositoryImpl
+from user_defined_protocol.request_id import RequestId
 
-import os
 
 class PolyglotQuestionRepositoryImpl(PolyglotQuestionRepository):
     __instance = None
 
-    # load lora adaptor merged model
-    cacheDir = os.path.join("models", "cache")
+    # 모든 요청에 공통인 앞부분은 inference engine 이 KV cache 로 한 번만 계산해서 재사용함
+    promptPrefix = (
+        "당신은 면접관입니다. 다음 명령에 따라 적절한 질문을 수행하세요.\n"
+        "화자의 응답 기록을 참고하여 주제에 관련된 적절한 질문을 생성하세요.\n"
+        "### 주제:\n"
+    )
+    prompt = promptPrefix + "{intent}\n\n### 화자의 응답 기록:\n{answer}\n\n### 질문 :\n"
 
-    device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+    QUESTION_MAX_NEW_TOKENS = 200
 
+    # 질문 뒤에 다음 "###" 섹션이나 빈 줄이 이어지면 질문 생성이 끝난 것으로 봄
+    STOP_SEQUENCE_LIST = ["###", "\n\n"]
 
-    config = {
-        "pretrained_model_name_or_path": "EleutherAI/polyglot-ko-1.3b",
-        "trust_remote_code": True,
-        "local_files_only": True,
-        "padding_side": "left",
-        "max_token_length": 1024,
-    }
-
+    # 기동 시 warmup 생성에 사용하는 예시 입력
+    WARMUP_USER_ANSWER = "저는 팀 프로젝트에서 백엔드 API 설계와 구현을 맡았고, 팀원들과 매일 진행 상황을 공유했습니다."
+    WARMUP_NEXT_INTENT = "협업 능력"
 
     def __new__(cls):
         if cls.__instance is None:
             cls.__instance = super().__new__(cls)
+            cls.__instance.__polyglotModelRepository = PolyglotModelRepositoryImpl.getInstance()
+            cls.__instance.__polyglotInferenceRepository = PolyglotInferenceRepositoryImpl.getInstance()
+            cls.__instance.__inferenceExecutor = InferenceExecutor.getInstance()
+            cls.__instance.__tokenStreamRepository = TokenStreamRepositoryImpl.getInstance()
 
         return cls.__instance
 
@@ -37,70 +47,41 @@ class PolyglotQuestionRepositoryImpl(PolyglotQuestionRepository):
 
         return cls.__instance
 
-    def downloadPretrainedModel(self):
-        cacheDir = os.path.join("models", "cache")  # 원하는 경로로 변경 가능
-
-        # 모델 다운로드
-        model = AutoModelForCausalLM.from_pretrained(
-            "EleutherAI/polyglot-ko-1.3b",
-            cache_dir=cacheDir,
-            trust_remote_code=True
-        )
-
-        # 토크나이저 다운로드
-        tokenizer = AutoTokenizer.from_pretrained(
-            "EleutherAI/polyglot-ko-1.3b",
-            cache_dir=cacheDir,
-            trust_remote_code=True
-        )
-
-    def generateQuestion(self, userAnswer, nextIntent):
-
-        model = AutoModelForCausalLM.from_pretrained(
-            pretrained_model_name_or_path=self.config['pretrained_model_name_or_path'],
-            trust_remote_code=self.config['trust_remote_code'],
-            cache_dir=self.cacheDir,
-            local_files_only=self.config['local_files_only'])
+    async def generateQuestion(self, userAnswer, nextIntent):
+        # 모델은 PolyglotModelRepositoryImpl 이 상주시키고, 생성은 동시 요청을 묶어서 처리하는 inference engine 에 맡김
+        # (모델 적재와 토크나이즈는 inference executor 에서 실행해서 이벤트 루프를 막지 않음)
+        tokenizer = await self.__inferenceExecutor.run(self.__polyglotModelRepository.getTokenizer)
 
-        tokenizer = AutoTokenizer.from_pretrained(pretrained_model_name_or_path=self.config['pretrained_model_name_or_path'],
-                                                  trust_remote_code=self.config['trust_remote_code'],
-                                                  cache_dir=self.cacheDir,
-                                                  local_files_only=self.config['local_files_only'],
-                                                  padding_side=self.config['padding_side'])
-
-        tokenizer.pad_token = tokenizer.eos_token
-        tokenizer.pad_token_id = tokenizer.eos_token_id
-        tokenizer.model_max_length = self.config['max_token_length']
-
-
-
-        loraAdapterInterviewName = "polyglot-ko-1.3b/interview"
-        loraAdapterInterviewPath = os.path.join("models", loraAdapterInterviewName, "final")
+        beforeAnswer = userAnswer
+        source = self.prompt.format_map(dict(answer=beforeAnswer,
+                                             intent=nextIntent))
 
-        prompt = (
-            "당신은 면접관입니다. 다음 명령에 따라 적절한 질문을 수행하세요.\n"
-            "화자의 응답 기록을 참고하여 주제에 관련된 적절한 질문을 생성하세요.\n"
-            "### 주제:\n{intent}\n\n### 화자의 응답 기록:\n{answer}\n\n### 질문 :\n"
-        )
+        generationStartTime = time.perf_counter()
+        stoppingCriteria = StopSequenceCriteria(tokenizer, self.STOP_SEQUENCE_LIST)
 
-        beforeAnswer = userAnswer
-        source = prompt.format_map(dict(answer=beforeAnswer,
-                                        intent=nextIntent))
+        # FastAPI 가 requestId 를 붙여 보낸 요청이면 생성되는 대로 질문 조각을 스트리밍함
+        requestId = RequestId.getCurrent()
+        tokenCallback = self.__tokenStreamRepository.openStream(requestId, 0, tokenizer, stoppingCriteria, strip=True)
 
-        input = tokenizer([source], return_tensors="pt", return_token_type_ids=False).to(self.device)
-        inputLength = len(source)
+        future = await self.__inferenceExecutor.run(
+            self.__polyglotInferenceRepository.submit,
+            "interview", source, self.QUESTION_MAX_NEW_TOKENS, stoppingCriteria, self.promptPrefix, tokenCallback)
+        generatedIdList = await self.__inferenceExecutor.waitFor(future)
+        output = stoppingCriteria.trimStopSequence(tokenizer.decode(generatedIdList, skip_special_tokens=True))
 
-        interviewModel = PeftModel.from_pretrained(model, loraAdapterInterviewPath)
-        interviewModel = interviewModel.merge_and_unload()
+        ColorPrinter.print_important_data("question generation time",
+                                          round(time.perf_counter() - generationStartTime, 3))
 
-        interviewModel.eval()
-        interviewModel.to(self.device)
+        nextQuestion = output.strip()
+        self.__tokenStreamRepository.closeStream(requestId, 0, nextQuestion)
 
-        with torch.no_grad():
-            output = interviewModel.generate(**input, max_new_tokens=200)
-            output = tokenizer.decode(output[0], skip_special_tokens=True)
-            output = output[inputLength:]
+        return {"nextQuestion": nextQuestion}
 
-        nextQuestion = output
+    async def warmup(self):
+        source = self.prompt.format_map(dict(answer=self.WARMUP_USER_ANSWER, intent=self.WARMUP_NEXT_INTENT))
 
-        return {"nextQuestion": nextQuestion}
\ No newline at end of file
+        # stop sequence 없이 정해진 토큰 수만큼 생성해서 prefix KV cache 계산과 decoding 경로를 모두 거치게 함
+        future = await self.__inferenceExecutor.run(
+            self.__polyglotInferenceRepository.submit,
+            "interview", source, self.__polyglotInferenceRepository.WARMUP_MAX_NEW_TOKENS, None, self.promptPrefix)
+        await self.__inferenceExecutor.waitFor(future)
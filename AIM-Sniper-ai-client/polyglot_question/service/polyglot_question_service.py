@@ -5,3 +5,7 @@ class PolyglotQuestionService(ABC):
     @abstractmethod
     def generateNextQuestion(self, *arg, **kwargs):
         pass
+
+    @abstractmethod
+    def warmup(self):
+        pass
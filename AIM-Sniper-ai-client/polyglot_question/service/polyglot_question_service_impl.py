@@ -1,6 +1,8 @@
-import os
+from polyglot_inference.utility.inference_executor import InferenceExecutor
 from polyglot_question.repository.polyglot_question_repository_impl import PolyglotQuestionRepositoryImpl
 from polyglot_question.service.polyglot_question_service import PolyglotQuestionService
+from polyglot_response_cache.repository.polyglot_response_cache_repository_impl import \
+    PolyglotResponseCacheRepositoryImpl
 
 
 class PolyglotQuestionServiceImpl(PolyglotQuestionService):
@@ -10,6 +12,8 @@ class PolyglotQuestionServiceImpl(PolyglotQuestionService):
         if cls.__instance is None:
             cls.__instance = super().__new__(cls)
             cls.__instance.__polyglotQuestionRepository = PolyglotQuestionRepositoryImpl.getInstance()
+            cls.__instance.__polyglotResponseCacheRepository = PolyglotResponseCacheRepositoryImpl.getInstance()
+            cls.__instance.__inferenceExecutor = InferenceExecutor.getInstance()
 
             return cls.__instance
 
@@ -21,11 +25,23 @@ class PolyglotQuestionServiceImpl(PolyglotQuestionService):
         return cls.__instance
 
     async def generateNextQuestion(self, *arg, **kwargs):
-        cacheDir = os.path.join("models", "cache")
-        if not os.path.exists(cacheDir):
-            self.__polyglotQuestionRepository.downloadPretrainedModel()
-
         userAnswer = arg[0]
         nextIntent = arg[1]
 
-        return self.__polyglotQuestionRepository.generateQuestion(userAnswer, nextIntent)
\ No newline at end of file
+        # 같은 의도에서 같은(또는 거의 같은) 답변에 생성했던 질문이 있으면 생성 없이 돌려줌
+        # (embedding 계산은 이벤트 루프를 막지 않도록 inference executor 에서 실행 / cache 적중 시에는 스트리밍 없이 최종 결과만 감)
+        nextQuestion = await self.__inferenceExecutor.run(
+            self.__polyglotResponseCacheRepository.find, "question", nextIntent, userAnswer)
+        if nextQuestion is not None:
+            return {"nextQuestion": nextQuestion}
+
+        result = await self.__polyglotQuestionRepository.generateQuestion(userAnswer, nextIntent)
+        if result["nextQuestion"]:
+            await self.__inferenceExecutor.run(
+                self.__polyglotResponseCacheRepository.store, "question", nextIntent, userAnswer, result["nextQuestion"])
+
+        return result
+
+    async def warmup(self):
+        await self.__polyglotQuestionRepository.warmup()
+        await self.__inferenceExecutor.run(self.__polyglotResponseCacheRepository.warmup)
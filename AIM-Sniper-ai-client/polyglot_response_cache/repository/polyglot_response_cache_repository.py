@@ -0,0 +1,27 @@
+from abc import ABC, abstractmethod
+
+
+class PolyglotResponseCacheRepository(ABC):
+    @abstractmethod
+    def isEnabled(self):
+        pass
+
+    @abstractmethod
+    def find(self, kind, intent, text, contextText=""):
+        pass
+
+    @abstractmethod
+    def store(self, kind, intent, text, response, contextText=""):
+        pass
+
+    @abstractmethod
+    def warmup(self):
+        pass
+
+    @abstractmethod
+    def save(self):
+        pass
+
+    @abstractmethod
+    def getStatus(self):
+        pass
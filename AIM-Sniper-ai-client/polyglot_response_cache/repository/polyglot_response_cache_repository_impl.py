@@ -0,0 +1,315 @@
+import atexit
+import base64
+import json
+import os
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+import numpy as np
+from dotenv import load_dotenv
+
+from pipeline_metrics.repository.pipeline_metrics_repository_impl import PipelineMetricsRepositoryImpl
+from polyglot_model.repository.polyglot_model_repository_impl import PolyglotModelRepositoryImpl
+from polyglot_response_cache.repository.polyglot_response_cache_repository import PolyglotResponseCacheRepository
+from polyglot_response_cache.utility.sentence_embedder import SentenceEmbedder
+from template.utility.color_print import ColorPrinter
+
+load_dotenv()
+
+
+class PolyglotResponseCacheRepositoryImpl(PolyglotResponseCacheRepository):
+    __instance = None
+
+    IS_ENABLED = os.getenv("POLYGLOT_RESPONSE_CACHE_ENABLED", "1") == "1"
+
+    # 정규화한 입력이 다르더라도 같은 의도 안에서 embedding 유사도가 이 값 이상이면 같은 응답을 사용
+    # (1 보다 크게 두면 유사도 검색 없이 정확히 같은 입력만 cache 함)
+    SIMILARITY_THRESHOLD = float(os.getenv("POLYGLOT_RESPONSE_CACHE_SIMILARITY_THRESHOLD", "0.92"))
+
+    # 유사도로 응답을 재사용하는 kind - 다음 질문은 비슷한 답변이면 같은 질문이어도 되지만, 점수는 답변이 조금만 달라도
+    # 달라져야 하므로 채점 결과는 정규화한 답변이 정확히 같을 때만 재사용
+    SEMANTIC_KIND_SET = {"question"}
+
+    # 가장 오래 사용하지 않은 응답부터 버리는 최대 개수와, 저장 후 이 시간이 지난 응답은 사용하지 않음
+    MAX_ENTRY_COUNT = int(os.getenv("POLYGLOT_RESPONSE_CACHE_MAX_ENTRY_COUNT", "10000"))
+    TTL_SECONDS = float(os.getenv("POLYGLOT_RESPONSE_CACHE_TTL_SECONDS", str(7 * 24 * 60 * 60)))
+
+    # 재시작해도 cache 가 유지되도록 변경이 있으면 이 주기마다 파일로 저장 (종료 시에도 저장)
+    CACHE_FILE_PATH = os.getenv("POLYGLOT_RESPONSE_CACHE_PATH", os.path.join("models", "response_cache.json"))
+    SAVE_INTERVAL_SECONDS = float(os.getenv("POLYGLOT_RESPONSE_CACHE_SAVE_INTERVAL_SECONDS", "30"))
+
+    KIND_LIST = ("question", "score")
+
+    def __new__(cls):
+        if cls.__instance is None:
+            cls.__instance = super().__new__(cls)
+            cls.__instance.__lock = threading.Lock()
+            cls.__instance.__sentenceEmbedder = SentenceEmbedder.getInstance()
+            cls.__instance.__pipelineMetricsRepository = PipelineMetricsRepositoryImpl.getInstance()
+
+            # exact key → 응답 (가장 최근에 사용한 것이 끝) / (kind, group key) → 그 그룹의 exact key 목록
+            cls.__instance.__entryDict = OrderedDict()
+            cls.__instance.__groupDict = {}
+            cls.__instance.__isDirty = False
+            cls.__instance.__saverThread = None
+
+            cls.__instance.__lookupCountDict = {kind: 0 for kind in cls.KIND_LIST}
+            cls.__instance.__hitCountDict = {kind: 0 for kind in cls.KIND_LIST}
+
+            if cls.IS_ENABLED:
+                cls.__instance.__load()
+                atexit.register(cls.__instance.save)
+
+            cls.__instance.__pipelineMetricsRepository.registerGaugeProvider(cls.__instance.__getGaugeList)
+
+        return cls.__instance
+
+    @classmethod
+    def getInstance(cls):
+        if cls.__instance is None:
+            cls.__instance = cls()
+
+        return cls.__instance
+
+    def isEnabled(self):
+        return self.IS_ENABLED
+
+    @staticmethod
+    def __normalize(text):
+        # 전각/반각, 대소문자, 문장 부호, 공백 차이만 있는 답변은 같은 입력으로 봄
+        text = unicodedata.normalize("NFKC", str(text)).lower()
+        text = "".join(" " if unicodedata.category(character).startswith("P") else character for character in text)
+
+        return re.sub(r"\s+", " ", text).strip()
+
+    def __getModelSignature(self):
+        # base model / adapter 가 바뀌면 저장해 둔 응답은 다른 모델의 출력이므로 버림
+        return {
+            "baseModel": PolyglotModelRepositoryImpl.config["pretrained_model_name_or_path"],
+            "adapterPathDict": PolyglotModelRepositoryImpl.adapterPathDict,
+        }
+
+    def __isSemanticKind(self, kind):
+        return kind in self.SEMANTIC_KIND_SET and self.SIMILARITY_THRESHOLD <= 1
+
+    def __getGroup(self, kind, intent, contextText):
+        return kind, f"{self.__normalize(intent)}\n{self.__normalize(contextText)}"
+
+    def __isExpired(self, entry, now):
+        return now - entry["createdTime"] > self.TTL_SECONDS
+
+    def __removeEntry(self, exactKey):
+        entry = self.__entryDict.pop(exactKey)
+        groupKeyDict = self.__groupDict.get(entry["group"])
+        if groupKeyDict is not None:
+            groupKeyDict.pop(exactKey, None)
+            if not groupKeyDict:
+                del self.__groupDict[entry["group"]]
+
+        self.__isDirty = True
+
+    def __addEntry(self, exactKey, entry):
+        if exactKey in self.__entryDict:
+            self.__removeEntry(exactKey)
+
+        self.__entryDict[exactKey] = entry
+        self.__groupDict.setdefault(entry["group"], {})[exactKey] = None
+
+        while len(self.__entryDict) > self.MAX_ENTRY_COUNT:
+            self.__removeEntry(next(iter(self.__entryDict)))
+
+        self.__isDirty = True
+
+    def __findSimilar(self, group, embedding, now):
+        # 같은 그룹의 응답만 비교하므로 그룹 하나의 크기만큼만 내적을 계산함
+        candidateKeyList = []
+        candidateEmbeddingList = []
+        for exactKey in list(self.__groupDict.get(group, {})):
+            entry = self.__entryDict[exactKey]
+            if self.__isExpired(entry, now):
+                self.__removeEntry(exactKey)
+            elif entry["embedding"] is not None:
+                candidateKeyList.append(exactKey)
+                candidateEmbeddingList.append(entry["embedding"])
+
+        if not candidateKeyList:
+            return None
+
+        similarityList = np.stack(candidateEmbeddingList) @ embedding
+        bestIndex = int(np.argmax(similarityList))
+        if similarityList[bestIndex] < self.SIMILARITY_THRESHOLD:
+            return None
+
+        return candidateKeyList[bestIndex]
+
+    def __recordLookup(self, kind, outcome):
+        self.__pipelineMetricsRepository.increment("response_cache_lookup_total", {"kind": kind, "outcome": outcome})
+        with self.__lock:
+            self.__lookupCountDict[kind] += 1
+            self.__hitCountDict[kind] += outcome != "miss"
+
+    def find(self, kind, intent, text, contextText=""):
+        # 1) 정규화한 입력이 같은 응답 2) (질문 생성만) 같은 그룹 안에서 embedding 유사도가 기준 이상인 응답 - 없으면 None
+        if not self.IS_ENABLED:
+            return None
+
+        group = self.__getGroup(kind, intent, contextText)
+        exactKey = (*group, self.__normalize(text))
+        now = time.time()
+
+        with self.__lock:
+            entry = self.__entryDict.get(exactKey)
+            if entry is not None and self.__isExpired(entry, now):
+                self.__removeEntry(exactKey)
+                entry = None
+
+            if entry is not None:
+                self.__entryDict.move_to_end(exactKey)
+                response = entry["response"]
+
+        if entry is not None:
+            self.__recordLookup(kind, "exact")
+            return response
+
+        # embedding 계산은 lock 밖에서 - 다른 요청의 조회 / 저장을 막지 않음
+        embedding = self.__sentenceEmbedder.embed(text) if self.__isSemanticKind(kind) else None
+        if embedding is not None:
+            with self.__lock:
+                similarKey = self.__findSimilar(group, embedding, now)
+                if similarKey is not None:
+                    self.__entryDict.move_to_end(similarKey)
+                    response = self.__entryDict[similarKey]["response"]
+
+            if similarKey is not None:
+                self.__recordLookup(kind, "semantic")
+                return response
+
+        self.__recordLookup(kind, "miss")
+        return None
+
+    def store(self, kind, intent, text, response, contextText=""):
+        if not self.IS_ENABLED:
+            return
+
+        group = self.__getGroup(kind, intent, contextText)
+        embedding = self.__sentenceEmbedder.embed(text) if self.__isSemanticKind(kind) else None
+
+        with self.__lock:
+            self.__addEntry((*group, self.__normalize(text)),
+                            {"group": group, "response": response, "embedding": embedding, "createdTime": time.time()})
+
+        self.__startSaverIfNeeded()
+
+    def warmup(self):
+        # embedding 모델을 첫 요청 전에 올려 둠 (없으면 정확히 같은 입력만 cache)
+        if self.IS_ENABLED and self.SIMILARITY_THRESHOLD <= 1:
+            self.__sentenceEmbedder.isAvailable()
+
+    def __startSaverIfNeeded(self):
+        with self.__lock:
+            if self.__saverThread is not None:
+                return
+
+            self.__saverThread = threading.Thread(target=self.__runSaver, name="ResponseCacheSaver", daemon=True)
+            self.__saverThread.start()
+
+    def __runSaver(self):
+        while True:
+            time.sleep(self.SAVE_INTERVAL_SECONDS)
+            self.save()
+
+    @staticmethod
+    def __encodeEmbedding(embedding):
+        return base64.b64encode(embedding.astype(np.float32).tobytes()).decode("ascii") \
+            if embedding is not None else None
+
+    @staticmethod
+    def __decodeEmbedding(encodedEmbedding):
+        return np.frombuffer(base64.b64decode(encodedEmbedding), dtype=np.float32) \
+            if encodedEmbedding is not None else None
+
+    def save(self):
+        with self.__lock:
+            if not self.__isDirty:
+                return
+
+            # 오래 사용하지 않은 것부터 저장해서 다시 읽을 때 LRU 순서가 그대로 유지되도록 함
+            cacheData = {
+                "modelSignature": self.__getModelSignature(),
+                "embeddingModel": SentenceEmbedder.MODEL_NAME,
+                "entryList": [
+                    {"exactKey": list(exactKey), "group": list(entry["group"]), "response": entry["response"],
+                     "embedding": self.__encodeEmbedding(entry["embedding"]), "createdTime": entry["createdTime"]}
+                    for exactKey, entry in self.__entryDict.items()
+                ],
+            }
+            self.__isDirty = False
+
+        # 저장 중에 종료되어도 이전 파일이 깨지지 않도록 임시 파일에 쓴 뒤 교체
+        cacheDirectoryPath = os.path.dirname(self.CACHE_FILE_PATH)
+        if cacheDirectoryPath:
+            os.makedirs(cacheDirectoryPath, exist_ok=True)
+
+        temporaryFilePath = f"{self.CACHE_FILE_PATH}.tmp"
+        with open(temporaryFilePath, "w", encoding="utf-8") as f:
+            json.dump(cacheData, f, ensure_ascii=False)
+        os.replace(temporaryFilePath, self.CACHE_FILE_PATH)
+
+    def __load(self):
+        if not os.path.exists(self.CACHE_FILE_PATH):
+            return
+
+        try:
+            with open(self.CACHE_FILE_PATH, "r", encoding="utf-8") as f:
+                cacheData = json.load(f)
+        except (OSError, ValueError) as exception:
+            ColorPrinter.print_important_message(f"response cache 파일을 읽지 못해 비우고 시작합니다: {exception}")
+            return
+
+        if cacheData.get("modelSignature") != self.__getModelSignature():
+            ColorPrinter.print_important_message("모델이 바뀌어 저장된 response cache 를 사용하지 않습니다")
+            return
+
+        # embedding 모델이 바뀌었으면 유사도는 비교할 수 없으므로 정확히 같은 입력에만 사용
+        isSameEmbeddingModel = cacheData.get("embeddingModel") == SentenceEmbedder.MODEL_NAME
+        now = time.time()
+        for entryData in cacheData.get("entryList", []):
+            # 이전에 저장한 채점 결과의 embedding 은 버려서 유사도 검색에 쓰이지 않게 함
+            isSemanticEntry = isSameEmbeddingModel and entryData["group"][0] in self.SEMANTIC_KIND_SET
+            entry = {"group": tuple(entryData["group"]), "response": entryData["response"],
+                     "embedding": self.__decodeEmbedding(entryData["embedding"]) if isSemanticEntry else None,
+                     "createdTime": entryData["createdTime"]}
+            if not self.__isExpired(entry, now):
+                self.__addEntry(tuple(entryData["exactKey"]), entry)
+
+        self.__isDirty = False
+        ColorPrinter.print_important_data("response cache entry count", len(self.__entryDict))
+
+    def __getGaugeList(self):
+        with self.__lock:
+            entryCountDict = {kind: 0 for kind in self.KIND_LIST}
+            for exactKey in self.__entryDict:
+                entryCountDict[exactKey[0]] += 1
+
+            gaugeList = [("response_cache_entries", {"kind": kind}, entryCount)
+                         for kind, entryCount in entryCountDict.items()]
+            gaugeList.extend(("response_cache_hit_ratio", {"kind": kind},
+                              self.__hitCountDict[kind] / self.__lookupCountDict[kind])
+                             for kind in self.KIND_LIST if self.__lookupCountDict[kind])
+
+        return gaugeList
+
+    def getStatus(self):
+        with self.__lock:
+            status = {
+                "entryCount": len(self.__entryDict),
+                "lookupCountDict": dict(self.__lookupCountDict),
+                "hitCountDict": dict(self.__hitCountDict),
+            }
+
+        status["isSemanticEnabled"] = self.SIMILARITY_THRESHOLD <= 1 and self.__sentenceEmbedder.isAvailable()
+
+        return status
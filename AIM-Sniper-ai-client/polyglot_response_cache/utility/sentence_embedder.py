@@ -0,0 +1,66 @@
+import os
+import threading
+
+import numpy as np
+from dotenv import load_dotenv
+
+from template.utility.color_print import ColorPrinter
+
+# sentence-transformers 가 없는 환경에서는 정규화한 입력이 정확히 같은 경우에만 cache 를 사용함
+try:
+    from sentence_transformers import SentenceTransformer
+except ImportError:
+    SentenceTransformer = None
+
+load_dotenv()
+
+
+class SentenceEmbedder:
+    __instance = None
+
+    cacheDir = os.path.join("models", "cache")
+
+    # 한국어 답변의 유사도를 재는 다국어 문장 embedding 모델 (CPU 에서 문장 하나에 수 ms)
+    MODEL_NAME = os.getenv("POLYGLOT_RESPONSE_CACHE_EMBEDDING_MODEL",
+                           "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2")
+
+    def __new__(cls):
+        if cls.__instance is None:
+            cls.__instance = super().__new__(cls)
+            cls.__instance.__loadLock = threading.Lock()
+            cls.__instance.__model = None
+            cls.__instance.__isLoadFailed = SentenceTransformer is None
+
+        return cls.__instance
+
+    @classmethod
+    def getInstance(cls):
+        if cls.__instance is None:
+            cls.__instance = cls()
+
+        return cls.__instance
+
+    def __loadModel(self):
+        with self.__loadLock:
+            if self.__model is not None or self.__isLoadFailed:
+                return self.__model
+
+            try:
+                self.__model = SentenceTransformer(self.MODEL_NAME, cache_folder=self.cacheDir, device="cpu")
+            except Exception as exception:
+                # 모델을 받을 수 없는 환경이면 한 번만 알리고 이후로는 유사도 검색 없이 동작
+                self.__isLoadFailed = True
+                ColorPrinter.print_important_message(f"sentence embedding 모델 적재 실패: {exception}")
+
+            return self.__model
+
+    def isAvailable(self):
+        return self.__loadModel() is not None
+
+    def embed(self, text):
+        # 정규화된 벡터를 돌려주므로 내적이 곧 cosine 유사도
+        model = self.__loadModel()
+        if model is None:
+            return None
+
+        return np.asarray(model.encode(text, normalize_embeddings=True), dtype=np.float32)
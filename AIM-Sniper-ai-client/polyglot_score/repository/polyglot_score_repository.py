@@ -3,13 +3,17 @@ from abc import ABC, abstractmethod
 
 class PolyglotScoreRepository(ABC):
     @abstractmethod
-    def downloadPretrainedModel(self):
+    def loadScoreModel(self):
         pass
 
     @abstractmethod
-    def loadScoreModel(self):
+    def scoreUserAnswer(self, question, userAnswer, intent, scoreModel, tokenizer):
         pass
 
     @abstractmethod
-    def scoreUserAnswer(self, question, userAnswer, intent, scoreModel, tokenizer):
-        pass
\ No newline at end of file
+    def scoreUserAnswerList(self, interviewList, streamIndexList=None):
+        pass
+
+    @abstractmethod
+    def warmup(self):
+        pass
@@ -1,30 +1,49 @@
-from transformers import AutoTokenizer, AutoModelForCausalLM
-import torch
-from peft import PeftModel
-import os
-
+from polyglot_inference.repository.polyglot_inference_repository_impl import PolyglotInferenceRepositoryImpl
+from polyglot_inference.utility.inference_executor import InferenceExecutor
+from polyglot_inference.utility.stop_sequence_criteria import StopSequenceCriteria
+from polyglot_model.repository.polyglot_model_repository_impl import PolyglotModelRepositoryImpl
 from polyglot_score.repository.polyglot_score_repository import PolyglotScoreRepository
+from token_stream.repository.token_stream_repository_impl import TokenStreamRepositoryImpl
+from user_defined_protocol.request_id import RequestId
 
 
 class PolyglotScoreRepositoryImpl(PolyglotScoreRepository):
     __instance = None
 
-    cacheDir = os.path.join("models", "cache")
-
-    device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-
-    config = {
-        "pretrained_model_name_or_path": "EleutherAI/polyglot-ko-1.3b",
-        "trust_remote_code": True,
-        "local_files_only": True,
-        "padding_side": "left",
-        "max_token_length": 1024,
-    }
-
+    # 질문 의도 앞까지는 모든 채점 요청에 공통이므로 inference engine 이 KV cache 로 재사용함
+    promptPrefix = (
+        "당신은 면접 대상자의 답변을 채점하는 면접관입니다.\n"
+        "면접 질문은 당신이 면접 대상자로부터 질문 의도인"
+    )
+    prompt = promptPrefix + (
+        " '{intent}'에 대한 정보를 파악하기 위한 질문입니다. "
+        "면접 대상자의 답변은 면접 질문에 대한 답변입니다.\n"
+        "면접 대상자가 면접관의 질문에 대해 얼마나 잘 대답했는지를 1~100점으로 채점하고, 답변에 대한 feedback을 제공해주세요.\n"
+        "면접 질문: {question}\n면접 대상자의 답변: {answer}\n질문 의도: {intent}\noutput:"
+    )
+
+    SCORE_MAX_NEW_TOKENS = 512
+
+    # "score:~점<s>feedback:~" 뒤에 다음 섹션이나 새 채점 프롬프트가 이어지면 feedback 이 끝난 것으로 봄
+    STOP_SEQUENCE_LIST = ["###", "\n면접 질문:", "\noutput:", "</s>"]
+
+    # 한 bucket 으로 묶을 수 있는 프롬프트 간 최대 토큰 길이 차이 (left padding 낭비 제한)
+    BUCKET_MAX_LENGTH_GAP = 64
+
+    # 기동 시 warmup 채점에 사용하는 예시 입력 (면접 종료 시처럼 batch 하나를 가득 채워서 실행)
+    WARMUP_INTERVIEW = (
+        "팀 프로젝트에서 갈등이 생겼을 때 어떻게 해결했나요?",
+        "의견이 다른 팀원과 따로 이야기하며 각자의 근거를 정리했고, 기준을 합의한 뒤 더 나은 방법을 선택했습니다.",
+        "협업 능력",
+    )
 
     def __new__(cls):
         if cls.__instance is None:
             cls.__instance = super().__new__(cls)
+            cls.__instance.__polyglotModelRepository = PolyglotModelRepositoryImpl.getInstance()
+            cls.__instance.__polyglotInferenceRepository = PolyglotInferenceRepositoryImpl.getInstance()
+            cls.__instance.__inferenceExecutor = InferenceExecutor.getInstance()
+            cls.__instance.__tokenStreamRepository = TokenStreamRepositoryImpl.getInstance()
 
         return cls.__instance
 
@@ -35,69 +54,86 @@ class PolyglotScoreRepositoryImpl(PolyglotScoreRepository):
 
         return cls.__instance
 
-    def downloadPretrainedModel(self):
-        cacheDir = os.path.join("models", "cache")  # 원하는 경로로 변경 가능
-
-        # 모델 다운로드
-        model = AutoModelForCausalLM.from_pretrained(
-            "EleutherAI/polyglot-ko-1.3b",
-            cache_dir=cacheDir,
-            trust_remote_code=True
-        )
-
-        # 토크나이저 다운로드
-        tokenizer = AutoTokenizer.from_pretrained(
-            "EleutherAI/polyglot-ko-1.3b",
-            cache_dir=cacheDir,
-            trust_remote_code=True
-        )
-
     async def loadScoreModel(self):
-        model = AutoModelForCausalLM.from_pretrained(
-            pretrained_model_name_or_path=self.config['pretrained_model_name_or_path'],
-            trust_remote_code=self.config['trust_remote_code'],
-            cache_dir=self.cacheDir,
-            local_files_only=self.config['local_files_only'])
-
-        tokenizer = (AutoTokenizer.
-                     from_pretrained(pretrained_model_name_or_path=self.config['pretrained_model_name_or_path'],
-                                     trust_remote_code=self.config['trust_remote_code'],
-                                     cache_dir=self.cacheDir,
-                                     local_files_only=self.config['local_files_only'],
-                                     padding_side=self.config['padding_side']))
-
-        tokenizer.pad_token = tokenizer.eos_token
-        tokenizer.pad_token_id = tokenizer.eos_token_id
-        tokenizer.model_max_length = self.config['max_token_length']
-
-        loraAdapterScoreName = "polyglot-ko-1.3b/score"
-        loraAdapterScorePath = os.path.join("models", loraAdapterScoreName, "r512-epoch100")
-
-        scoreModel = PeftModel.from_pretrained(model, loraAdapterScorePath)
-        scoreModel = scoreModel.merge_and_unload()
-
-        scoreModel.eval()
-        scoreModel.to(self.device)
+        # 질문 생성과 같은 base model 을 공유하며, 채점 시에는 score adapter 로 전환해서 사용
+        # (아직 적재되지 않았다면 inference executor 에서 적재해서 이벤트 루프를 막지 않음)
+        scoreModel = await self.__inferenceExecutor.run(self.__polyglotModelRepository.getModel)
+        tokenizer = self.__polyglotModelRepository.getTokenizer()
 
         return scoreModel, tokenizer
 
     async def scoreUserAnswer(self, question, userAnswer, intent, scoreModel, tokenizer):
-        prompt = (
-            "당신은 면접 대상자의 답변을 채점하는 면접관입니다.\n"
-            "면접 질문은 당신이 면접 대상자로부터 질문 의도인 '{intent}'에 대한 정보를 파악하기 위한 질문입니다. "
-            "면접 대상자의 답변은 면접 질문에 대한 답변입니다.\n"
-            "면접 대상자가 면접관의 질문에 대해 얼마나 잘 대답했는지를 1~100점으로 채점하고, 답변에 대한 feedback을 제공해주세요.\n"
-            "면접 질문: {question}\n면접 대상자의 답변: {answer}\n질문 의도: {intent}\noutput:"
-        )
-
-        source = prompt.format_map(dict(question=question, intent=intent, answer=userAnswer))
-        input = tokenizer([source], return_tensors="pt", return_token_type_ids=False).to(self.device)
-        inputLength = len(source)
-
-        with torch.no_grad():
-            output = scoreModel.generate(**input, max_new_tokens=512)
-            output = tokenizer.decode(output[0], skip_special_tokens=True)
-            output = output[inputLength:]
-        result = output
-
-        return result
\ No newline at end of file
+        source = self.prompt.format_map(dict(question=question, intent=intent, answer=userAnswer))
+
+        # 다른 세션의 질문 생성 / 채점 요청과 같은 decoding batch 에서 함께 처리됨
+        stoppingCriteria = StopSequenceCriteria(tokenizer, self.STOP_SEQUENCE_LIST)
+        future = await self.__inferenceExecutor.run(
+            self.__polyglotInferenceRepository.submit,
+            "score", source, self.SCORE_MAX_NEW_TOKENS, stoppingCriteria, self.promptPrefix)
+        generatedIdList = await self.__inferenceExecutor.waitFor(future)
+        result = stoppingCriteria.trimStopSequence(tokenizer.decode(generatedIdList, skip_special_tokens=True))
+
+        return result
+
+    def __bucketByLength(self, sourceList, tokenizer):
+        lengthList = [len(inputIdList) for inputIdList in
+                      tokenizer(sourceList, return_token_type_ids=False)["input_ids"]]
+        maxBucketSize = self.__polyglotInferenceRepository.MAX_BATCH_SIZE
+
+        # 길이 순으로 정렬한 뒤 길이가 비슷한 것끼리 최대 batch 크기만큼 묶음
+        bucketList = []
+        for index in sorted(range(len(sourceList)), key=lambda index: lengthList[index]):
+            if (bucketList and len(bucketList[-1]) < maxBucketSize
+                    and lengthList[index] - lengthList[bucketList[-1][0]] <= self.BUCKET_MAX_LENGTH_GAP):
+                bucketList[-1].append(index)
+            else:
+                bucketList.append([index])
+
+        return bucketList
+
+    async def warmup(self):
+        question, userAnswer, intent = self.WARMUP_INTERVIEW
+        source = self.prompt.format_map(dict(question=question, intent=intent, answer=userAnswer))
+        warmupSourceList = [source] * self.__polyglotInferenceRepository.MAX_BATCH_SIZE
+
+        futureList = await self.__inferenceExecutor.run(
+            self.__polyglotInferenceRepository.submitGroup,
+            "score", warmupSourceList, self.__polyglotInferenceRepository.WARMUP_MAX_NEW_TOKENS, None,
+            self.promptPrefix)
+        await self.__inferenceExecutor.waitForAll(futureList)
+
+    async def scoreUserAnswerList(self, interviewList, streamIndexList=None):
+        if not interviewList:
+            return []
+
+        tokenizer = await self.__inferenceExecutor.run(self.__polyglotModelRepository.getTokenizer)
+        sourceList = [self.prompt.format_map(dict(question=question, intent=intent, answer=userAnswer))
+                      for question, userAnswer, intent in interviewList]
+
+        # bucket 하나가 한 번의 prefill 로 decoding batch 에 들어가고, 결과는 원래 순서대로 돌려줌
+        stoppingCriteria = StopSequenceCriteria(tokenizer, self.STOP_SEQUENCE_LIST)
+
+        # FastAPI 가 requestId 를 붙여 보낸 요청이면 답변별 feedback 을 원래 순서의 index 로 구분해서 스트리밍함
+        # (일부 답변만 채점하는 경우 streamIndexList 가 원래 요청에서의 index)
+        requestId = RequestId.getCurrent()
+        streamIndexList = streamIndexList or list(range(len(sourceList)))
+        tokenCallbackList = [self.__tokenStreamRepository.openStream(requestId, index, tokenizer, stoppingCriteria)
+                             for index in streamIndexList]
+
+        futureDict = {}
+        for bucket in await self.__inferenceExecutor.run(self.__bucketByLength, sourceList, tokenizer):
+            futureList = await self.__inferenceExecutor.run(
+                self.__polyglotInferenceRepository.submitGroup,
+                "score", [sourceList[index] for index in bucket], self.SCORE_MAX_NEW_TOKENS, stoppingCriteria,
+                self.promptPrefix, [tokenCallbackList[index] for index in bucket])
+            futureDict.update(zip(bucket, futureList))
+
+        generatedIdListList = await self.__inferenceExecutor.waitForAll(
+            [futureDict[index] for index in range(len(sourceList))])
+
+        resultList = [stoppingCriteria.trimStopSequence(tokenizer.decode(generatedIdList, skip_special_tokens=True))
+                      for generatedIdList in generatedIdListList]
+        for index, result in zip(streamIndexList, resultList):
+            self.__tokenStreamRepository.closeStream(requestId, index, result)
+
+        return resultList
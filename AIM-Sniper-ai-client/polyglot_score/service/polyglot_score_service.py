@@ -4,4 +4,8 @@ from abc import ABC, abstractmethod
 class PolyglotScoreService(ABC):
     @abstractmethod
     def scoreUserAnswer(self, *arg, **kwargs):
+        pass
+
+    @abstractmethod
+    def warmup(self):
         pass
\ No newline at end of file
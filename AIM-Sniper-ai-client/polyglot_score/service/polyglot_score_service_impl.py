@@ -1,9 +1,6 @@
-import os
-import asyncio
-import torch
-from peft import PeftModel
-from transformers import AutoModelForCausalLM, AutoTokenizer
-
+from polyglot_inference.utility.inference_executor import InferenceExecutor
+from polyglot_response_cache.repository.polyglot_response_cache_repository_impl import \
+    PolyglotResponseCacheRepositoryImpl
 from polyglot_score.service.polyglot_score_service import PolyglotScoreService
 from polyglot_score.repository.polyglot_score_repository_impl import PolyglotScoreRepositoryImpl
 from template.utility.color_print import ColorPrinter
@@ -11,22 +8,13 @@ from template.utility.color_print import ColorPrinter
 
 class PolyglotScoreServiceImpl(PolyglotScoreService):
     __instance = None
-    # load lora adaptor merged model
-    cacheDir = os.path.join("models", "cache")
-    device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-
-
-    config = {
-        "pretrained_model_name_or_path": "EleutherAI/polyglot-ko-1.3b",
-        "trust_remote_code": True,
-        "local_files_only": True,
-        "padding_side": "left",
-        "max_token_length": 1024,
-    }
+
     def __new__(cls):
         if cls.__instance is None:
             cls.__instance = super().__new__(cls)
             cls.__instance.__polyglotScoreRepository = PolyglotScoreRepositoryImpl.getInstance()
+            cls.__instance.__polyglotResponseCacheRepository = PolyglotResponseCacheRepositoryImpl.getInstance()
+            cls.__instance.__inferenceExecutor = InferenceExecutor.getInstance()
 
             return cls.__instance
 
@@ -38,26 +26,36 @@ class PolyglotScoreServiceImpl(PolyglotScoreService):
         return cls.__instance
 
     async def scoreUserAnswer(self, *arg, **kwargs):
-        cacheDir = os.path.join("models", "cache")
-        if not os.path.exists(cacheDir):
-            self.__polyglotScoreRepository.downloadPretrainedModel()
+        # (질문, 답변, 의도) 묶음이 몇 개든 길이별 bucket 으로 나눠 한 번에 채점
+        interviewList = [tuple(interview) for interview in arg]
 
-        interviewList = arg
+        # 같은 질문 / 의도에 같은(또는 거의 같은) 답변을 채점한 결과가 있으면 재사용하고 나머지만 모델로 채점
+        resultList = await self.__inferenceExecutor.run(self.__findCachedResultList, interviewList)
+        missIndexList = [index for index, result in enumerate(resultList) if result is None]
 
-        q1, q2, q3, q4, q5, q6 = (interviewList[0], interviewList[1], interviewList[2],
-                              interviewList[3], interviewList[4], interviewList[5])
+        if missIndexList:
+            # 스트리밍 조각은 원래 순서의 index 로 구분되어야 하므로 채점하는 답변의 원래 index 를 함께 넘김
+            scoredResultList = await self.__polyglotScoreRepository.scoreUserAnswerList(
+                [interviewList[index] for index in missIndexList], missIndexList)
+            for index, result in zip(missIndexList, scoredResultList):
+                resultList[index] = result
 
-        scoreModel, tokenizer = await self.__polyglotScoreRepository.loadScoreModel()
+            await self.__inferenceExecutor.run(
+                self.__storeResultList, [interviewList[index] for index in missIndexList], scoredResultList)
 
-        # 각 인터뷰에 대해 비동기 작업 생성
-        result1 = await self.__polyglotScoreRepository.scoreUserAnswer(q1[0], q1[1], q1[2], scoreModel, tokenizer)
-        result2 = await self.__polyglotScoreRepository.scoreUserAnswer(q2[0], q2[1], q2[2], scoreModel, tokenizer)
-        result3 = await self.__polyglotScoreRepository.scoreUserAnswer(q3[0], q3[1], q3[2], scoreModel, tokenizer)
-        result4 = await self.__polyglotScoreRepository.scoreUserAnswer(q4[0], q4[1], q4[2], scoreModel, tokenizer)
-        result5 = await self.__polyglotScoreRepository.scoreUserAnswer(q5[0], q5[1], q5[2], scoreModel, tokenizer)
-        result6 = await self.__polyglotScoreRepository.scoreUserAnswer(q6[0], q6[1], q6[2], scoreModel, tokenizer)
-
-        # 모든 비동기 작업을 병렬로 실행
-        resultList = [result1, result2, result3, result4, result5, result6]
         ColorPrinter.print_important_message(f'resultList: {resultList}')
         return {'resultList': resultList}
+
+    def __findCachedResultList(self, interviewList):
+        return [self.__polyglotResponseCacheRepository.find("score", intent, userAnswer, question)
+                for question, userAnswer, intent in interviewList]
+
+    def __storeResultList(self, interviewList, resultList):
+        for (question, userAnswer, intent), result in zip(interviewList, resultList):
+            if result:
+                self.__polyglotResponseCacheRepository.store("score", intent, userAnswer, result, question)
+
+    async def warmup(self):
+        # 채점 결과는 정확히 같은 답변에만 재사용하므로 embedding 모델은 올리지 않음
+        await self.__polyglotScoreRepository.warmup()
+
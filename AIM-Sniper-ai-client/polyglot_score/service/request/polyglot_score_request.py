@@ -1,23 +1,30 @@
 from template.request_generator.base_request import BaseRequest
 from user_defined_protocol.protocol import UserDefinedProtocolNumber
+from user_defined_protocol.request_id import RequestId
 
 
 class PolyglotScoreRequest(BaseRequest):
     def __init__(self, **kwargs):
         self.__protocolNumber = UserDefinedProtocolNumber.POLYGLOT_SCORE.value
         self.parameterList = kwargs.get('data', [])
+        self.requestId = kwargs.get('requestId')
 
     def getProtocolNumber(self):
         return self.__protocolNumber
 
     def getParameterList(self):
-        return tuple(self.parameterList)
+        # requestId 는 handler 를 감싼 register 의 lazyHandler 가 꺼내서 응답에 다시 붙임
+        if self.requestId is None:
+            return tuple(self.parameterList)
+
+        return tuple(self.parameterList) + (RequestId(self.requestId),)
 
     def toDictionary(self):
         return {
             "protocolNumber": self.__protocolNumber,
-            "parameterList": self.parameterList
+            "parameterList": self.parameterList,
+            "requestId": self.requestId
         }
 
     def __str__(self):
-        return f"PolyglotScoreRequest(protocolNumber={self.__protocolNumber}, parameterList={self.parameterList})"
+        return f"PolyglotScoreRequest(protocolNumber={self.__protocolNumber}, parameterList={self.parameterList}, requestId={self.requestId})"
@@ -1,11 +1,15 @@
 import os
 import sys
 import threading
-from functools import partial
 
 import colorama
 
+from pipeline_metrics.repository.pipeline_metrics_repository_impl import PipelineMetricsRepositoryImpl
+from project_starter.worker_topology import WorkerTopology
+from token_stream.repository.token_stream_repository_impl import TokenStreamRepositoryImpl
+from user_defined_protocol.command_scheduler import CommandScheduler
 from user_defined_protocol.register import UserDefinedProtocolRegister
+from user_defined_protocol.stream_command_executor import StreamCommandExecutor
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'template'))
 
@@ -24,12 +28,14 @@ from template.utility.color_print import ColorPrinter
 from template.request_generator.request_class_map import RequestClassMap
 from template.response_generator.response_class_map import ResponseClassMap
 
-DomainInitializer.initEachDomain()
-UserDefinedProtocolRegister.registerUserDefinedProtocol()
-
 stop_event = threading.Event()
 
 if __name__ == "__main__":
+    # process 실행 protocol 의 spawn worker 는 이 파일을 __mp_main__ 으로 다시 import 하므로
+    # 도메인 초기화 / protocol 등록은 main process 에서만 함
+    DomainInitializer.initEachDomain()
+    UserDefinedProtocolRegister.registerUserDefinedProtocol()
+
     colorama.init(autoreset=True)
 
     responseClassMapInstance = ResponseClassMap.getInstance()
@@ -45,8 +51,27 @@ if __name__ == "__main__":
 
 
     threadWorkerPoolService = ThreadWorkerPoolServiceImpl.getInstance()
+    workerTopology = WorkerTopology.getInstance()
 
     try:
+        # 이 노드에서 켠 polyglot protocol 의 모델 확인 / 적재 / warmup 을 모두 마친 뒤에
+        # FastAPI socket server 에 접속하므로, 접속된 시점부터 첫 요청도 정상 상태의 지연 시간으로 처리됨
+        UserDefinedProtocolRegister.prepareUserDefinedProtocol()
+        ColorPrinter.print_important_message("AI client 준비 완료 - FastAPI socket server 에 접속합니다")
+
+        # token stream 연결로 이 노드가 처리하는 protocol 을 알려서 FastAPI 가 여러 AI client 중 가장 한가한 노드로
+        # 명령을 보내게 하고, 명령 대기 현황을 주기적으로 알려서 포화된 노드 / protocol 은 FastAPI 가 보내기 전에 거르게 함
+        tokenStreamRepository = TokenStreamRepositoryImpl.getInstance()
+        tokenStreamRepository.startCommandReceiver(
+            [protocolNumber.value for protocolNumber in UserDefinedProtocolRegister.ENABLED_PROTOCOL_LIST],
+            CommandScheduler.getInstance().SLOT_COUNT,
+            StreamCommandExecutor.getInstance().execute)
+        tokenStreamRepository.startStatusReporter(
+            lambda: {**CommandScheduler.getInstance().getStatus(), "topology": workerTopology.getStatus()})
+
+        # 단계별 처리 시간 / 생성 속도 지표도 같은 연결로 보내서 FastAPI 의 /metrics 하나로 수집되게 함
+        tokenStreamRepository.startMetricsReporter(PipelineMetricsRepositoryImpl.getInstance().snapshot)
+
         clientSocketService = ClientSocketServiceImpl.getInstance()
         clientSocket = clientSocketService.createClientSocket()
         clientSocketService.connectToTargetHostUnitSuccess()
@@ -62,37 +87,17 @@ if __name__ == "__main__":
 
         conditionalCustomExecutorService = ConditionalCustomExecutorServiceImpl.getInstance()
 
-        # threadWorkerPoolService = ThreadWorkerPoolServiceImpl.getInstance()
-        # TODO: 맥북 m2 스레드 최대 지원 개수가 12개임
-        for receiverId in range(3):
-            threadWorkerPoolService.executeThreadPoolWorker(
-                f"Receiver-{receiverId}",
-                partial(receiverService.requestToReceiveCommand, receiverId)
-            )
-
-        for analyzerId in range(2):
-            threadWorkerPoolService.executeThreadPoolWorker(
-                f"CommandAnalyzer-{analyzerId}",
-                partial(commandAnalyzerService.analysisCommand, analyzerId)
-            )
-
-        for executorId in range(4):
-            threadWorkerPoolService.executeThreadPoolWorker(
-                f"CommandExecutor-{executorId}",
-                partial(commandExecutorService.executeCommand, executorId)
-            )
-
-        for conditionalCustomExecutorId in range(2):
-            threadWorkerPoolService.executeThreadPoolWorker(
-                f"ConditionalCustomExecutor-{conditionalCustomExecutorId}",
-                partial(conditionalCustomExecutorService.executeConditionalCustomCommand,
-                        conditionalCustomExecutorId)
-            )
-
-        threadWorkerPoolService.executeThreadPoolWorker(
-            "Transmitter-0",
-            partial(transmitterService.requestToTransmitResult, 0)  # 단일 ID 사용
-        )
+        # 단계별 worker 수는 코어 수 / scheduler slot 수로 계산하고 AI_CLIENT_WORKER_TOPOLOGY 로 바꿀 수 있음
+        workerTopology.startStage(threadWorkerPoolService, "Receiver", receiverService.requestToReceiveCommand)
+        workerTopology.startStage(threadWorkerPoolService, "CommandAnalyzer", commandAnalyzerService.analysisCommand)
+        workerTopology.startStage(threadWorkerPoolService, "CommandExecutor", commandExecutorService.executeCommand)
+        workerTopology.startStage(threadWorkerPoolService, "ConditionalCustomExecutor",
+                                  conditionalCustomExecutorService.executeConditionalCustomCommand)
+        workerTopology.startStage(threadWorkerPoolService, "Transmitter", transmitterService.requestToTransmitResult)
+        ColorPrinter.print_important_data("worker topology", workerTopology.getStatus()["workerCount"])
+
+        # 단계별 사용률을 주기적으로 재서 CommandExecutor 가 병목이면 worker 를 늘림 (줄이거나 다른 단계를 바꾸지는 않음)
+        workerTopology.startAutoTuner(threadWorkerPoolService)
 
         # 프로그램 종료를 위한 이벤트 대기
         while not stop_event.is_set():
@@ -0,0 +1,147 @@
+import math
+import os
+import threading
+import time
+from functools import partial
+
+import psutil
+from dotenv import load_dotenv
+
+from pipeline_metrics.repository.pipeline_metrics_repository_impl import PipelineMetricsRepositoryImpl
+from template.utility.color_print import ColorPrinter
+from user_defined_protocol.command_scheduler import CommandScheduler
+from user_defined_protocol.stage_monitor import StageMonitor
+
+load_dotenv()
+
+
+class WorkerTopology:
+    __instance = None
+
+    PHYSICAL_CORE_COUNT = psutil.cpu_count(logical=False) or os.cpu_count() or 1
+
+    # "단계:worker 수" 목록으로 아래에서 계산한 기본값을 바꿈 (예: "Receiver:3,CommandExecutor:12")
+    WORKER_COUNT_OVERRIDE = os.getenv("AI_CLIENT_WORKER_TOPOLOGY", "")
+
+    # CommandExecutor 사용률이 이 값 이상인데 scheduler 에 기다리는 명령이 없으면 (slot 이 아니라 executor 가 병목)
+    # 런타임에 CommandExecutor worker 를 늘림 - auto tuner 가 바꾸는 것은 CommandExecutor 의 worker 수를 늘리는 것뿐임
+    # - 줄이지는 않음: 단계 loop 는 template 안에 있어서 이미 띄운 worker thread 를 멈출 방법이 없음
+    #   (남는 executor thread 는 template 명령 queue 에서 기다리기만 하므로 비용도 거의 없음)
+    # - 입력은 handler 실행 시간으로 잰 사용률과 scheduler 대기 수뿐임: 단계 사이 queue 는 template 안에 있어서 길이를
+    #   볼 수 없고, Receiver / CommandAnalyzer 는 handler 를 거치지 않아 사용률도 잴 수 없으므로 시작 시 계산값으로 고정
+    SCALE_UP_UTILIZATION = float(os.getenv("AI_CLIENT_SCALE_UP_UTILIZATION", "0.85"))
+    TUNE_INTERVAL_SECONDS = float(os.getenv("AI_CLIENT_TOPOLOGY_TUNE_INTERVAL_SECONDS", "10"))
+
+    def __new__(cls):
+        if cls.__instance is None:
+            cls.__instance = super().__new__(cls)
+            cls.__instance.__workerCountDict = cls.__instance.__createWorkerCountDict()
+            cls.__instance.__stageFunctionDict = {}
+            cls.__instance.__lastSample = {}
+            cls.__instance.__tunerThread = None
+
+            # executor thread 가 늘어도 slot 수의 두 배를 넘으면 scheduler 앞에서 기다리기만 하므로 의미가 없음
+            cls.__instance.__maxCommandExecutorCount = int(os.getenv(
+                "AI_CLIENT_MAX_COMMAND_EXECUTOR_COUNT", str(CommandScheduler.SLOT_COUNT * 2)))
+
+            PipelineMetricsRepositoryImpl.getInstance().registerGaugeProvider(cls.__instance.__getGaugeList)
+
+        return cls.__instance
+
+    @classmethod
+    def getInstance(cls):
+        if cls.__instance is None:
+            cls.__instance = cls()
+
+        return cls.__instance
+
+    def __createWorkerCountDict(self):
+        # template CommandExecutor thread 하나는 명령 하나를 끝날 때까지 붙잡고 있으므로 scheduler slot 수만큼 두어야
+        # slot 이 놀지 않음 - 수신 / 분석 단계는 socket 읽기와 역직렬화뿐이라 executor 4 개당 하나면 충분함
+        commandExecutorCount = CommandScheduler.SLOT_COUNT
+        workerCountDict = {
+            "Receiver": min(self.PHYSICAL_CORE_COUNT, max(1, math.ceil(commandExecutorCount / 4))),
+            "CommandAnalyzer": min(self.PHYSICAL_CORE_COUNT, max(1, math.ceil(commandExecutorCount / 4))),
+            "CommandExecutor": commandExecutorCount,
+            "ConditionalCustomExecutor": 1,
+        }
+
+        workerCountDict.update({
+            stageName.strip(): int(workerCount)
+            for stageName, workerCount in (
+                stageWorker.split(":") for stageWorker in self.WORKER_COUNT_OVERRIDE.split(",") if stageWorker.strip())
+        })
+
+        # 결과 전송 순서가 섞이지 않도록 Transmitter 는 항상 하나 (단일 ID 사용)
+        workerCountDict["Transmitter"] = 1
+
+        return workerCountDict
+
+    def getWorkerCount(self, stageName):
+        return self.__workerCountDict[stageName]
+
+    def startStage(self, threadWorkerPoolService, stageName, stageFunction):
+        # stageFunction(workerId) 를 worker 수만큼 thread pool worker 로 띄움
+        self.__stageFunctionDict[stageName] = stageFunction
+        for workerId in range(self.__workerCountDict[stageName]):
+            threadWorkerPoolService.executeThreadPoolWorker(f"{stageName}-{workerId}", partial(stageFunction, workerId))
+
+    def __addWorker(self, threadWorkerPoolService, stageName, addCount):
+        workerCount = self.__workerCountDict[stageName]
+        for workerId in range(workerCount, workerCount + addCount):
+            threadWorkerPoolService.executeThreadPoolWorker(
+                f"{stageName}-{workerId}", partial(self.__stageFunctionDict[stageName], workerId))
+
+        self.__workerCountDict[stageName] = workerCount + addCount
+        ColorPrinter.print_important_data(f"{stageName} worker count", self.__workerCountDict[stageName])
+
+    def sampleUtilization(self):
+        # template 단계의 loop 는 이 저장소 밖에 있으므로, 사용률은 protocol handler 를 실행한 시간으로 잼
+        # (StreamCommand 는 token stream 으로 받은 명령 - worker thread 대신 scheduler slot 수를 용량으로 봄)
+        capacityDict = {
+            "CommandExecutor": self.__workerCountDict["CommandExecutor"],
+            "StreamCommand": CommandScheduler.SLOT_COUNT,
+        }
+        self.__lastSample = StageMonitor.getInstance().sample(capacityDict)
+
+        return self.__lastSample
+
+    def startAutoTuner(self, threadWorkerPoolService):
+        if self.__tunerThread is not None:
+            return
+
+        self.__tunerThread = threading.Thread(target=self.__runAutoTuner, args=(threadWorkerPoolService,),
+                                              name="WorkerTopologyTuner", daemon=True)
+        self.__tunerThread.start()
+
+    def __runAutoTuner(self, threadWorkerPoolService):
+        while True:
+            time.sleep(self.TUNE_INTERVAL_SECONDS)
+
+            sample = self.sampleUtilization()
+            schedulerStatus = CommandScheduler.getInstance().getStatus()
+            utilization = sample.get("CommandExecutor", {}).get("utilization") or 0
+            waitingCount = schedulerStatus["waitingInteractiveCount"] + schedulerStatus["waitingBatchCount"]
+
+            # slot 을 기다리는 명령이 있으면 병목은 scheduler slot 이므로 executor 를 늘려도 소용없음
+            commandExecutorCount = self.__workerCountDict["CommandExecutor"]
+            if (utilization >= self.SCALE_UP_UTILIZATION and waitingCount == 0
+                    and commandExecutorCount < self.__maxCommandExecutorCount):
+                addCount = min(max(1, commandExecutorCount // 4),
+                               self.__maxCommandExecutorCount - commandExecutorCount)
+                self.__addWorker(threadWorkerPoolService, "CommandExecutor", addCount)
+
+    def __getGaugeList(self):
+        # 사용률은 auto tuner 가 마지막으로 잰 구간의 값 (snapshot 을 만들 때 다시 재면 tuner 의 측정 구간이 끊김)
+        gaugeList = [("stage_workers", {"stage": stageName}, workerCount)
+                     for stageName, workerCount in self.__workerCountDict.items()]
+        gaugeList.extend(("stage_utilization", {"stage": stageName}, sample["utilization"])
+                         for stageName, sample in self.__lastSample.items() if sample["utilization"] is not None)
+
+        return gaugeList
+
+    def getStatus(self):
+        return {
+            "workerCount": dict(self.__workerCountDict),
+            "stageUtilization": self.__lastSample,
+        }
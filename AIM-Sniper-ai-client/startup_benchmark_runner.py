@@ -0,0 +1,61 @@
+import time
+
+# import 시간까지 포함해서 재야 하므로 다른 모듈을 올리기 전에 기록
+processStartTime = time.perf_counter()
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'template'))
+
+# 노드 구성별로 켜는 protocol 번호 (AI_CLIENT_PROTOCOL_LIST)
+NODE_PROTOCOL_LIST_DICT = {
+    "polyglot-only": "7,8",
+    "report-only": "50",
+    "all": "7,8,50",
+}
+
+def measureStartupOnce():
+    import psutil
+
+    from user_defined_protocol.register import UserDefinedProtocolRegister
+
+    # starter.py 와 같은 순서로 protocol 등록 후 socket 접속 직전(준비 완료)까지의 시간과 RSS
+    UserDefinedProtocolRegister.registerUserDefinedProtocol()
+    UserDefinedProtocolRegister.prepareUserDefinedProtocol()
+
+    return {
+        "protocolList": [protocolNumber.value for protocolNumber in UserDefinedProtocolRegister.ENABLED_PROTOCOL_LIST],
+        "startupTime": round(time.perf_counter() - processStartTime, 3),
+        "residentMemoryMB": round(psutil.Process(os.getpid()).memory_info().rss / (1024 ** 2), 1),
+        "torchLoaded": "torch" in sys.modules,
+        "openaiLoaded": "openai" in sys.modules,
+    }
+
+def compareStartup():
+    # 노드 구성마다 새 프로세스에서 측정해야 import 된 모듈이 섞이지 않음
+    resultDict = {}
+    for nodeName, protocolList in NODE_PROTOCOL_LIST_DICT.items():
+        completedProcess = subprocess.run(
+            [sys.executable, os.path.basename(__file__), "once"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            env={**os.environ, "AI_CLIENT_PROTOCOL_LIST": protocolList},
+            capture_output=True,
+            text=True,
+            check=True)
+        resultDict[nodeName] = json.loads(completedProcess.stdout.strip().splitlines()[-1])
+
+    return resultDict
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="protocol 구성별 AI client 기동 시간 / RSS 측정")
+    parser.add_argument("mode", choices=["compare", "once"], nargs="?", default="compare")
+    args = parser.parse_args()
+
+    result = compareStartup() if args.mode == "compare" else measureStartupOnce()
+
+    # 마지막 줄은 항상 한 줄짜리 JSON 으로 출력해서 다른 프로세스가 결과를 읽을 수 있도록 함
+    print(json.dumps(result, ensure_ascii=False))
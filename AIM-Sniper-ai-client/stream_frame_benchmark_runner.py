@@ -0,0 +1,118 @@
+import argparse
+import json
+import os
+import socket
+import sys
+import threading
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'template'))
+
+from token_stream.utility.stream_frame import FRAME_HEADER, decodeBody, encodeFrame, getSupportedCodecList, \
+    getSupportedCompressionList, readFrame
+
+REPORT_FILE_PATH = os.path.join("assets", "report.json")
+
+# DataForCorpBusinessRepositoryImpl.WANTED_CORP_LIST 의 기업 수 (dart / openai 를 import 하지 않으려고 개수만 사용)
+REPORT_CORP_COUNT = 44
+
+def buildReportPayload():
+    # 실제 보고서가 있으면 그대로 쓰고, 없으면 같은 구조(44 개 기업 x 개요 / HTML 요약 / 매출 표 / 재무 추이)로 만듦
+    if os.path.exists(REPORT_FILE_PATH):
+        with open(REPORT_FILE_PATH, "r", encoding="utf-8-sig") as f:
+            return {"aiResult": json.load(f)}
+
+    summaryItem = "<li>주력 사업의 매출 비중과 최근 3 년간의 성장 추이, 신규 투자 방향을 정리한 항목입니다.</li>"
+    tableRow = "<tr><td>제품 매출</td><td>1,234,567</td><td>1,123,456</td><td>1,012,345</td></tr>"
+    report = {}
+    for index in range(REPORT_CORP_COUNT):
+        report[f"기업{index:02d}"] = {
+            "est_dt": f"{30 + index}년차 ({1995 - index})",
+            "corp_cls": "유가",
+            "ceo_nm": "홍길동",
+            "adres": "서울특별시 중구",
+            "hm_url": "www.example.co.kr",
+            "businessSummary": "<p>기업 총평과 공략 포인트</p><ul>" + summaryItem * 12 + "</ul>",
+            "revenueTable": "<table>" + tableRow * 20 + "</table>",
+            "revenueTrend": {str(year): 1000000000000 + year * index for year in (2021, 2022, 2023)},
+            "profitTrend": {str(year): 100000000000 + year * index for year in (2021, 2022, 2023)},
+            "ownersCapital": 55.5 + index,
+        }
+
+    return {"aiResult": report}
+
+def buildPayloadDict():
+    feedback = "score: 78점<s>feedback: 질문 의도에 맞게 경험을 구체적으로 설명했지만, 결과를 수치로 제시하면 더 설득력이 있습니다."
+    return {
+        "question": {"nextQuestion": "팀 프로젝트에서 의견이 갈렸을 때 어떻게 합의에 도달했는지 구체적으로 말씀해 주세요.",
+                     "requestId": "0" * 32},
+        "score": {"resultList": [feedback * 3] * 6, "requestId": "0" * 32},
+        "report": {**buildReportPayload(), "requestId": "0" * 32},
+    }
+
+def measureCodec(payload, codec, compression, repeatCount):
+    # 한 쪽 끝에서 frame 을 만들어 보내고 다른 쪽 끝에서 읽어서 복원할 때까지를 localhost socket 으로 측정
+    senderSocket, receiverSocket = socket.socketpair()
+    encodeTimeList, roundTripTimeList, decodeTimeList = [], [], []
+    frameSize = 0
+
+    try:
+        for _ in range(repeatCount):
+            startTime = time.perf_counter()
+            frame = encodeFrame(payload, codec, compression)
+            encodedTime = time.perf_counter()
+            frameSize = len(frame)
+
+            senderThread = threading.Thread(target=senderSocket.sendall, args=(frame,))
+            senderThread.start()
+            receivedPayload = readFrame(receiverSocket)
+            decodedTime = time.perf_counter()
+            senderThread.join()
+
+            encodeTimeList.append(encodedTime - startTime)
+            roundTripTimeList.append(decodedTime - startTime)
+
+            # 읽기 시간에는 전송 대기 시간이 섞이므로 복원만 따로 한 번 더 잼
+            decodeStartTime = time.perf_counter()
+            readFrameFromBytes(frame)
+            decodeTimeList.append(time.perf_counter() - decodeStartTime)
+
+        assert receivedPayload == payload
+    finally:
+        senderSocket.close()
+        receiverSocket.close()
+
+    return {
+        "frameBytes": frameSize,
+        "encodeMs": round(sum(encodeTimeList) / repeatCount * 1000, 3),
+        "decodeMs": round(sum(decodeTimeList) / repeatCount * 1000, 3),
+        "roundTripMs": round(sum(roundTripTimeList) / repeatCount * 1000, 3),
+    }
+
+def readFrameFromBytes(frame):
+    bodyLength, flags = FRAME_HEADER.unpack_from(frame)
+    return decodeBody(flags, frame[FRAME_HEADER.size:FRAME_HEADER.size + bodyLength])
+
+def compareCodec(repeatCount):
+    # json 은 지금 template socket 으로 보내는 방식과 같은 직렬화, 나머지는 token stream 연결에서 협상 가능한 조합
+    settingList = [(codec, None) for codec in reversed(getSupportedCodecList())]
+    settingList += [(codec, compression) for compression in getSupportedCompressionList()
+                    for codec in reversed(getSupportedCodecList())]
+
+    resultDict = {}
+    for payloadName, payload in buildPayloadDict().items():
+        resultDict[payloadName] = {
+            codec if compression is None else f"{codec}+{compression}": measureCodec(payload, codec, compression,
+                                                                                    repeatCount)
+            for codec, compression in settingList
+        }
+
+    return resultDict
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="token stream frame 형식별 직렬화 / 전송 / 복원 시간과 크기 비교")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    # 마지막 줄은 항상 한 줄짜리 JSON 으로 출력해서 다른 프로세스가 결과를 읽을 수 있도록 함
+    print(json.dumps(compareCodec(args.repeat), ensure_ascii=False))
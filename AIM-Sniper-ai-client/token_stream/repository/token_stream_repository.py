@@ -0,0 +1,31 @@
+from abc import ABC, abstractmethod
+
+
+class TokenStreamRepository(ABC):
+    @abstractmethod
+    def isEnabled(self):
+        pass
+
+    @abstractmethod
+    def openStream(self, requestId, index, tokenizer, stoppingCriteria=None, strip=False):
+        pass
+
+    @abstractmethod
+    def closeStream(self, requestId, index, finalText):
+        pass
+
+    @abstractmethod
+    def sendResult(self, requestId, protocolNumber, result, isRequired=False):
+        pass
+
+    @abstractmethod
+    def startStatusReporter(self, statusProvider):
+        pass
+
+    @abstractmethod
+    def startMetricsReporter(self, metricsProvider):
+        pass
+
+    @abstractmethod
+    def startCommandReceiver(self, protocolList, slotCount, commandHandler):
+        pass
@@ -0,0 +1,290 @@
+import os
+import queue
+import socket
+import threading
+import time
+from concurrent.futures import Future
+
+from dotenv import load_dotenv
+
+from pipeline_metrics.repository.pipeline_metrics_repository_impl import PipelineMetricsRepositoryImpl
+from polyglot_inference.utility.streaming_text_decoder import StreamingTextDecoder
+from token_stream.repository.token_stream_repository import TokenStreamRepository
+from token_stream.utility.stream_frame import encodeFrame, getSupportedCodecList, getSupportedCompressionList, \
+    readFrame
+from template.utility.color_print import ColorPrinter
+
+load_dotenv()
+
+
+class TokenStreamRepositoryImpl(TokenStreamRepository):
+    __instance = None
+
+    # FastAPI 의 스트리밍 수신 서버 주소 (설정하지 않으면 스트리밍 없이 최종 결과만 socket 으로 보냄)
+    STREAM_HOST = os.getenv("AI_STREAM_HOST")
+    STREAM_PORT = os.getenv("AI_STREAM_PORT")
+
+    # FastAPI 의 AI_STREAM_SECRET 과 같은 값 - hello 에 실어 보내야 FastAPI 가 이 연결을 받아 줌
+    STREAM_SECRET = os.getenv("AI_STREAM_SECRET")
+
+    # 접속에 실패하면 이 시간 동안은 다시 시도하지 않고 조각을 버림 (최종 결과 전송에는 영향 없음)
+    RECONNECT_INTERVAL_SECONDS = 3
+
+    # FastAPI 가 여러 AI client 중 하나를 골라 명령을 보낼 때 이 노드를 구분하는 이름 (기본값은 host 이름 + pid)
+    NODE_ID = os.getenv("AI_CLIENT_NODE_ID") or f"{socket.gethostname()}-{os.getpid()}"
+
+    # 명령 대기 현황(포화된 protocol / 재시도 대기 시간)을 FastAPI 에 알리는 주기 - FastAPI 는 이 값으로 명령을 보내기 전에 거절함
+    STATUS_INTERVAL_SECONDS = float(os.getenv("AI_CLIENT_STATUS_INTERVAL_SECONDS", "1"))
+
+    # 단계별 처리 시간 / 생성 속도 같은 누적 지표를 FastAPI 에 보내는 주기 - FastAPI 는 /metrics 로 노드별로 노출함
+    METRICS_INTERVAL_SECONDS = float(os.getenv("AI_CLIENT_METRICS_INTERVAL_SECONDS", "5"))
+
+    # 주기적으로 보내는 보고 frame 종류와, 밀려 있으면 가장 최근 것 하나만 보내도 되는 event 종류
+    REPORT_KIND_LIST = ("status", "metrics")
+    COALESCED_KIND_LIST = ("token",) + REPORT_KIND_LIST
+
+    def __new__(cls):
+        if cls.__instance is None:
+            cls.__instance = super().__new__(cls)
+            cls.__instance.__frameQueue = queue.Queue()
+            cls.__instance.__decoderDict = {}
+            cls.__instance.__streamSocket = None
+
+            # 접속할 때 FastAPI 와 협상한 본문 형식 / 압축 방식 / 결과를 이 연결로 받겠다고 한 protocol 목록
+            cls.__instance.__codec = "json"
+            cls.__instance.__compression = None
+            cls.__instance.__resultProtocolList = []
+            cls.__instance.__lastConnectFailedTime = 0
+            cls.__instance.__senderThread = None
+            cls.__instance.__senderLock = threading.Lock()
+            cls.__instance.__reporterThreadDict = {}
+            cls.__instance.__pipelineMetricsRepository = PipelineMetricsRepositoryImpl.getInstance()
+
+            # 이 노드가 처리하는 protocol 목록 / 동시 실행 slot 수와, FastAPI 가 이 연결로 보낸 명령을 실행할 함수
+            # (설정되지 않으면 hello 에 노드 정보를 싣지 않으므로 FastAPI 는 이 연결로 명령을 보내지 않음)
+            cls.__instance.__nodeInfo = None
+            cls.__instance.__commandHandler = None
+
+        return cls.__instance
+
+    @classmethod
+    def getInstance(cls):
+        if cls.__instance is None:
+            cls.__instance = cls()
+
+        return cls.__instance
+
+    def isEnabled(self):
+        return bool(self.STREAM_HOST and self.STREAM_PORT)
+
+    def __startSenderIfNeeded(self):
+        with self.__senderLock:
+            if self.__senderThread is not None and self.__senderThread.is_alive():
+                return
+
+            self.__senderThread = threading.Thread(target=self.__runSender, name="TokenStreamSender", daemon=True)
+            self.__senderThread.start()
+
+    def openStream(self, requestId, index, tokenizer, stoppingCriteria=None, strip=False):
+        if requestId is None or not self.isEnabled():
+            return None
+
+        self.__startSenderIfNeeded()
+        streamKey = (requestId, index)
+        self.__frameQueue.put(("open", streamKey, StreamingTextDecoder(tokenizer, stoppingCriteria, strip)))
+
+        # inference engine thread 에서는 토큰 id 만 넘기고, 디코딩과 전송은 sender thread 가 맡음
+        return lambda generatedIdList: self.__frameQueue.put(("token", streamKey, generatedIdList))
+
+    def closeStream(self, requestId, index, finalText):
+        if requestId is None or not self.isEnabled():
+            return
+
+        self.__frameQueue.put(("close", (requestId, index), finalText))
+
+    def sendResult(self, requestId, protocolNumber, result, isRequired=False):
+        # 협상된 protocol 의 결과를 이 연결로 보내고, 보냈는지 여부를 Future 로 돌려줌
+        # (False 면 호출한 쪽이 기존처럼 template socket 으로 전체 결과를 보냄)
+        # isRequired 는 이 연결로 받은 명령의 결과처럼 protocol 과 관계없이 이 연결로 돌려줘야 하는 경우
+        future = Future()
+        if requestId is None or not self.isEnabled():
+            future.set_result(False)
+            return future
+
+        self.__startSenderIfNeeded()
+        self.__frameQueue.put(("result", (requestId, None), (protocolNumber, result, isRequired, future)))
+
+        return future
+
+    def startCommandReceiver(self, protocolList, slotCount, commandHandler):
+        # FastAPI 가 이 노드를 명령 분배 대상으로 등록하도록 hello 에 노드 정보를 싣고, 이 연결로 오는 명령을 받음
+        if not self.isEnabled():
+            return
+
+        self.__nodeInfo = {"nodeId": self.NODE_ID, "protocolList": list(protocolList), "slotCount": slotCount}
+        self.__commandHandler = commandHandler
+
+        # 보낼 조각이 없어도 바로 접속해서 FastAPI 에 노드로 등록되게 함 (끊기면 status 전송 때 다시 접속)
+        self.__startSenderIfNeeded()
+        self.__frameQueue.put(("connect", None, None))
+
+    def __runCommandReceiver(self, streamSocket):
+        try:
+            while True:
+                frame = readFrame(streamSocket)
+                if frame.get("type") == "command":
+                    self.__commandHandler(frame)
+
+        except (OSError, ValueError) as exception:
+            ColorPrinter.print_important_data("token stream receive stopped", str(exception))
+
+            # 다음 전송에서 sender thread 가 끊긴 것을 알아채고 다시 접속하도록 함
+            try:
+                streamSocket.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def startStatusReporter(self, statusProvider):
+        self.__startReporter("status", statusProvider, self.STATUS_INTERVAL_SECONDS)
+
+    def startMetricsReporter(self, metricsProvider):
+        self.__startReporter("metrics", metricsProvider, self.METRICS_INTERVAL_SECONDS)
+
+    def __startReporter(self, kind, provider, intervalSeconds):
+        if not self.isEnabled() or kind in self.__reporterThreadDict:
+            return
+
+        self.__startSenderIfNeeded()
+        self.__reporterThreadDict[kind] = threading.Thread(target=self.__runReporter,
+                                                           args=(kind, provider, intervalSeconds),
+                                                           name=f"TokenStream{kind.capitalize()}Reporter", daemon=True)
+        self.__reporterThreadDict[kind].start()
+
+    def __runReporter(self, kind, provider, intervalSeconds):
+        while True:
+            self.__frameQueue.put((kind, kind, provider()))
+            time.sleep(intervalSeconds)
+
+    def __drainEventList(self):
+        eventList = [self.__frameQueue.get()]
+        while True:
+            try:
+                eventList.append(self.__frameQueue.get_nowait())
+            except queue.Empty:
+                return eventList
+
+    def __runSender(self):
+        while True:
+            eventList = self.__drainEventList()
+
+            # 전송이 생성 속도를 못 따라가서 밀린 경우에는 stream 마다 가장 최근 토큰 상태만 디코딩해서 한 조각으로 보냄
+            # (status / metrics 보고도 밀려 있으면 종류별로 가장 최근 것 하나만 보냄)
+            latestTokenEventDict = {streamKey: eventIndex for eventIndex, (kind, streamKey, _) in enumerate(eventList)
+                                    if kind in self.COALESCED_KIND_LIST}
+
+            for eventIndex, (kind, streamKey, value) in enumerate(eventList):
+                if kind in self.COALESCED_KIND_LIST and latestTokenEventDict[streamKey] != eventIndex:
+                    continue
+
+                self.__handleEvent(kind, streamKey, value)
+
+    def __handleEvent(self, kind, streamKey, value):
+        if kind == "open":
+            self.__decoderDict[streamKey] = value
+            return
+
+        if kind == "connect":
+            self.__connectIfNeeded()
+            return
+
+        if kind in self.REPORT_KIND_LIST:
+            self.__sendFrame({"type": kind, kind: value})
+            return
+
+        if kind == "result":
+            protocolNumber, result, isRequired, future = value
+            isSent = (self.__connectIfNeeded() is not None
+                      and (isRequired or protocolNumber in self.__resultProtocolList)
+                      and self.__sendFrame({"type": "result", "requestId": streamKey[0], "result": result}))
+            future.set_result(bool(isSent))
+            return
+
+        decoder = self.__decoderDict.get(streamKey)
+        if decoder is None:
+            return
+
+        requestId, index = streamKey
+        if kind == "token":
+            chunk = decoder.putToken(value)
+            if chunk:
+                self.__sendFrame({"type": "chunk", "requestId": requestId, "index": index, "chunk": chunk})
+            return
+
+        # 마지막 frame 은 최종 텍스트 전체를 함께 보내서 받는 쪽이 이어 붙인 결과를 확인 / 교체할 수 있게 함
+        del self.__decoderDict[streamKey]
+        chunk = decoder.finish(value)
+        self.__sendFrame({"type": "chunk", "requestId": requestId, "index": index, "chunk": chunk or "",
+                          "done": True, "reset": chunk is None, "text": value})
+
+    def __sendFrame(self, frame):
+        streamSocket = self.__connectIfNeeded()
+        if streamSocket is None:
+            return False
+
+        sendStartTime = time.perf_counter()
+        try:
+            encodedFrame = encodeFrame(frame, self.__codec, self.__compression)
+            streamSocket.sendall(encodedFrame)
+        except OSError as exception:
+            ColorPrinter.print_important_data("token stream send failed", str(exception))
+            streamSocket.close()
+            self.__streamSocket = None
+            return False
+
+        frameLabelDict = {"type": frame["type"]}
+        self.__pipelineMetricsRepository.observe("stream_send_seconds", frameLabelDict,
+                                                 time.perf_counter() - sendStartTime)
+        self.__pipelineMetricsRepository.increment("stream_sent_bytes_total", frameLabelDict, len(encodedFrame))
+
+        return True
+
+    def __connectIfNeeded(self):
+        if self.__streamSocket is not None:
+            return self.__streamSocket
+
+        if time.monotonic() - self.__lastConnectFailedTime < self.RECONNECT_INTERVAL_SECONDS:
+            return None
+
+        streamSocket = None
+        try:
+            streamSocket = socket.create_connection((self.STREAM_HOST, int(self.STREAM_PORT)), timeout=5)
+            streamSocket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+            # 지원하는 형식을 알리고, FastAPI 가 고른 형식과 이 연결로 결과를 받을 protocol 목록을 받음
+            streamSocket.sendall(encodeFrame({"type": "hello",
+                                              "codecList": getSupportedCodecList(),
+                                              "compressionList": getSupportedCompressionList(),
+                                              "secret": self.STREAM_SECRET,
+                                              "node": self.__nodeInfo}))
+            helloFrame = readFrame(streamSocket)
+
+            # 접속 / 협상까지만 시간 제한을 두고, 이후에는 명령이 오지 않는 동안에도 수신 대기가 끊기지 않게 함
+            streamSocket.settimeout(None)
+        except (OSError, ValueError) as exception:
+            ColorPrinter.print_important_data("token stream connect failed", str(exception))
+            if streamSocket is not None:
+                streamSocket.close()
+            self.__lastConnectFailedTime = time.monotonic()
+            return None
+
+        self.__codec = helloFrame.get("codec", "json")
+        self.__compression = helloFrame.get("compression")
+        self.__resultProtocolList = helloFrame.get("resultProtocolList", [])
+        ColorPrinter.print_important_data("token stream negotiated", helloFrame)
+
+        if self.__commandHandler is not None:
+            threading.Thread(target=self.__runCommandReceiver, args=(streamSocket,),
+                             name="TokenStreamCommandReceiver", daemon=True).start()
+
+        self.__streamSocket = streamSocket
+        return streamSocket
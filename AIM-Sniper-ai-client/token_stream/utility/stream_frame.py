@@ -0,0 +1,86 @@
+import json
+import struct
+
+# msgpack / zstandard 가 없는 환경에서는 JSON, 무압축으로만 협상함
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# frame 하나 = 4 byte big-endian 본문 길이 + 1 byte 형식 flag + 본문
+# (AI client 와 FastAPI 의 token_stream 에 같은 파일이 있으므로 한쪽을 고치면 다른 쪽도 똑같이 고침)
+FRAME_HEADER = struct.Struct(">IB")
+
+FLAG_MSGPACK = 0x01
+FLAG_ZSTD = 0x02
+
+# 이 크기(byte) 이상인 본문만 zstd 로 압축 (생성 조각처럼 작은 frame 은 압축 이득보다 CPU 비용이 큼)
+ZSTD_THRESHOLD_BYTES = 4096
+ZSTD_LEVEL = 3
+
+
+def getSupportedCodecList():
+    # 선호하는 순서대로
+    return (["msgpack"] if msgpack is not None else []) + ["json"]
+
+
+def getSupportedCompressionList():
+    return ["zstd"] if zstandard is not None else []
+
+
+def encodeFrame(frame, codec="json", compression=None):
+    flags = 0
+    if codec == "msgpack":
+        body = msgpack.packb(frame, use_bin_type=True)
+        flags |= FLAG_MSGPACK
+    else:
+        body = json.dumps(frame, ensure_ascii=False).encode("utf-8")
+
+    if compression == "zstd" and len(body) >= ZSTD_THRESHOLD_BYTES:
+        body = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(body)
+        flags |= FLAG_ZSTD
+
+    return FRAME_HEADER.pack(len(body), flags) + body
+
+
+def decodeBody(flags, body):
+    # 형식은 frame 마다 flag 로 표시되므로 협상 전 hello frame 과 이후 frame 을 같은 방식으로 읽음
+    if flags & FLAG_ZSTD:
+        body = zstandard.ZstdDecompressor().decompress(body)
+
+    if flags & FLAG_MSGPACK:
+        return msgpack.unpackb(body, raw=False)
+
+    return json.loads(body)
+
+
+def receiveExactly(streamSocket, size):
+    buffer = bytearray()
+    while len(buffer) < size:
+        received = streamSocket.recv(size - len(buffer))
+        if not received:
+            raise ConnectionError("token stream connection closed")
+        buffer.extend(received)
+
+    return bytes(buffer)
+
+
+def readFrame(streamSocket):
+    # AI client 는 blocking socket 으로 읽음
+    bodyLength, flags = FRAME_HEADER.unpack(receiveExactly(streamSocket, FRAME_HEADER.size))
+    return decodeBody(flags, receiveExactly(streamSocket, bodyLength))
+
+
+async def readFrameAsync(reader, maxBodyLength=None):
+    # FastAPI 는 asyncio stream 으로 읽음
+    # (maxBodyLength 를 주면 그보다 큰 frame 과 풀린 크기를 알 수 없는 압축 frame 은 읽지 않음)
+    bodyLength, flags = FRAME_HEADER.unpack(await reader.readexactly(FRAME_HEADER.size))
+    if maxBodyLength is not None and (bodyLength > maxBodyLength or flags & FLAG_ZSTD):
+        raise ValueError(f"token stream frame is not allowed here: {bodyLength} bytes, flags {flags}")
+
+    return decodeBody(flags, await reader.readexactly(bodyLength))
@@ -0,0 +1,258 @@
+import asyncio
+import contextlib
+import contextvars
+import functools
+import math
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextvars import ContextVar
+
+from dotenv import load_dotenv
+
+from pipeline_metrics.repository.pipeline_metrics_repository_impl import PipelineMetricsRepositoryImpl
+from user_defined_protocol.protocol import UserDefinedProtocolNumber
+
+load_dotenv()
+
+# 지금 처리 중인 명령의 slot 대기 / 실행 시간을 받아 갈 dict (lazyHandler 가 결과에 단계별 시간으로 붙임)
+currentSlotTiming = ContextVar("currentSlotTiming", default=None)
+
+
+class CommandScheduler:
+    __instance = None
+
+    # 동시에 실행할 수 있는 protocol 명령 수 (기본값은 inference engine 의 최대 batch 크기와 같게 둠)
+    SLOT_COUNT = int(os.getenv("AI_CLIENT_COMMAND_SLOT_COUNT", "8"))
+
+    # batch protocol 이 차지할 수 있는 slot 비율 (나머지는 항상 면접 protocol 몫으로 남음)
+    BATCH_SLOT_SHARE = float(os.getenv("AI_CLIENT_BATCH_SLOT_SHARE", "0.25"))
+
+    # 몇 분씩 걸리는 batch 작업 protocol (REPORT_MAKING: DART 수집 / HTML 파싱 / 기업별 OpenAI 요약)
+    BATCH_PROTOCOL_LIST = [
+        UserDefinedProtocolNumber(int(protocolNumber))
+        for protocolNumber in os.getenv("AI_CLIENT_BATCH_PROTOCOL_LIST", "50").split(",")
+        if protocolNumber.strip()
+    ]
+
+    # protocol 별로 slot 을 기다릴 수 있는 최대 명령 수 ("protocol:개수" 목록), 넘치면 기다리지 않고 바로 거절
+    # (보고서는 하나가 이미 대기 중이면 같은 보고서를 또 쌓아둘 이유가 없음)
+    MAX_WAITING_COUNT_DICT = {
+        UserDefinedProtocolNumber(int(protocolNumber)): int(maxWaitingCount)
+        for protocolNumber, maxWaitingCount in (
+            protocolLimit.split(":") for protocolLimit
+            in os.getenv("AI_CLIENT_MAX_WAITING_COMMAND", "7:32,8:16,50:1").split(",") if protocolLimit.strip())
+    }
+
+    # process 실행 protocol 을 처리하는 worker process 수 (기본값은 batch slot 수)
+    PROCESS_WORKER_COUNT = int(os.getenv("AI_CLIENT_PROCESS_WORKER_COUNT", "0"))
+
+    # protocol 별 평균 실행 시간(지수 이동 평균)의 최근 값 반영 비율 - 거절할 때 알려주는 재시도 대기 시간 추정용
+    DURATION_SMOOTHING = 0.2
+
+    def __new__(cls):
+        if cls.__instance is None:
+            cls.__instance = super().__new__(cls)
+            cls.__instance.__lock = threading.Lock()
+            cls.__instance.__interactiveWaiterDeque = deque()
+            cls.__instance.__batchWaiterDeque = deque()
+            cls.__instance.__runningCount = 0
+            cls.__instance.__runningBatchCount = 0
+            cls.__instance.__waitingCountDict = {}
+            cls.__instance.__averageDurationDict = {}
+            cls.__instance.__batchSlotCount = max(1, int(cls.SLOT_COUNT * cls.BATCH_SLOT_SHARE))
+
+            # batch handler 는 async 로 선언되어 있어도 내부가 동기 I/O 이므로 별도 thread 의 이벤트 루프에서 실행
+            cls.__instance.__batchExecutor = ThreadPoolExecutor(max_workers=cls.__instance.__batchSlotCount,
+                                                                thread_name_prefix="BatchCommandWorker")
+
+            # process 실행 protocol 이 처음 들어올 때 만듦 (torch 를 올린 프로세스를 fork 하지 않도록 spawn 사용)
+            cls.__instance.__processExecutor = None
+
+            cls.__instance.__pipelineMetricsRepository = PipelineMetricsRepositoryImpl.getInstance()
+            cls.__instance.__pipelineMetricsRepository.registerGaugeProvider(cls.__instance.__getGaugeList)
+
+        return cls.__instance
+
+    @classmethod
+    def getInstance(cls):
+        if cls.__instance is None:
+            cls.__instance = cls()
+
+        return cls.__instance
+
+    def isBatchProtocol(self, protocolNumber):
+        return protocolNumber in self.BATCH_PROTOCOL_LIST
+
+    def __grantSlot(self):
+        # 빈 slot 은 기다리는 면접 명령에 먼저 주고, batch 명령은 상한 안에서만 받음
+        while self.__runningCount < self.SLOT_COUNT:
+            if self.__interactiveWaiterDeque:
+                future, protocolNumber = self.__interactiveWaiterDeque.popleft()
+            elif self.__batchWaiterDeque and self.__runningBatchCount < self.__batchSlotCount:
+                future, protocolNumber = self.__batchWaiterDeque.popleft()
+            else:
+                return
+
+            self.__waitingCountDict[protocolNumber] -= 1
+
+            # 기다리다 취소된 명령은 건너뜀
+            if not future.set_running_or_notify_cancel():
+                continue
+
+            self.__runningCount += 1
+            self.__runningBatchCount += self.isBatchProtocol(protocolNumber)
+            future.set_result(None)
+
+    def isSaturated(self, protocolNumber):
+        maxWaitingCount = self.MAX_WAITING_COUNT_DICT.get(protocolNumber)
+        return maxWaitingCount is not None and self.__waitingCountDict.get(protocolNumber, 0) >= maxWaitingCount
+
+    def getRetryAfterSeconds(self, protocolNumber):
+        # 앞에 기다리는 명령이 모두 빠질 때까지의 대략적인 시간
+        slotCount = self.__batchSlotCount if self.isBatchProtocol(protocolNumber) else self.SLOT_COUNT
+        averageDuration = self.__averageDurationDict.get(protocolNumber, 1.0)
+        waitingCount = self.__waitingCountDict.get(protocolNumber, 0)
+
+        return max(1, math.ceil(averageDuration * (waitingCount + 1) / slotCount))
+
+    def acquire(self, protocolNumber):
+        future = Future()
+        with self.__lock:
+            if self.isSaturated(protocolNumber):
+                raise CommandRejectedException(protocolNumber, self.getRetryAfterSeconds(protocolNumber))
+
+            self.__waitingCountDict[protocolNumber] = self.__waitingCountDict.get(protocolNumber, 0) + 1
+            waiterDeque = self.__batchWaiterDeque if self.isBatchProtocol(protocolNumber) \
+                else self.__interactiveWaiterDeque
+            waiterDeque.append((future, protocolNumber))
+            self.__grantSlot()
+
+        return future
+
+    def cancelWaiting(self, future, protocolNumber):
+        # slot 을 받기 전이면 취소하고 대기열 / 대기 수에서 바로 뺌 - 이미 slot 을 받았다면 False
+        # (asyncio.wrap_future 가 await 취소 시 lock 밖에서 future 를 먼저 취소할 수 있으므로, 대기열에 남아 있을 때만 뺌)
+        with self.__lock:
+            if not future.cancel():
+                return False
+
+            waiterDeque = self.__batchWaiterDeque if self.isBatchProtocol(protocolNumber) \
+                else self.__interactiveWaiterDeque
+            try:
+                waiterDeque.remove((future, protocolNumber))
+            except ValueError:
+                # __grantSlot 이 이미 꺼내면서 대기 수를 줄였음
+                return True
+
+            self.__waitingCountDict[protocolNumber] -= 1
+            return True
+
+    def release(self, protocolNumber, duration=None):
+        with self.__lock:
+            self.__runningCount -= 1
+            self.__runningBatchCount -= self.isBatchProtocol(protocolNumber)
+
+            if duration is not None:
+                previousDuration = self.__averageDurationDict.get(protocolNumber, duration)
+                self.__averageDurationDict[protocolNumber] = (
+                    previousDuration + self.DURATION_SMOOTHING * (duration - previousDuration))
+
+            self.__grantSlot()
+
+    @staticmethod
+    def setSlotTiming(slotTiming):
+        return currentSlotTiming.set(slotTiming)
+
+    @staticmethod
+    def resetSlotTiming(token):
+        currentSlotTiming.reset(token)
+
+    def __recordStageTime(self, protocolNumber, stage, seconds):
+        self.__pipelineMetricsRepository.observe("command_stage_seconds",
+                                                 {"protocol": protocolNumber.value, "stage": stage}, seconds)
+
+        slotTiming = currentSlotTiming.get()
+        if slotTiming is not None:
+            slotTiming[f"{stage}Seconds"] = seconds
+
+    @contextlib.asynccontextmanager
+    async def occupySlot(self, protocolNumber):
+        waitStartTime = time.perf_counter()
+        slotFuture = self.acquire(protocolNumber)
+        try:
+            await asyncio.wrap_future(slotFuture)
+        except asyncio.CancelledError:
+            # 이미 slot 을 받은 뒤에 취소됐다면 반납
+            if not self.cancelWaiting(slotFuture, protocolNumber):
+                self.release(protocolNumber)
+            raise
+
+        startTime = time.perf_counter()
+        self.__recordStageTime(protocolNumber, "queue", startTime - waitStartTime)
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - startTime
+            self.__recordStageTime(protocolNumber, "execute", duration)
+            self.release(protocolNumber, duration)
+
+    async def run(self, protocolNumber, handler, *arg, **kwargs):
+        async with self.occupySlot(protocolNumber):
+            if not self.isBatchProtocol(protocolNumber):
+                return await handler(*arg, **kwargs)
+
+            # requestId 같은 context 값이 batch thread 에서도 보이도록 현재 context 를 복사해서 실행
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self.__batchExecutor,
+                functools.partial(contextvars.copy_context().run, asyncio.run, handler(*arg, **kwargs)))
+
+    def __getProcessExecutor(self):
+        with self.__lock:
+            if self.__processExecutor is None:
+                self.__processExecutor = ProcessPoolExecutor(
+                    max_workers=self.PROCESS_WORKER_COUNT or self.__batchSlotCount,
+                    mp_context=multiprocessing.get_context("spawn"))
+
+        return self.__processExecutor
+
+    async def runInProcess(self, protocolNumber, function, *arg, **kwargs):
+        # function 과 인자는 worker process 로 넘어가므로 pickle 가능한 module 수준 함수 / 값이어야 함
+        async with self.occupySlot(protocolNumber):
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.__getProcessExecutor(), functools.partial(function, *arg, **kwargs))
+
+    def __getGaugeList(self):
+        with self.__lock:
+            return [("command_running", {}, self.__runningCount)] + [
+                ("command_waiting", {"protocol": protocolNumber.value}, waitingCount)
+                for protocolNumber, waitingCount in self.__waitingCountDict.items()]
+
+    def getStatus(self):
+        # token stream 으로 FastAPI 에 보내므로 dict key 는 JSON / msgpack 모두에서 같도록 문자열 protocol 번호로 둠
+        with self.__lock:
+            return {
+                "slotCount": self.SLOT_COUNT,
+                "batchSlotCount": self.__batchSlotCount,
+                "runningCount": self.__runningCount,
+                "runningBatchCount": self.__runningBatchCount,
+                "waitingInteractiveCount": len(self.__interactiveWaiterDeque),
+                "waitingBatchCount": len(self.__batchWaiterDeque),
+                "waitingCount": {str(protocolNumber.value): waitingCount
+                                 for protocolNumber, waitingCount in self.__waitingCountDict.items()},
+                "saturatedProtocolList": [protocolNumber.value for protocolNumber in self.MAX_WAITING_COUNT_DICT
+                                          if self.isSaturated(protocolNumber)],
+                "retryAfterSeconds": {str(protocolNumber.value): self.getRetryAfterSeconds(protocolNumber)
+                                      for protocolNumber in self.MAX_WAITING_COUNT_DICT},
+            }
+
+
+class CommandRejectedException(Exception):
+    def __init__(self, protocolNumber, retryAfterSeconds):
+        super().__init__(f"{protocolNumber.name} 대기열이 가득 찼습니다 ({retryAfterSeconds}초 후 재시도)")
+        self.protocolNumber = protocolNumber
+        self.retryAfterSeconds = retryAfterSeconds
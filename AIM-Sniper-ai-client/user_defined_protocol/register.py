@@ -1,13 +1,14 @@
+import asyncio
 import os
 import sys
+import time
+
+from dotenv import load_dotenv
 
-from making_report.service.making_report_service_impl import MakingReportServiceImpl
 from making_report.service.request.making_report_request import MakingReportRequest
 from making_report.service.response.making_report_response import MakingReportResponse
-from polyglot_question.service.polyglot_question_service_impl import PolyglotQuestionServiceImpl
 from polyglot_question.service.request.polyglot_question_request import PolyglotQuestionRequest
 from polyglot_question.service.response.polyglot_question_response import PolyglotQuestionResponse
-from polyglot_score.service.polyglot_score_service_impl import PolyglotScoreServiceImpl
 from polyglot_score.service.request.polyglot_score_request import PolyglotScoreRequest
 from polyglot_score.service.response.polyglot_score_response import PolyglotScoreResponse
 
@@ -16,15 +17,211 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'template'))
 from template.custom_protocol.service.custom_protocol_service_impl import CustomProtocolServiceImpl
 from template.request_generator.request_class_map import RequestClassMap
 from template.response_generator.response_class_map import ResponseClassMap
+from template.utility.color_print import ColorPrinter
+from pipeline_metrics.repository.pipeline_metrics_repository_impl import PipelineMetricsRepositoryImpl
+from token_stream.repository.token_stream_repository_impl import TokenStreamRepositoryImpl
 
+from user_defined_protocol.command_scheduler import CommandRejectedException, CommandScheduler
 from user_defined_protocol.protocol import UserDefinedProtocolNumber
+from user_defined_protocol.request_id import RequestId
+from user_defined_protocol.stage_monitor import StageMonitor
+from user_defined_protocol.stream_command_executor import StreamCommandExecutor
+
+load_dotenv()
+
+
+def runServiceHandlerInProcess(loadService, handlerName, *arg, **kwargs):
+    # process 실행 protocol 의 worker process 안에서 서비스를 (처음이면) 생성하고 handler 를 끝까지 실행
+    return asyncio.run(getattr(loadService(), handlerName)(*arg, **kwargs))
+
+
+def parseProtocolNumber(protocolText):
+    # 번호(7) 또는 이름(POLYGLOT_QUESTION) 으로 지정할 수 있고, 알 수 없는 값이면 None
+    protocolText = protocolText.strip()
+    if protocolText.isdigit() and UserDefinedProtocolNumber.hasValue(int(protocolText)):
+        return UserDefinedProtocolNumber(int(protocolText))
+
+    return UserDefinedProtocolNumber.__members__.get(protocolText.upper())
+
+
+def printAvailableProtocolList():
+    ColorPrinter.print_important_data("available protocol list",
+                                      [f"{protocolNumber.value}({protocolNumber.name})"
+                                       for protocolNumber in UserDefinedProtocolNumber])
+
+
+def readEnabledProtocolList(protocolListText):
+    enabledProtocolList = []
+    invalidProtocolTextList = []
+    for protocolText in protocolListText.split(","):
+        if not protocolText.strip():
+            continue
+
+        protocolNumber = parseProtocolNumber(protocolText)
+        if protocolNumber is None:
+            invalidProtocolTextList.append(protocolText.strip())
+        elif protocolNumber not in enabledProtocolList:
+            enabledProtocolList.append(protocolNumber)
+
+    # 잘못 적은 protocol 은 건너뛰고, 처리할 protocol 이 하나도 남지 않으면 노드를 띄울 의미가 없으므로 기동을 멈춤
+    if invalidProtocolTextList:
+        ColorPrinter.print_important_data("AI_CLIENT_PROTOCOL_LIST 의 알 수 없는 protocol (건너뜀)", invalidProtocolTextList)
+        printAvailableProtocolList()
+
+    if not enabledProtocolList:
+        raise ValueError(f"AI_CLIENT_PROTOCOL_LIST 에 처리할 수 있는 protocol 이 없습니다: '{protocolListText}'")
+
+    return enabledProtocolList
+
+
+def readExecutionModeDict(executionModeText):
+    executionModeDict = {}
+    invalidEntryList = []
+    for protocolMode in executionModeText.split(","):
+        if not protocolMode.strip():
+            continue
+
+        protocolText, _, executionMode = protocolMode.partition(":")
+        protocolNumber = parseProtocolNumber(protocolText)
+        if protocolNumber is None or executionMode.strip() not in ("thread", "process"):
+            invalidEntryList.append(protocolMode.strip())
+            continue
+
+        executionModeDict[protocolNumber] = executionMode.strip()
+
+    # 잘못된 항목은 기본 실행 방식을 그대로 사용
+    if invalidEntryList:
+        ColorPrinter.print_important_data("AI_CLIENT_PROTOCOL_EXECUTION_MODE 의 잘못된 항목 (기본값 사용)", invalidEntryList)
+        printAvailableProtocolList()
+
+    return executionModeDict
 
 
 class UserDefinedProtocolRegister:
+    # 이 노드가 처리할 protocol 번호 목록 (예: "7,8" 은 polyglot 전용 노드, "50" 은 보고서 전용 노드)
+    ENABLED_PROTOCOL_LIST = readEnabledProtocolList(os.getenv("AI_CLIENT_PROTOCOL_LIST", "7,8,50"))
+
+    # 로컬 polyglot 모델을 사용하는 protocol
+    POLYGLOT_PROTOCOL_LIST = [
+        UserDefinedProtocolNumber.POLYGLOT_QUESTION,
+        UserDefinedProtocolNumber.POLYGLOT_SCORE,
+    ]
+
+    # protocol 별 실행 방식 - thread: 이 프로세스의 이벤트 루프 / batch thread 에서 실행,
+    # process: spawn 한 worker process 에서 실행 (GIL 을 오래 잡는 HTML 파싱이 면접 protocol 과 경쟁하지 않음)
+    # polyglot protocol 은 이 프로세스에 올린 모델과 inference engine 을 함께 써야 하므로 항상 thread
+    EXECUTION_MODE_DICT = {
+        UserDefinedProtocolNumber.POLYGLOT_QUESTION: "thread",
+        UserDefinedProtocolNumber.POLYGLOT_SCORE: "thread",
+        UserDefinedProtocolNumber.REPORT_MAKING: "process",
+    }
+
+    # "protocol:thread|process" 목록으로 위 기본값을 바꿈 (예: "50:thread")
+    EXECUTION_MODE_DICT.update(readExecutionModeDict(os.getenv("AI_CLIENT_PROTOCOL_EXECUTION_MODE", "")))
+
+    # 서비스 모듈은 아래 함수가 처음 호출될 때 import 하므로, 해당 protocol 을 쓰지 않는 노드는
+    # torch / transformers / openai 적재나 DART 기업 목록 조회를 하지 않음
+    @staticmethod
+    def loadPolyglotQuestionService():
+        from polyglot_question.service.polyglot_question_service_impl import PolyglotQuestionServiceImpl
+        return PolyglotQuestionServiceImpl.getInstance()
+
+    @staticmethod
+    def loadPolyglotScoreService():
+        from polyglot_score.service.polyglot_score_service_impl import PolyglotScoreServiceImpl
+        return PolyglotScoreServiceImpl.getInstance()
+
+    @staticmethod
+    def loadMakingReportService():
+        from making_report.service.making_report_service_impl import MakingReportServiceImpl
+        return MakingReportServiceImpl.getInstance()
+
+    @staticmethod
+    def getExecutionMode(protocolNumber):
+        if protocolNumber in UserDefinedProtocolRegister.POLYGLOT_PROTOCOL_LIST:
+            return "thread"
+
+        return UserDefinedProtocolRegister.EXECUTION_MODE_DICT.get(protocolNumber, "thread")
+
+    @staticmethod
+    def createLazyHandler(loadService, handlerName, protocolNumber):
+        pipelineMetricsRepository = PipelineMetricsRepositoryImpl.getInstance()
+        protocolLabelDict = {"protocol": protocolNumber.value}
+        serviceLoadState = {"isLoaded": False}
+
+        def loadServiceOnce():
+            # 처음 적재할 때(서비스 모듈 import / 모델 생성 포함)만 protocol 별 적재 시간으로 기록
+            if serviceLoadState["isLoaded"]:
+                return loadService()
+
+            loadStartTime = time.perf_counter()
+            service = loadService()
+            serviceLoadState["isLoaded"] = True
+            pipelineMetricsRepository.increment("protocol_service_load_total", protocolLabelDict)
+            pipelineMetricsRepository.observe("protocol_service_load_seconds", protocolLabelDict,
+                                              time.perf_counter() - loadStartTime)
+
+            return service
+
+        async def lazyHandler(*arg, **kwargs):
+            # FastAPI 가 붙인 requestId 는 서비스에 넘기지 않고 꺼내 두었다가 결과에 그대로 붙여서 돌려보냄
+            # (FastAPI 의 dispatcher 가 이 값으로 결과를 요청한 사용자에게만 전달함)
+            requestId = next((argument.value for argument in arg if isinstance(argument, RequestId)), None)
+            if requestId is None:
+                requestId = next((getattr(argument, "requestId") for argument in arg
+                                  if hasattr(argument, "requestId")), None)
+            arg = tuple(argument for argument in arg if not isinstance(argument, RequestId))
+
+            commandScheduler = CommandScheduler.getInstance()
+            requestIdToken = RequestId.setCurrent(requestId)
+
+            # scheduler 가 slot 대기 / 실행 시간을 채워 넣으면 결과에 붙여서 FastAPI 가 요청별 단계 시간을 계산하게 함
+            slotTiming = {}
+            slotTimingToken = CommandScheduler.setSlotTiming(slotTiming)
+            outcome = "error"
+            try:
+                # 면접 protocol 이 보고서 생성 같은 batch protocol 보다 먼저 slot 을 받고, batch 는 정해진 비율까지만 실행됨
+                # (handler 를 호출한 단계의 worker 가 일한 시간은 단계별 사용률로 집계됨)
+                with StageMonitor.getInstance().track(StageMonitor.getCurrentStage()):
+                    if UserDefinedProtocolRegister.getExecutionMode(protocolNumber) == "process":
+                        result = await commandScheduler.runInProcess(protocolNumber, runServiceHandlerInProcess,
+                                                                     loadService, handlerName, *arg, **kwargs)
+                    else:
+                        result = await commandScheduler.run(protocolNumber, getattr(loadServiceOnce(), handlerName),
+                                                            *arg, **kwargs)
+                outcome = "ok"
+            except CommandRejectedException as exception:
+                # 대기열이 가득 찬 protocol 은 기다리게 하지 않고 바로 거절 - FastAPI 가 429 / Retry-After 로 돌려줌
+                ColorPrinter.print_important_data("command rejected", str(exception))
+                result = {"rejected": True, "error": str(exception),
+                          "retryAfterSeconds": exception.retryAfterSeconds}
+                outcome = "rejected"
+            finally:
+                RequestId.resetCurrent(requestIdToken)
+                CommandScheduler.resetSlotTiming(slotTimingToken)
+                pipelineMetricsRepository.increment("command_total", {**protocolLabelDict, "outcome": outcome})
+
+            if requestId is None or not isinstance(result, dict):
+                return result
+
+            result["requestId"] = requestId
+            if slotTiming:
+                result["stageTiming"] = slotTiming
+
+            # FastAPI 가 token stream 연결로 받겠다고 협상한 protocol 이면 결과를 msgpack(+zstd) frame 으로 보내고
+            # template socket 으로는 JSON 으로 다시 직렬화하지 않도록 requestId 표시만 돌려보냄
+            isSentOnStream = await asyncio.wrap_future(
+                TokenStreamRepositoryImpl.getInstance().sendResult(requestId, protocolNumber.value, result))
+            if isSentOnStream:
+                return {"requestId": requestId, "resultOnStream": True}
+
+            return result
+
+        return lazyHandler
+
     @staticmethod
     def registerPolyglotQuestionProtocol():
         customProtocolService = CustomProtocolServiceImpl.getInstance()
-        polyglotQuestionService = PolyglotQuestionServiceImpl.getInstance()
 
         requestClassMapInstance = RequestClassMap.getInstance()
         requestClassMapInstance.addRequestClass(
@@ -38,15 +235,17 @@ class UserDefinedProtocolRegister:
             PolyglotQuestionResponse
         )
 
-        customProtocolService.registerCustomProtocol(
-            UserDefinedProtocolNumber.POLYGLOT_QUESTION,
-            polyglotQuestionService.generateNextQuestion
-        )
+        lazyHandler = UserDefinedProtocolRegister.createLazyHandler(
+            UserDefinedProtocolRegister.loadPolyglotQuestionService, "generateNextQuestion", UserDefinedProtocolNumber.POLYGLOT_QUESTION)
+        customProtocolService.registerCustomProtocol(UserDefinedProtocolNumber.POLYGLOT_QUESTION, lazyHandler)
+
+        # FastAPI 가 이 노드를 골라 token stream 연결로 보내는 명령도 같은 handler 로 처리
+        StreamCommandExecutor.getInstance().registerHandler(
+            UserDefinedProtocolNumber.POLYGLOT_QUESTION, PolyglotQuestionRequest, lazyHandler)
 
     @staticmethod
     def registerPolyglotScoreProtocol():
         customProtocolService = CustomProtocolServiceImpl.getInstance()
-        polyglotScoreService = PolyglotScoreServiceImpl.getInstance()
 
         requestClassMapInstance = RequestClassMap.getInstance()
         requestClassMapInstance.addRequestClass(
@@ -60,15 +259,16 @@ class UserDefinedProtocolRegister:
             PolyglotScoreResponse
         )
 
-        customProtocolService.registerCustomProtocol(
-            UserDefinedProtocolNumber.POLYGLOT_SCORE,
-            polyglotScoreService.scoreUserAnswer
-        )
+        lazyHandler = UserDefinedProtocolRegister.createLazyHandler(
+            UserDefinedProtocolRegister.loadPolyglotScoreService, "scoreUserAnswer", UserDefinedProtocolNumber.POLYGLOT_SCORE)
+        customProtocolService.registerCustomProtocol(UserDefinedProtocolNumber.POLYGLOT_SCORE, lazyHandler)
+
+        StreamCommandExecutor.getInstance().registerHandler(
+            UserDefinedProtocolNumber.POLYGLOT_SCORE, PolyglotScoreRequest, lazyHandler)
 
     @staticmethod
     def registerReportMakingProtocol():
         customProtocolService = CustomProtocolServiceImpl.getInstance()
-        reportService = MakingReportServiceImpl.getInstance()
 
         requestClassMapInstance = RequestClassMap.getInstance()
         requestClassMapInstance.addRequestClass(
@@ -82,15 +282,16 @@ class UserDefinedProtocolRegister:
             MakingReportResponse
         )
 
-        customProtocolService.registerCustomProtocol(
-            UserDefinedProtocolNumber.REPORT_MAKING,
-            reportService.makingReport
-        )
+        lazyHandler = UserDefinedProtocolRegister.createLazyHandler(
+            UserDefinedProtocolRegister.loadMakingReportService, "makingReport", UserDefinedProtocolNumber.REPORT_MAKING)
+        customProtocolService.registerCustomProtocol(UserDefinedProtocolNumber.REPORT_MAKING, lazyHandler)
+
+        StreamCommandExecutor.getInstance().registerHandler(
+            UserDefinedProtocolNumber.REPORT_MAKING, MakingReportRequest, lazyHandler)
 
     @staticmethod
     def registerReportUpdatingProtocol():
         customProtocolService = CustomProtocolServiceImpl.getInstance()
-        reportService = MakingReportServiceImpl.getInstance()
 
         requestClassMapInstance = RequestClassMap.getInstance()
         requestClassMapInstance.addRequestClass(
@@ -106,13 +307,63 @@ class UserDefinedProtocolRegister:
 
         customProtocolService.registerCustomProtocol(
             UserDefinedProtocolNumber.REPORT_UPDATING,
-            reportService.makingReport
+            UserDefinedProtocolRegister.createLazyHandler(
+                UserDefinedProtocolRegister.loadMakingReportService, "makingReport", UserDefinedProtocolNumber.REPORT_UPDATING)
         )
 
 
 
     @staticmethod
     def registerUserDefinedProtocol():
-        UserDefinedProtocolRegister.registerPolyglotQuestionProtocol()
-        UserDefinedProtocolRegister.registerPolyglotScoreProtocol()
-        UserDefinedProtocolRegister.registerReportMakingProtocol()
+        registerFunctionDict = {
+            UserDefinedProtocolNumber.POLYGLOT_QUESTION: UserDefinedProtocolRegister.registerPolyglotQuestionProtocol,
+            UserDefinedProtocolNumber.POLYGLOT_SCORE: UserDefinedProtocolRegister.registerPolyglotScoreProtocol,
+            UserDefinedProtocolNumber.REPORT_MAKING: UserDefinedProtocolRegister.registerReportMakingProtocol,
+        }
+
+        for protocolNumber in UserDefinedProtocolRegister.ENABLED_PROTOCOL_LIST:
+            registerFunctionDict[protocolNumber]()
+
+        ColorPrinter.print_important_data("enabled protocol list",
+                                          [f"{protocolNumber.name}({UserDefinedProtocolRegister.getExecutionMode(protocolNumber)})"
+                                           for protocolNumber in UserDefinedProtocolRegister.ENABLED_PROTOCOL_LIST])
+
+    @staticmethod
+    def isPolyglotProtocolEnabled():
+        return any(protocolNumber in UserDefinedProtocolRegister.ENABLED_PROTOCOL_LIST
+                   for protocolNumber in UserDefinedProtocolRegister.POLYGLOT_PROTOCOL_LIST)
+
+    @staticmethod
+    def warmupUserDefinedProtocol():
+        # 로컬 모델을 쓰는 protocol 은 첫 사용자 요청이 lazy 초기화 비용을 치르지 않도록 기동 시 한 번씩 생성해 봄
+        # (REPORT_MAKING 은 외부 API 만 사용하므로 warmup 대상이 아님)
+        loadServiceDict = {
+            UserDefinedProtocolNumber.POLYGLOT_QUESTION: UserDefinedProtocolRegister.loadPolyglotQuestionService,
+            UserDefinedProtocolNumber.POLYGLOT_SCORE: UserDefinedProtocolRegister.loadPolyglotScoreService,
+        }
+
+        for protocolNumber, loadService in loadServiceDict.items():
+            if protocolNumber not in UserDefinedProtocolRegister.ENABLED_PROTOCOL_LIST:
+                continue
+
+            warmupStartTime = time.perf_counter()
+            asyncio.run(loadService().warmup())
+            ColorPrinter.print_important_data(f"{protocolNumber.name} warmup time",
+                                              round(time.perf_counter() - warmupStartTime, 3))
+
+    @staticmethod
+    def prepareUserDefinedProtocol():
+        # polyglot protocol 이 없는 노드는 모델 확인 / 적재 / warmup 을 모두 건너뜀
+        if not UserDefinedProtocolRegister.isPolyglotProtocolEnabled():
+            return
+
+        from polyglot_inference.service.polyglot_inference_service_impl import PolyglotInferenceServiceImpl
+        from polyglot_model.service.polyglot_model_service_impl import PolyglotModelServiceImpl
+
+        # 모델 파일 확인(없으면 base model 다운로드) → 적재 → protocol 별 warmup
+        PolyglotModelServiceImpl.getInstance().loadModel()
+        UserDefinedProtocolRegister.warmupUserDefinedProtocol()
+
+        # POLYGLOT_WORKER_COUNT 가 설정되면 모델을 올린 이 프로세스를 fork 해서 weight 를 공유하는 inference worker 를 띄움
+        # (socket / CommandExecutor thread 가 생기기 전에 fork 해야 자식에 불필요한 thread 상태가 복사되지 않음)
+        PolyglotInferenceServiceImpl.getInstance().startWorkerPool()
@@ -0,0 +1,25 @@
+from contextvars import ContextVar
+
+# 지금 처리 중인 protocol 요청의 requestId (handler 아래의 repository 가 스트리밍 조각에 붙이는 용도)
+currentRequestId = ContextVar("currentRequestId", default=None)
+
+
+class RequestId:
+    # FastAPI 가 요청마다 붙여 보낸 requestId 를 handler 인자 목록 안에서 일반 인자와 구분하기 위한 표시
+    def __init__(self, value):
+        self.value = value
+
+    @staticmethod
+    def setCurrent(value):
+        return currentRequestId.set(value)
+
+    @staticmethod
+    def resetCurrent(token):
+        currentRequestId.reset(token)
+
+    @staticmethod
+    def getCurrent():
+        return currentRequestId.get()
+
+    def __str__(self):
+        return f"RequestId({self.value})"
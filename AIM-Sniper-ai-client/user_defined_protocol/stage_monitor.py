@@ -0,0 +1,80 @@
+import contextlib
+import threading
+import time
+from contextvars import ContextVar
+
+# 지금 실행 중인 protocol handler 를 어느 단계의 worker 가 호출했는지 (template CommandExecutor thread 가 기본값)
+currentStage = ContextVar("currentStage", default="CommandExecutor")
+
+
+class StageMonitor:
+    __instance = None
+
+    def __new__(cls):
+        if cls.__instance is None:
+            cls.__instance = super().__new__(cls)
+            cls.__instance.__lock = threading.Lock()
+            cls.__instance.__windowStartTime = time.monotonic()
+
+            # 단계 이름 → 실행 중인 작업의 시작 시각 / 이번 구간에 끝난 작업의 처리 시간 합 / 끝난 작업 수
+            cls.__instance.__activeStartTimeDict = {}
+            cls.__instance.__busySecondsDict = {}
+            cls.__instance.__completedCountDict = {}
+
+        return cls.__instance
+
+    @classmethod
+    def getInstance(cls):
+        if cls.__instance is None:
+            cls.__instance = cls()
+
+        return cls.__instance
+
+    @staticmethod
+    def setCurrentStage(stageName):
+        return currentStage.set(stageName)
+
+    @staticmethod
+    def getCurrentStage():
+        return currentStage.get()
+
+    @contextlib.contextmanager
+    def track(self, stageName):
+        token = object()
+        with self.__lock:
+            self.__activeStartTimeDict.setdefault(stageName, {})[token] = time.monotonic()
+
+        try:
+            yield
+        finally:
+            with self.__lock:
+                startTime = self.__activeStartTimeDict[stageName].pop(token)
+                self.__busySecondsDict[stageName] = (self.__busySecondsDict.get(stageName, 0.0)
+                                                     + time.monotonic() - max(startTime, self.__windowStartTime))
+                self.__completedCountDict[stageName] = self.__completedCountDict.get(stageName, 0) + 1
+
+    def sample(self, capacityDict):
+        # 지난 sample 이후 단계별 사용률 = 작업이 실행된 시간 합 / (구간 길이 × 그 단계의 worker 수)
+        with self.__lock:
+            now = time.monotonic()
+            windowSeconds = max(now - self.__windowStartTime, 1e-6)
+
+            stageNameSet = set(capacityDict) | set(self.__activeStartTimeDict) | set(self.__busySecondsDict)
+            sampleDict = {}
+            for stageName in stageNameSet:
+                activeStartTimeDict = self.__activeStartTimeDict.get(stageName, {})
+                busySeconds = self.__busySecondsDict.get(stageName, 0.0) + sum(
+                    now - max(startTime, self.__windowStartTime) for startTime in activeStartTimeDict.values())
+                capacity = capacityDict.get(stageName)
+
+                sampleDict[stageName] = {
+                    "activeCount": len(activeStartTimeDict),
+                    "completedCount": self.__completedCountDict.get(stageName, 0),
+                    "utilization": round(busySeconds / (windowSeconds * capacity), 3) if capacity else None,
+                }
+
+            self.__windowStartTime = now
+            self.__busySecondsDict.clear()
+            self.__completedCountDict.clear()
+
+        return sampleDict
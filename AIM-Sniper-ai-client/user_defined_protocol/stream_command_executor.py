@@ -0,0 +1,70 @@
+import asyncio
+import threading
+
+from template.utility.color_print import ColorPrinter
+from token_stream.repository.token_stream_repository_impl import TokenStreamRepositoryImpl
+
+from user_defined_protocol.protocol import UserDefinedProtocolNumber
+from user_defined_protocol.stage_monitor import StageMonitor
+
+
+class StreamCommandExecutor:
+    __instance = None
+
+    def __new__(cls):
+        if cls.__instance is None:
+            cls.__instance = super().__new__(cls)
+            cls.__instance.__handlerDict = {}
+            cls.__instance.__loop = None
+            cls.__instance.__loopLock = threading.Lock()
+            cls.__instance.__tokenStreamRepository = TokenStreamRepositoryImpl.getInstance()
+
+        return cls.__instance
+
+    @classmethod
+    def getInstance(cls):
+        if cls.__instance is None:
+            cls.__instance = cls()
+
+        return cls.__instance
+
+    def registerHandler(self, protocolNumber, requestClass, handler):
+        # template 의 CustomProtocolService 에 등록하는 것과 같은 request class / handler 를 token stream 명령에도 사용
+        self.__handlerDict[protocolNumber] = (requestClass, handler)
+
+    def __getLoop(self):
+        # FastAPI 가 token stream 으로 보낸 명령은 template CommandExecutor 와 별도의 이벤트 루프 thread 에서 실행
+        with self.__loopLock:
+            if self.__loop is None:
+                self.__loop = asyncio.new_event_loop()
+                threading.Thread(target=self.__loop.run_forever, name="StreamCommandLoop", daemon=True).start()
+
+        return self.__loop
+
+    def execute(self, commandFrame):
+        # token stream 수신 thread 에서 호출되므로 실행은 이벤트 루프에 넘기고 바로 돌아감
+        asyncio.run_coroutine_threadsafe(self.__execute(commandFrame), self.__getLoop())
+
+    async def __execute(self, commandFrame):
+        requestId = commandFrame["requestId"]
+        command = commandFrame["command"]
+        StageMonitor.setCurrentStage("StreamCommand")
+
+        try:
+            requestClass, handler = self.__handlerDict[UserDefinedProtocolNumber(command)]
+
+            # template 과 같이 parameter 목록이 있는 request 는 펼쳐서, 없는 request 는 객체 그대로 handler 에 넘김
+            request = requestClass(data=commandFrame.get("data", []), requestId=requestId)
+            parameterList = request.getParameterList() if hasattr(request, "getParameterList") else (request,)
+            result = await handler(*parameterList)
+
+        except Exception as exception:
+            # 실패한 명령도 결과를 돌려보내서 FastAPI 가 시간 초과까지 기다리지 않게 함
+            ColorPrinter.print_important_data("stream command failed", f"{command}: {exception}")
+            result = {"requestId": requestId, "error": str(exception)}
+
+        # lazyHandler 가 이미 이 연결로 결과를 보낸 경우에는 표시만 돌아옴
+        if isinstance(result, dict) and result.get("resultOnStream"):
+            return
+
+        self.__tokenStreamRepository.sendResult(requestId, command, result, isRequired=True)
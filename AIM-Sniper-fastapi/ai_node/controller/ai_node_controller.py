@@ -0,0 +1,21 @@
+import os
+import sys
+
+from fastapi import APIRouter, Depends, status
+from fastapi.responses import JSONResponse
+
+from ai_node.service.ai_node_service_impl import AiNodeServiceImpl
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'template'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'template', 'include', 'socket_server'))
+
+
+aiNodeRouter = APIRouter()
+
+async def injectAiNodeService() -> AiNodeServiceImpl:
+    return AiNodeServiceImpl()
+
+@aiNodeRouter.get('/ai-node')
+async def getAiNodeList(aiNodeService: AiNodeServiceImpl = Depends(injectAiNodeService)):
+    # token stream 으로 연결된 AI client 노드별 처리 protocol / slot 수 / 부하 / 최근 명령 대기 현황
+    return JSONResponse(content=aiNodeService.getNodeStatusList(), status_code=status.HTTP_200_OK)
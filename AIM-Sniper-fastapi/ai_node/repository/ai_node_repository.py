@@ -0,0 +1,35 @@
+from abc import ABC, abstractmethod
+
+
+class AiNodeRepository(ABC):
+    @abstractmethod
+    def addNode(self, nodeId, protocolList, slotCount, frameSender):
+        pass
+
+    @abstractmethod
+    def removeNode(self, nodeId, frameSender):
+        pass
+
+    @abstractmethod
+    def updateNodeStatus(self, nodeId, status):
+        pass
+
+    @abstractmethod
+    def hasNode(self, command):
+        pass
+
+    @abstractmethod
+    def assignRequest(self, command, requestId):
+        pass
+
+    @abstractmethod
+    def completeRequest(self, requestId):
+        pass
+
+    @abstractmethod
+    def getRetryAfterSeconds(self, command):
+        pass
+
+    @abstractmethod
+    def getNodeStatusList(self):
+        pass
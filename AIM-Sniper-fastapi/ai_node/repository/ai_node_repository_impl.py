@@ -0,0 +1,134 @@
+import os
+import threading
+import time
+
+from dotenv import load_dotenv
+
+from ai_node.repository.ai_node_repository import AiNodeRepository
+
+load_dotenv()
+
+
+class AiNodeRepositoryImpl(AiNodeRepository):
+    __instance = None
+
+    # 노드가 보고한 명령 대기 현황이 이 시간보다 오래되면 (보고가 멈춘 것으로 보고) 부하 / 포화 판단에 쓰지 않음
+    STATUS_MAX_AGE_SECONDS = float(os.getenv("AI_CLIENT_STATUS_MAX_AGE_SECONDS", "5"))
+
+    def __new__(cls):
+        if cls.__instance is None:
+            cls.__instance = super().__new__(cls)
+            cls.__instance.__lock = threading.Lock()
+
+            # nodeId → 처리 protocol 목록 / slot 수 / 명령 전송 함수 / 최근 status / 이 FastAPI 가 보내고 결과를 기다리는 requestId
+            cls.__instance.__nodeDict = {}
+
+            # requestId → 명령을 보낸 nodeId
+            cls.__instance.__requestNodeDict = {}
+
+        return cls.__instance
+
+    @classmethod
+    def getInstance(cls):
+        if cls.__instance is None:
+            cls.__instance = cls()
+
+        return cls.__instance
+
+    def addNode(self, nodeId, protocolList, slotCount, frameSender):
+        with self.__lock:
+            self.__nodeDict[nodeId] = {
+                "protocolList": list(protocolList),
+                "slotCount": max(1, slotCount),
+                "frameSender": frameSender,
+                "status": None,
+                "statusTime": None,
+                "requestIdSet": set(),
+            }
+
+    def removeNode(self, nodeId, frameSender):
+        # 같은 노드가 다시 접속한 뒤에 이전 연결이 끊긴 경우에는 새 연결의 등록을 지우지 않음
+        with self.__lock:
+            node = self.__nodeDict.get(nodeId)
+            if node is None or node["frameSender"] is not frameSender:
+                return []
+
+            del self.__nodeDict[nodeId]
+            for requestId in node["requestIdSet"]:
+                self.__requestNodeDict.pop(requestId, None)
+
+        # 끊긴 노드에 보내 놓고 결과를 받지 못한 요청
+        return list(node["requestIdSet"])
+
+    def updateNodeStatus(self, nodeId, status):
+        with self.__lock:
+            node = self.__nodeDict.get(nodeId)
+            if node is not None:
+                node["status"] = status
+                node["statusTime"] = time.monotonic()
+
+    def __getFreshStatus(self, node):
+        if node["statusTime"] is None or time.monotonic() - node["statusTime"] > self.STATUS_MAX_AGE_SECONDS:
+            return None
+
+        return node["status"]
+
+    def __getLoad(self, node):
+        # 이 FastAPI 가 보낸 요청 수와 노드가 보고한 실행 / 대기 명령 수(다른 FastAPI 가 보낸 것 포함) 중 큰 값을
+        # slot 수로 나눠서, 코어가 많은 노드일수록 더 많은 명령을 받도록 함
+        status = self.__getFreshStatus(node) or {}
+        reportedCount = (status.get("runningCount", 0) + status.get("waitingInteractiveCount", 0)
+                         + status.get("waitingBatchCount", 0))
+
+        return max(len(node["requestIdSet"]), reportedCount) / node["slotCount"]
+
+    def __isSaturated(self, node, command):
+        status = self.__getFreshStatus(node)
+        return status is not None and command in status.get("saturatedProtocolList", [])
+
+    def hasNode(self, command):
+        with self.__lock:
+            return any(command in node["protocolList"] for node in self.__nodeDict.values())
+
+    def assignRequest(self, command, requestId):
+        # command 를 처리하는 노드 중 포화되지 않은 가장 한가한 노드를 골라 요청을 기록하고 명령 전송 함수를 돌려줌
+        with self.__lock:
+            candidateList = [(self.__getLoad(node), nodeId) for nodeId, node in self.__nodeDict.items()
+                             if command in node["protocolList"] and not self.__isSaturated(node, command)]
+            if not candidateList:
+                return None
+
+            _, nodeId = min(candidateList)
+            node = self.__nodeDict[nodeId]
+            node["requestIdSet"].add(requestId)
+            self.__requestNodeDict[requestId] = nodeId
+
+            return node["frameSender"]
+
+    def completeRequest(self, requestId):
+        with self.__lock:
+            nodeId = self.__requestNodeDict.pop(requestId, None)
+            node = self.__nodeDict.get(nodeId)
+            if node is not None:
+                node["requestIdSet"].discard(requestId)
+
+    def getRetryAfterSeconds(self, command):
+        # 모든 노드가 포화된 경우 가장 빨리 자리가 날 노드의 추정 대기 시간
+        with self.__lock:
+            retryAfterSecondsList = [
+                (self.__getFreshStatus(node) or {}).get("retryAfterSeconds", {}).get(str(command))
+                for node in self.__nodeDict.values() if command in node["protocolList"]]
+
+        return min((retryAfterSeconds for retryAfterSeconds in retryAfterSecondsList if retryAfterSeconds),
+                   default=None)
+
+    def getNodeStatusList(self):
+        with self.__lock:
+            return [{
+                "nodeId": nodeId,
+                "protocolList": node["protocolList"],
+                "slotCount": node["slotCount"],
+                "inFlightCount": len(node["requestIdSet"]),
+                "load": round(self.__getLoad(node), 3),
+                "status": self.__getFreshStatus(node),
+            } for nodeId, node in self.__nodeDict.items()]
@@ -0,0 +1,19 @@
+from abc import ABC, abstractmethod
+
+
+class AiNodeService(ABC):
+    @abstractmethod
+    def connectNode(self, nodeId, protocolList, slotCount, frameSender):
+        pass
+
+    @abstractmethod
+    def disconnectNode(self, nodeId, frameSender):
+        pass
+
+    @abstractmethod
+    def updateNodeStatus(self, nodeId, status):
+        pass
+
+    @abstractmethod
+    def getNodeStatusList(self):
+        pass
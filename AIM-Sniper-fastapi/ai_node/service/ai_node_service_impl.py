@@ -0,0 +1,48 @@
+import os
+import sys
+
+from ai_node.repository.ai_node_repository_impl import AiNodeRepositoryImpl
+from ai_node.service.ai_node_service import AiNodeService
+from ai_request.repository.ai_request_repository_impl import AiRequestRepositoryImpl
+from metrics.repository.metrics_repository_impl import MetricsRepositoryImpl
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'template'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'template', 'include', 'socket_server'))
+
+from template.include.socket_server.utility.color_print import ColorPrinter
+
+
+class AiNodeServiceImpl(AiNodeService):
+    # 끊긴 노드에 보냈던 요청은 다른 노드로 바로 다시 보내도록 짧은 Retry-After 로 돌려줌
+    DISCONNECTED_RETRY_AFTER_SECONDS = 1
+
+    def __init__(self):
+        self.__aiNodeRepository = AiNodeRepositoryImpl.getInstance()
+        self.__aiRequestRepository = AiRequestRepositoryImpl.getInstance()
+        self.__metricsRepository = MetricsRepositoryImpl.getInstance()
+
+    def connectNode(self, nodeId, protocolList, slotCount, frameSender):
+        self.__aiNodeRepository.addNode(nodeId, protocolList, slotCount, frameSender)
+        ColorPrinter.print_important_data("AI client node connected", f"{nodeId} {protocolList}")
+
+    def disconnectNode(self, nodeId, frameSender):
+        lostRequestIdList = self.__aiNodeRepository.removeNode(nodeId, frameSender)
+
+        # 같은 노드가 이미 다시 접속한 경우가 아니면 /metrics 에서 이 노드의 지표를 내림
+        if all(node["nodeId"] != nodeId for node in self.__aiNodeRepository.getNodeStatusList()):
+            self.__metricsRepository.removeNodeSnapshot(nodeId)
+        ColorPrinter.print_important_data("AI client node disconnected", f"{nodeId} (lost {len(lostRequestIdList)})")
+
+        # 결과를 받지 못한 요청은 시간 초과까지 기다리게 하지 않고 거절로 끝냄
+        for requestId in lostRequestIdList:
+            self.__aiRequestRepository.resolveRequest(requestId, {
+                "rejected": True,
+                "error": f"AI client {nodeId} 연결이 끊겼습니다",
+                "retryAfterSeconds": self.DISCONNECTED_RETRY_AFTER_SECONDS,
+            })
+
+    def updateNodeStatus(self, nodeId, status):
+        self.__aiNodeRepository.updateNodeStatus(nodeId, status)
+
+    def getNodeStatusList(self):
+        return self.__aiNodeRepository.getNodeStatusList()
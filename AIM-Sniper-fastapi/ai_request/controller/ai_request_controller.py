@@ -0,0 +1,49 @@
+import asyncio
+import os
+import sys
+
+from fastapi import APIRouter, Depends, status
+from fastapi.responses import JSONResponse
+
+from ai_request.exception.ai_request_rejected_exception import AiRequestRejectedException
+from ai_request.controller.request_form.ai_request_form import AiRequestForm
+from ai_request.service.ai_request_service_impl import AiRequestServiceImpl
+from user_defined_queue.repository.user_defined_queue_repository_impl import UserDefinedQueueRepositoryImpl
+from template.include.socket_server.utility.color_print import ColorPrinter
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'template'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'template', 'include', 'socket_server'))
+
+
+aiRequestRouter = APIRouter()
+
+async def injectAiRequestService() -> AiRequestServiceImpl:
+    return AiRequestServiceImpl(UserDefinedQueueRepositoryImpl.getInstance())
+
+@aiRequestRouter.post('/ai-request')
+async def requestAiResult(aiRequestForm: AiRequestForm,
+                          aiRequestService: AiRequestServiceImpl = Depends(injectAiRequestService)):
+
+    ColorPrinter.print_important_message("requestAiResult()")
+
+    # 명령 전송과 결과 수신을 한 요청 안에서 끝내므로 결과 polling 이 필요 없고, 다른 사용자의 결과를 받을 일도 없음
+    try:
+        aiResult = await aiRequestService.requestAiResult(aiRequestForm.command, aiRequestForm.data)
+
+    except asyncio.TimeoutError:
+        return JSONResponse(content={"message": "AI 결과를 기다리는 시간이 초과되었습니다"},
+                            status_code=status.HTTP_504_GATEWAY_TIMEOUT)
+
+    except AiRequestRejectedException as exception:
+        # 대기열이 가득 찬 경우 기다리게 하지 않고 바로 돌려보내서 클라이언트가 Retry-After 뒤에 다시 요청하게 함
+        return JSONResponse(content={"message": exception.reason,
+                                     "retryAfterSeconds": exception.retryAfterSeconds},
+                            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                            headers={"Retry-After": str(exception.retryAfterSeconds)})
+
+    return JSONResponse(content=aiResult, status_code=status.HTTP_200_OK)
+
+@aiRequestRouter.get('/ai-request/status')
+async def getAiRequestStatus(aiRequestService: AiRequestServiceImpl = Depends(injectAiRequestService)):
+    # command 별 결과 대기 요청 수 / 전송 queue 길이 / AI client 가 보고한 명령 대기 현황
+    return JSONResponse(content=aiRequestService.getStatus(), status_code=status.HTTP_200_OK)
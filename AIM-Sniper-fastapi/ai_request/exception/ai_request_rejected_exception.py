@@ -0,0 +1,6 @@
+class AiRequestRejectedException(Exception):
+    # 대기열이 가득 차서 AI client 에 보내지 않았거나 AI client 가 바로 거절한 요청 (controller 가 429 로 돌려줌)
+    def __init__(self, reason, retryAfterSeconds):
+        super().__init__(reason)
+        self.reason = reason
+        self.retryAfterSeconds = retryAfterSeconds
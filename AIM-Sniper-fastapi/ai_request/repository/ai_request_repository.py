@@ -0,0 +1,31 @@
+from abc import ABC, abstractmethod
+
+
+class AiRequestRepository(ABC):
+    @abstractmethod
+    def createRequestId(self):
+        pass
+
+    @abstractmethod
+    def registerRequest(self, requestId, command=None, maxInFlightCount=None):
+        pass
+
+    @abstractmethod
+    def cancelRequest(self, requestId):
+        pass
+
+    @abstractmethod
+    def sendCommand(self, userDefinedTransmitterChannel, requestId, command, data):
+        pass
+
+    @abstractmethod
+    def startDispatcher(self, userDefinedReceiverFastAPIChannel):
+        pass
+
+    @abstractmethod
+    def resolveRequest(self, requestId, result):
+        pass
+
+    @abstractmethod
+    def getInFlightCountDict(self):
+        pass
@@ -0,0 +1,107 @@
+import json
+import threading
+import uuid
+from concurrent.futures import Future
+
+from ai_request.repository.ai_request_repository import AiRequestRepository
+
+
+class AiRequestRepositoryImpl(AiRequestRepository):
+    __instance = None
+
+    def __new__(cls):
+        if cls.__instance is None:
+            cls.__instance = super().__new__(cls)
+            cls.__instance.__pendingFutureDict = {}
+            cls.__instance.__pendingLock = threading.Lock()
+            cls.__instance.__dispatcherThread = None
+
+            # 결과를 기다리는 중인 요청 수 (command 별)
+            cls.__instance.__inFlightCountDict = {}
+
+        return cls.__instance
+
+    @classmethod
+    def getInstance(cls):
+        if cls.__instance is None:
+            cls.__instance = cls()
+
+        return cls.__instance
+
+    def createRequestId(self):
+        return uuid.uuid4().hex
+
+    def registerRequest(self, requestId, command=None, maxInFlightCount=None):
+        # 같은 command 의 결과 대기 요청이 maxInFlightCount 개 이상이면 등록하지 않고 None 을 돌려줌
+        future = Future()
+        with self.__pendingLock:
+            inFlightCount = self.__inFlightCountDict.get(command, 0)
+            if maxInFlightCount is not None and inFlightCount >= maxInFlightCount:
+                return None
+
+            self.__inFlightCountDict[command] = inFlightCount + 1
+            self.__pendingFutureDict[requestId] = (future, command)
+
+        return future
+
+    def __popRequest(self, requestId):
+        with self.__pendingLock:
+            future, command = self.__pendingFutureDict.pop(requestId, (None, None))
+            if future is not None:
+                self.__inFlightCountDict[command] -= 1
+
+        return future
+
+    def cancelRequest(self, requestId):
+        # 시간 초과로 포기한 요청의 결과가 늦게 도착하면 기다리는 요청이 없으므로 버려짐
+        future = self.__popRequest(requestId)
+
+        if future is not None:
+            future.cancel()
+
+    def sendCommand(self, userDefinedTransmitterChannel, requestId, command, data):
+        # 전송 queue 가 가득 차 있으면 기다리지 않고 queue.Full 을 그대로 올려서 호출한 쪽이 거절하게 함
+        userDefinedTransmitterChannel.put_nowait({"command": command, "data": data, "requestId": requestId})
+
+    def startDispatcher(self, userDefinedReceiverFastAPIChannel):
+        if self.__dispatcherThread is not None and self.__dispatcherThread.is_alive():
+            return
+
+        self.__dispatcherThread = threading.Thread(target=self.__dispatch, args=(userDefinedReceiverFastAPIChannel,),
+                                                   name="AiResultDispatcher", daemon=True)
+        self.__dispatcherThread.start()
+
+    def __dispatch(self, userDefinedReceiverFastAPIChannel):
+        # socket receiver 가 넣어준 AI client 결과를 requestId 로 찾아서 해당 요청의 future 에만 전달
+        while True:
+            receivedResponseFromSocketClient = userDefinedReceiverFastAPIChannel.get()
+
+            try:
+                result = json.loads(receivedResponseFromSocketClient) \
+                    if isinstance(receivedResponseFromSocketClient, (str, bytes)) else receivedResponseFromSocketClient
+            except ValueError:
+                print(f"AiRequestRepositoryImpl 해석할 수 없는 결과를 버립니다: {receivedResponseFromSocketClient!r:.200}")
+                continue
+
+            # 모든 명령은 requestId 를 붙여 보내므로, requestId 가 없는 결과는 받을 요청이 없어서 버림
+            requestId = result.get("requestId") if isinstance(result, dict) else None
+            if requestId is None:
+                print(f"AiRequestRepositoryImpl requestId 가 없는 결과를 버립니다: {receivedResponseFromSocketClient!r:.200}")
+                continue
+
+            # 결과 본문을 token stream 연결로 보낸 경우 socket 으로는 표시만 오므로 그쪽 frame 을 기다림
+            if result.get("resultOnStream"):
+                continue
+
+            self.resolveRequest(requestId, result)
+
+    def resolveRequest(self, requestId, result):
+        future = self.__popRequest(requestId)
+
+        if future is not None and not future.done():
+            future.set_result(result)
+
+    def getInFlightCountDict(self):
+        with self.__pendingLock:
+            return {command: inFlightCount for command, inFlightCount in self.__inFlightCountDict.items()
+                    if command is not None}
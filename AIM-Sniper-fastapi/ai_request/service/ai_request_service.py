@@ -0,0 +1,19 @@
+from abc import ABC, abstractmethod
+
+
+class AiRequestService(ABC):
+    @abstractmethod
+    def startResultDispatcher(self):
+        pass
+
+    @abstractmethod
+    def createRequestId(self):
+        pass
+
+    @abstractmethod
+    def requestAiResult(self, command, data, requestId=None):
+        pass
+
+    @abstractmethod
+    def getStatus(self):
+        pass
@@ -0,0 +1,152 @@
+import asyncio
+import os
+import queue
+import sys
+import time
+
+from dotenv import load_dotenv
+
+from ai_node.repository.ai_node_repository_impl import AiNodeRepositoryImpl
+from ai_request.exception.ai_request_rejected_exception import AiRequestRejectedException
+from ai_request.repository.ai_request_repository_impl import AiRequestRepositoryImpl
+from ai_request.service.ai_request_service import AiRequestService
+from metrics.repository.metrics_repository_impl import MetricsRepositoryImpl
+from user_defined_queue.repository.user_defined_queue_repository_impl import UserDefinedQueueRepositoryImpl
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'template'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'template', 'include', 'socket_server'))
+
+from template.include.socket_server.utility.color_print import ColorPrinter
+
+load_dotenv()
+
+class AiRequestServiceImpl(AiRequestService):
+    # 질문 생성 / 면접 전체 채점이 CPU 에서 끝날 때까지 기다리는 최대 시간(초)
+    AI_REQUEST_TIMEOUT_SECONDS = float(os.getenv("AI_REQUEST_TIMEOUT_SECONDS", "300"))
+
+    # command 별로 동시에 결과를 기다릴 수 있는 최대 요청 수 ("command:개수" 목록, 없는 command 는 제한 없음)
+    # (보고서 생성은 몇 분씩 걸리고 AI client 도 하나씩만 받으므로 많이 쌓아둬 봐야 시간 초과만 늘어남)
+    MAX_IN_FLIGHT_DICT = {
+        int(command): int(maxInFlightCount)
+        for command, maxInFlightCount in (
+            commandLimit.split(":") for commandLimit
+            in os.getenv("AI_REQUEST_MAX_IN_FLIGHT", "7:64,8:32,50:2").split(",") if commandLimit.strip())
+    }
+
+    # 거절할 때 Retry-After 로 알려주는 기본 대기 시간(초) - AI client 가 추정한 값이 있으면 그 값을 사용
+    RETRY_AFTER_SECONDS = int(os.getenv("AI_REQUEST_RETRY_AFTER_SECONDS", "5"))
+
+    def __init__(self, userDefinedQueueRepository: UserDefinedQueueRepositoryImpl):
+        self.__aiRequestRepository = AiRequestRepositoryImpl.getInstance()
+        self.__aiNodeRepository = AiNodeRepositoryImpl.getInstance()
+        self.__metricsRepository = MetricsRepositoryImpl.getInstance()
+        self.__userDefinedQueueRepository = userDefinedQueueRepository
+
+    def startResultDispatcher(self):
+        userDefinedReceiverFastAPIChannel = self.__userDefinedQueueRepository.getUserDefinedSocketReceiverFastAPIChannel()
+        self.__aiRequestRepository.startDispatcher(userDefinedReceiverFastAPIChannel)
+
+    def createRequestId(self):
+        return self.__aiRequestRepository.createRequestId()
+
+    async def __sendCommand(self, requestId, command, data):
+        # 이 command 를 처리하는 AI client 노드가 token stream 으로 연결되어 있으면 그중 가장 한가한 노드로 보내고,
+        # 없으면 기존처럼 template socket 에 연결된 AI client 로 보냄
+        frameSender = self.__aiNodeRepository.assignRequest(command, requestId)
+        if frameSender is not None:
+            await frameSender({"type": "command", "requestId": requestId, "command": command, "data": data})
+            return
+
+        if self.__aiNodeRepository.hasNode(command):
+            raise AiRequestRejectedException(f"command {command} 를 처리하는 모든 AI client 의 대기열이 가득 찼습니다",
+                                             self.__aiNodeRepository.getRetryAfterSeconds(command)
+                                             or self.RETRY_AFTER_SECONDS)
+
+        userDefinedTransmitterChannel = self.__userDefinedQueueRepository.getUserDefinedFastAPISocketTransmitterChannel()
+        try:
+            self.__aiRequestRepository.sendCommand(userDefinedTransmitterChannel, requestId, command, data)
+        except queue.Full:
+            raise AiRequestRejectedException("AI client 전송 대기열이 가득 찼습니다", self.RETRY_AFTER_SECONDS)
+
+    async def requestAiResult(self, command, data, requestId=None):
+        # 스트리밍 조각을 먼저 구독해야 하는 경우에는 호출한 쪽이 requestId 를 미리 만들어서 넘김
+        # (future 를 먼저 등록한 뒤 전송해야 결과가 아주 빨리 돌아와도 놓치지 않음)
+        requestId = requestId or self.__aiRequestRepository.createRequestId()
+        requestStartTime = time.perf_counter()
+        future = self.__aiRequestRepository.registerRequest(requestId, command, self.MAX_IN_FLIGHT_DICT.get(command))
+        if future is None:
+            self.__observeRequest(command, "rejected", requestStartTime)
+            raise AiRequestRejectedException(f"command {command} 의 결과 대기 요청이 가득 찼습니다",
+                                             self.RETRY_AFTER_SECONDS)
+
+        outcome = "error"
+        try:
+            await self.__sendCommand(requestId, command, data)
+            sendSeconds = time.perf_counter() - requestStartTime
+            ColorPrinter.print_important_data("requestAiResult() requestId", requestId)
+
+            aiResult = await asyncio.wait_for(asyncio.wrap_future(future), self.AI_REQUEST_TIMEOUT_SECONDS)
+            outcome = "ok"
+
+        except (AiRequestRejectedException, asyncio.TimeoutError, asyncio.CancelledError) as exception:
+            outcome = {AiRequestRejectedException: "rejected", asyncio.TimeoutError: "timeout",
+                       asyncio.CancelledError: "cancelled"}.get(type(exception), "error")
+            raise
+
+        finally:
+            self.__aiNodeRepository.completeRequest(requestId)
+            if outcome != "ok":
+                # 거절 / 시간 초과 / 연결 종료 / 전송 실패 등 어떤 이유로든 결과를 받지 못한 요청은 등록을 지워서
+                # future 와 대기 요청 수가 남지 않도록 함
+                self.__aiRequestRepository.cancelRequest(requestId)
+                self.__observeRequest(command, outcome, requestStartTime)
+
+        # AI client 의 명령 scheduler 가 대기열이 가득 차서 실행하지 않고 돌려보낸 요청
+        if isinstance(aiResult, dict) and aiResult.get("rejected"):
+            self.__observeRequest(command, "rejected", requestStartTime)
+            raise AiRequestRejectedException(aiResult.get("error", "AI client 가 요청을 거절했습니다"),
+                                             aiResult.get("retryAfterSeconds") or self.RETRY_AFTER_SECONDS)
+
+        stageTiming = aiResult.pop("stageTiming", None) if isinstance(aiResult, dict) else None
+        self.__observeStage(command, sendSeconds, self.__observeRequest(command, "ok", requestStartTime), stageTiming)
+
+        return aiResult
+
+    def __observeRequest(self, command, outcome, requestStartTime):
+        requestSeconds = time.perf_counter() - requestStartTime
+        self.__metricsRepository.observe("ai_request_seconds", {"command": command, "outcome": outcome},
+                                         requestSeconds)
+
+        return requestSeconds
+
+    def __observeStage(self, command, sendSeconds, requestSeconds, stageTiming):
+        # AI client 가 결과에 붙여 보낸 slot 대기 / 실행 시간을 빼고 남은 시간은 전송 / 수신 / 명령 분석 단계에서 보낸 시간
+        stageSecondsDict = {"fastapi_send": sendSeconds}
+        if stageTiming:
+            queueSeconds = stageTiming.get("queueSeconds", 0.0)
+            executeSeconds = stageTiming.get("executeSeconds", 0.0)
+            stageSecondsDict.update({
+                "ai_client_queue": queueSeconds,
+                "ai_client_execute": executeSeconds,
+                "transport": max(0.0, requestSeconds - sendSeconds - queueSeconds - executeSeconds),
+            })
+
+        for stage, seconds in stageSecondsDict.items():
+            self.__metricsRepository.observe("ai_request_stage_seconds", {"command": command, "stage": stage}, seconds)
+
+    def getStatus(self):
+        userDefinedTransmitterChannel = self.__userDefinedQueueRepository.getUserDefinedFastAPISocketTransmitterChannel()
+
+        # multiprocessing.Queue.qsize() 는 macOS 에서 NotImplementedError 를 냄
+        try:
+            transmitterQueueSize = userDefinedTransmitterChannel.qsize()
+        except (NotImplementedError, AttributeError):
+            transmitterQueueSize = None
+
+        return {
+            "inFlightCount": self.__aiRequestRepository.getInFlightCountDict(),
+            "maxInFlightCount": self.MAX_IN_FLIGHT_DICT,
+            "transmitterQueueSize": transmitterQueueSize,
+            "transmitterQueueMaxSize": self.__userDefinedQueueRepository.TRANSMITTER_QUEUE_MAX_SIZE,
+            "aiNodeList": self.__aiNodeRepository.getNodeStatusList(),
+        }
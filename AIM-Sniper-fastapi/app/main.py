@@ -1,18 +1,24 @@
 import os.path
 import sys
+import time
 from fastapi.middleware.cors import CORSMiddleware
 
 import colorama
 
 import uvicorn
 from dotenv import load_dotenv
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 
-from openai_api.controller.openai_api_controller import openaiApiRouter
-from polyglot_temp.controller.polyglot_controller import polyglotRouter
+from ai_node.controller.ai_node_controller import aiNodeRouter
+from ai_request.controller.ai_request_controller import aiRequestRouter
+from ai_request.service.ai_request_service_impl import AiRequestServiceImpl
+from interview_session.controller.interview_session_controller import interviewSessionRouter
+from metrics.controller.metrics_controller import metricsRouter
+from metrics.service.metrics_service_impl import MetricsServiceImpl
 from report_to_db.controller.report_to_db_controller import reportToDbRouter
-from test.controller.test_controller import testRouter
+from token_stream.service.token_stream_service_impl import TokenStreamServiceImpl
 from user_defined_initializer.init import UserDefinedInitializer
+from user_defined_queue.repository.user_defined_queue_repository_impl import UserDefinedQueueRepositoryImpl
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'template'))
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'template', 'include', 'socket_server'))
@@ -44,10 +50,31 @@ app.add_middleware(
 app.include_router(deepLearningRouter)
 app.include_router(diceResultRouter)
 
-app.include_router(openaiApiRouter)
-app.include_router(testRouter)
-app.include_router(polyglotRouter)
 app.include_router(reportToDbRouter)
+app.include_router(aiRequestRouter)
+app.include_router(interviewSessionRouter)
+app.include_router(aiNodeRouter)
+app.include_router(metricsRouter)
+
+@app.middleware("http")
+async def observeHttpRequest(request: Request, callNext):
+    requestStartTime = time.perf_counter()
+    response = await callNext(request)
+
+    # path parameter 가 들어간 경로가 series 를 늘리지 않도록 매칭된 route 의 경로 형식으로 기록
+    route = request.scope.get("route")
+    MetricsServiceImpl().observeHttpRequest(request.method, getattr(route, "path", "unmatched"),
+                                            response.status_code, time.perf_counter() - requestStartTime)
+
+    return response
+
+@app.on_event("startup")
+async def startAiResultDelivery():
+    # socket receiver 가 넣어주는 AI client 결과를 requestId 별로 나눠주는 dispatcher 시작
+    AiRequestServiceImpl(UserDefinedQueueRepositoryImpl.getInstance()).startResultDispatcher()
+
+    # AI client 가 질문 / feedback 을 생성하는 도중의 조각을 보내오는 스트리밍 수신 서버 시작
+    await TokenStreamServiceImpl().startStreamServer()
 
 if __name__ == "__main__":
     colorama.init(autoreset=True)
@@ -0,0 +1,54 @@
+import asyncio
+import json
+import os
+import sys
+
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+
+from interview_session.service.interview_session_service_impl import InterviewSessionServiceImpl
+from user_defined_queue.repository.user_defined_queue_repository_impl import UserDefinedQueueRepositoryImpl
+from template.include.socket_server.utility.color_print import ColorPrinter
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'template'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'template', 'include', 'socket_server'))
+
+
+interviewSessionRouter = APIRouter()
+
+@interviewSessionRouter.websocket('/ws/interview-session/{sessionId}')
+async def subscribeInterviewSession(websocket: WebSocket, sessionId: str):
+    interviewSessionService = InterviewSessionServiceImpl(UserDefinedQueueRepositoryImpl.getInstance())
+
+    await websocket.accept()
+    interviewSessionService.subscribe(sessionId, websocket)
+    ColorPrinter.print_important_data("subscribeInterviewSession()", sessionId)
+
+    # 면접 한 번에 연결 하나: 클라이언트는 {"command", "data", "messageId"} 를 보내고,
+    # 서버는 AI client 결과가 도착하는 대로 {"messageId", "command", "result"} 를 push 함
+    pendingTaskSet = set()
+    try:
+        while True:
+            requestMessage = None
+            try:
+                requestMessage = await websocket.receive_json()
+                command = int(requestMessage["command"])
+
+            # 잘못된 메시지 하나 때문에 세션 연결을 끊지 않고, 보낸 클라이언트에게만 오류를 알린 뒤 다음 메시지를 받음
+            except (json.JSONDecodeError, KeyError, TypeError, ValueError) as exception:
+                messageId = requestMessage.get("messageId") if isinstance(requestMessage, dict) else None
+                await websocket.send_json({"messageId": messageId, "command": None,
+                                           "error": f"잘못된 요청 메시지입니다: {exception!r}"})
+                continue
+
+            pendingTask = asyncio.create_task(interviewSessionService.requestAndPush(
+                sessionId, command, requestMessage.get("data", []), requestMessage.get("messageId")))
+            pendingTaskSet.add(pendingTask)
+            pendingTask.add_done_callback(pendingTaskSet.discard)
+
+    except WebSocketDisconnect:
+        ColorPrinter.print_important_data("interview session disconnected", sessionId)
+
+    finally:
+        interviewSessionService.unsubscribe(sessionId, websocket)
+        for pendingTask in pendingTaskSet:
+            pendingTask.cancel()
@@ -0,0 +1,19 @@
+from abc import ABC, abstractmethod
+
+
+class InterviewSessionRepository(ABC):
+    @abstractmethod
+    def addSubscriber(self, sessionId, websocket):
+        pass
+
+    @abstractmethod
+    def removeSubscriber(self, sessionId, websocket):
+        pass
+
+    @abstractmethod
+    def pushToSession(self, sessionId, message):
+        pass
+
+    @abstractmethod
+    def getSubscriberCount(self):
+        pass
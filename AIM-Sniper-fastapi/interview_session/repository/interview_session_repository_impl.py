@@ -0,0 +1,48 @@
+import asyncio
+
+from interview_session.repository.interview_session_repository import InterviewSessionRepository
+
+
+class InterviewSessionRepositoryImpl(InterviewSessionRepository):
+    __instance = None
+
+    def __new__(cls):
+        if cls.__instance is None:
+            cls.__instance = super().__new__(cls)
+
+            # 면접 세션 id → 그 세션을 구독 중인 websocket 과 전송 lock
+            # (같은 세션을 여러 탭에서 열어도 모두 결과를 받음)
+            cls.__instance.__subscriberDict = {}
+
+        return cls.__instance
+
+    @classmethod
+    def getInstance(cls):
+        if cls.__instance is None:
+            cls.__instance = cls()
+
+        return cls.__instance
+
+    def addSubscriber(self, sessionId, websocket):
+        self.__subscriberDict.setdefault(sessionId, {})[websocket] = asyncio.Lock()
+
+    def removeSubscriber(self, sessionId, websocket):
+        subscriberLockDict = self.__subscriberDict.get(sessionId)
+        if subscriberLockDict is None:
+            return
+
+        subscriberLockDict.pop(websocket, None)
+        if not subscriberLockDict:
+            del self.__subscriberDict[sessionId]
+
+    async def pushToSession(self, sessionId, message):
+        for websocket, sendLock in list(self.__subscriberDict.get(sessionId, {}).items()):
+            # 한 세션의 여러 요청 결과가 동시에 도착해도 websocket 에는 한 번에 하나씩 씀
+            async with sendLock:
+                try:
+                    await websocket.send_json(message)
+                except Exception:
+                    self.removeSubscriber(sessionId, websocket)
+
+    def getSubscriberCount(self):
+        return sum(len(subscriberLockDict) for subscriberLockDict in self.__subscriberDict.values())
@@ -0,0 +1,15 @@
+from abc import ABC, abstractmethod
+
+
+class InterviewSessionService(ABC):
+    @abstractmethod
+    def subscribe(self, sessionId, websocket):
+        pass
+
+    @abstractmethod
+    def unsubscribe(self, sessionId, websocket):
+        pass
+
+    @abstractmethod
+    def requestAndPush(self, sessionId, command, data, messageId):
+        pass
@@ -0,0 +1,86 @@
+import asyncio
+import os
+import sys
+
+from ai_request.exception.ai_request_rejected_exception import AiRequestRejectedException
+from ai_request.service.ai_request_service_impl import AiRequestServiceImpl
+from interview_session.repository.interview_session_repository_impl import InterviewSessionRepositoryImpl
+from interview_session.service.interview_session_service import InterviewSessionService
+from token_stream.service.token_stream_service_impl import TokenStreamServiceImpl
+from user_defined_queue.repository.user_defined_queue_repository_impl import UserDefinedQueueRepositoryImpl
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'template'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'template', 'include', 'socket_server'))
+
+from template.include.socket_server.utility.color_print import ColorPrinter
+
+class InterviewSessionServiceImpl(InterviewSessionService):
+    def __init__(self, userDefinedQueueRepository: UserDefinedQueueRepositoryImpl):
+        self.__interviewSessionRepository = InterviewSessionRepositoryImpl.getInstance()
+        self.__aiRequestService = AiRequestServiceImpl(userDefinedQueueRepository)
+        self.__tokenStreamService = TokenStreamServiceImpl()
+
+    def subscribe(self, sessionId, websocket):
+        self.__interviewSessionRepository.addSubscriber(sessionId, websocket)
+        ColorPrinter.print_important_data("interview session subscriber count",
+                                          self.__interviewSessionRepository.getSubscriberCount())
+
+    def unsubscribe(self, sessionId, websocket):
+        self.__interviewSessionRepository.removeSubscriber(sessionId, websocket)
+
+    async def __relayChunk(self, sessionId, messageId, command, chunkQueue):
+        # None 은 최종 결과가 도착했다는 표시 - 그 앞에 쌓인 조각을 모두 보낸 뒤에 끝남
+        while True:
+            frame = await chunkQueue.get()
+            if frame is None:
+                return
+
+            await self.__pushChunk(sessionId, messageId, command, frame)
+
+    async def __pushChunk(self, sessionId, messageId, command, frame):
+        # 생성 조각은 {"messageId", "command", "index", "chunk"} 로, 조각의 마지막에는 "done" 과 최종 "text" 를 함께 보냄
+        chunkMessage = {"messageId": messageId, "command": command, "index": frame.get("index", 0),
+                        "chunk": frame.get("chunk", "")}
+        if frame.get("done"):
+            chunkMessage.update(done=True, reset=frame.get("reset", False), text=frame.get("text", ""))
+
+        await self.__interviewSessionRepository.pushToSession(sessionId, chunkMessage)
+
+    async def requestAndPush(self, sessionId, command, data, messageId):
+        # 결과가 socket 으로 도착하는 즉시 세션 구독자에게 보내므로 클라이언트는 polling 하지 않아도 됨
+        message = {"messageId": messageId, "command": command}
+
+        # 질문 / feedback 생성 조각은 최종 결과보다 먼저 도착하는 대로 바로 전달
+        requestId = self.__aiRequestService.createRequestId()
+        chunkQueue = self.__tokenStreamService.subscribe(requestId)
+        relayTask = asyncio.create_task(self.__relayChunk(sessionId, messageId, command, chunkQueue))
+
+        try:
+            message["result"] = await self.__aiRequestService.requestAiResult(command, data, requestId)
+
+        except asyncio.TimeoutError:
+            message["error"] = "AI 결과를 기다리는 시간이 초과되었습니다"
+
+        except AiRequestRejectedException as exception:
+            message["error"] = exception.reason
+            message["retryAfterSeconds"] = exception.retryAfterSeconds
+
+        except asyncio.CancelledError:
+            # 세션 연결이 끊겨서 취소된 경우에는 보낼 곳이 없으므로 조각 전달도 그만둠
+            relayTask.cancel()
+            raise
+
+        except Exception as exception:
+            # 전송 실패 등 예상하지 못한 오류도 세션에 알려야 클라이언트가 결과를 끝없이 기다리지 않음
+            ColorPrinter.print_important_data("requestAndPush() failed", f"{requestId} {exception!r}")
+            message["error"] = f"AI 결과를 받지 못했습니다: {exception!r}"
+
+        finally:
+            self.__tokenStreamService.unsubscribe(requestId)
+
+        # 조각과 최종 결과는 서로 다른 연결로 오므로, relay 가 이미 꺼낸 조각을 포함해 도착한 조각을 모두 보낸 뒤
+        # 최종 결과를 보냄 (구독을 끊었으므로 이후에는 조각이 더 쌓이지 않음)
+        chunkQueue.put_nowait(None)
+        await relayTask
+
+        await self.__interviewSessionRepository.pushToSession(sessionId, message)
@@ -0,0 +1,301 @@
+import argparse
+import asyncio
+import functools
+import json
+import os
+import secrets
+import socket
+import sys
+import threading
+import time
+
+import httpx
+import uvicorn
+import websockets
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'template'))
+sys.path.append(os.path.join(os.path.dirname(__file__), 'template', 'include', 'socket_server'))
+
+from stub_ai_client import StubAiClient, findSessionTag, parseLatencyDict
+
+SAMPLE_ANSWER = "저는 팀 프로젝트에서 백엔드 API 설계와 구현을 맡았고, 팀원들과 매일 진행 상황을 공유했습니다."
+SAMPLE_INTENT = "협업 능력"
+FIRST_QUESTION = "자기소개를 해 주세요."
+
+
+def percentile(valueList, percent):
+    if not valueList:
+        return None
+
+    sortedValueList = sorted(valueList)
+    index = min(len(sortedValueList) - 1, int(round(percent / 100 * (len(sortedValueList) - 1))))
+
+    return round(sortedValueList[index] * 1000, 1)
+
+def findFreePort(host):
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as portSocket:
+        portSocket.bind((host, 0))
+        return portSocket.getsockname()[1]
+
+def startFastApiServer(host, port, streamPort):
+    # TokenStreamServiceImpl 은 import 할 때 포트를 읽으므로 app.main 을 import 하기 전에 환경 변수를 정함
+    if streamPort is not None:
+        os.environ["AI_STREAM_HOST"] = host
+        os.environ["AI_STREAM_PORT"] = str(streamPort)
+        os.environ.setdefault("AI_STREAM_SECRET", secrets.token_hex(16))
+
+    from app.main import app
+
+    # template socket server(TaskManager)는 띄우지 않음 - 명령은 stub AI client 가 받음
+    server = uvicorn.Server(uvicorn.Config(app, host=host, port=port, log_level="warning"))
+    threading.Thread(target=server.run, name="LoadTestFastAPI", daemon=True).start()
+
+    startTime = time.monotonic()
+    while not server.started:
+        if time.monotonic() - startTime > 30:
+            raise RuntimeError("FastAPI 서버가 30 초 안에 시작되지 않았습니다")
+        time.sleep(0.1)
+
+    return server
+
+def startStubAiClient(args, streamPort):
+    latencyDict = parseLatencyDict(args.latency)
+
+    if args.transport == "channel":
+        from user_defined_queue.repository.user_defined_queue_repository_impl import UserDefinedQueueRepositoryImpl
+
+        userDefinedQueueRepository = UserDefinedQueueRepositoryImpl.getInstance()
+        stubAiClient = StubAiClient(latencyDict, args.jitter, args.slot_count * args.node_count)
+        stubAiClient.startChannelWorker(userDefinedQueueRepository.getUserDefinedFastAPISocketTransmitterChannel(),
+                                        userDefinedQueueRepository.getUserDefinedSocketReceiverFastAPIChannel())
+        return [stubAiClient]
+
+    stubAiClientList = [StubAiClient(latencyDict, args.jitter, args.slot_count, f"stub-node-{nodeIndex}")
+                        for nodeIndex in range(args.node_count)]
+
+    async def runStreamNodeList():
+        await asyncio.gather(*[stubAiClient.runStreamNode(args.host, streamPort, os.environ["AI_STREAM_SECRET"])
+                               for stubAiClient in stubAiClientList])
+
+    threading.Thread(target=asyncio.run, args=(runStreamNodeList(),), name="StubAiClientNode", daemon=True).start()
+    return stubAiClientList
+
+async def waitForNode(client, nodeCount):
+    for _ in range(100):
+        if len((await client.get("/ai-node")).json()) >= nodeCount:
+            return
+        await asyncio.sleep(0.1)
+
+    raise RuntimeError("stub AI client 노드가 FastAPI 에 접속하지 못했습니다")
+
+
+class InterviewLoadGenerator:
+    def __init__(self, client, args):
+        self.client = client
+        self.args = args
+
+        # 요청 하나마다 {"command", "outcome", "latency"} 를 남김 (outcome: ok / rejected / timeout / error)
+        self.recordList = []
+
+        # 결과를 받았는데 다른 세션에 보낸 명령의 결과였던 횟수 (requestId 로 전달되므로 0 이어야 함)
+        self.receivedCount = 0
+        self.misdeliveredCount = 0
+        self.completedSessionCount = 0
+
+    def __record(self, command, outcome, startTime, statusCode=None):
+        self.recordList.append({"command": command, "outcome": outcome, "latency": time.perf_counter() - startTime,
+                                "statusCode": statusCode})
+
+    def __checkSessionTag(self, result, sessionTag):
+        self.receivedCount += 1
+        if findSessionTag(result) == sessionTag:
+            return True
+
+        self.misdeliveredCount += 1
+        return False
+
+    async def __requestByAiRequest(self, command, data, sessionTag):
+        # 결과를 같은 HTTP 응답으로 돌려받는 방식 (/ai-request) - 429 는 과부하 거절로 셈
+        startTime = time.perf_counter()
+        try:
+            response = await self.client.post("/ai-request", json={"command": command, "data": data},
+                                              timeout=self.args.timeout)
+        except httpx.TimeoutException:
+            self.__record(command, "timeout", startTime)
+            return None
+
+        if response.status_code == 429:
+            self.__record(command, "rejected", startTime, 429)
+            return None
+
+        if response.status_code != 200:
+            self.__record(command, "timeout" if response.status_code == 504 else "error", startTime,
+                          response.status_code)
+            return None
+
+        result = response.json()
+        if sessionTag is not None and not self.__checkSessionTag(result, sessionTag):
+            self.__record(command, "error", startTime, response.status_code)
+            return None
+
+        self.__record(command, "ok", startTime, response.status_code)
+        return result
+
+    async def __receiveSessionResult(self, websocket, messageId):
+        # 생성 도중의 조각은 건너뛰고 이 메시지의 최종 결과(또는 오류)만 돌려줌
+        while True:
+            message = json.loads(await websocket.recv())
+            if message.get("messageId") == messageId and "chunk" not in message:
+                return message
+
+    async def __requestBySession(self, websocket, command, data, sessionTag):
+        # frontend 와 같은 방식 - 면접 세션 WebSocket 으로 명령을 보내고 push 되는 결과를 기다림
+        startTime = time.perf_counter()
+        messageId = sessionTag
+        await websocket.send(json.dumps({"messageId": messageId, "command": command, "data": data}, ensure_ascii=False))
+        try:
+            message = await asyncio.wait_for(self.__receiveSessionResult(websocket, messageId), self.args.timeout)
+        except asyncio.TimeoutError:
+            self.__record(command, "timeout", startTime)
+            return None
+
+        # 과부하로 거절된 경우에는 Retry-After 와 같은 값이 함께 옴
+        if "error" in message:
+            self.__record(command, "rejected" if "retryAfterSeconds" in message else "error", startTime)
+            return None
+
+        result = message["result"]
+        if not self.__checkSessionTag(result, sessionTag):
+            self.__record(command, "error", startTime)
+            return None
+
+        self.__record(command, "ok", startTime)
+        return result
+
+    async def runSession(self, sessionIndex):
+        await asyncio.sleep(self.args.ramp_up * sessionIndex / max(1, self.args.sessions))
+
+        if self.args.api == "request":
+            await self.__runInterview(sessionIndex, self.__requestByAiRequest)
+            return
+
+        sessionUrl = f"{str(self.client.base_url).replace('http', 'ws', 1).rstrip('/')}/ws/interview-session/" \
+                     f"load-test-{sessionIndex}"
+        try:
+            async with websockets.connect(sessionUrl) as websocket:
+                await self.__runInterview(sessionIndex, functools.partial(self.__requestBySession, websocket))
+        except (OSError, websockets.WebSocketException):
+            self.__record(7, "error", time.perf_counter())
+
+    async def __runInterview(self, sessionIndex, requestCommand):
+        # 면접 한 번 = 질문 생성(7) 을 questionCount 번 반복한 뒤 전체 답변 채점(8) 한 번
+        interviewList = []
+        question = FIRST_QUESTION
+        for turn in range(self.args.question_count):
+            sessionTag = f"{sessionIndex}-{turn}"
+            answer = f"[LT:{sessionTag}] {SAMPLE_ANSWER}"
+            result = await requestCommand(7, [answer, SAMPLE_INTENT], sessionTag)
+            if result is None:
+                return
+
+            interviewList.append([question, SAMPLE_ANSWER, SAMPLE_INTENT])
+            question = result["nextQuestion"]
+            await asyncio.sleep(self.args.think_time)
+
+        # 채점 요청에는 세션 표시가 한 번만 들어가도록 답변 하나에만 표시를 붙임
+        sessionTag = f"{sessionIndex}-score"
+        interviewList[0][1] = f"[LT:{sessionTag}] {interviewList[0][1]}"
+        if await requestCommand(8, interviewList, sessionTag) is not None:
+            self.completedSessionCount += 1
+
+    async def runReport(self):
+        # 면접 도중에 들어오는 무거운 batch 작업
+        await self.__requestByAiRequest(50, [], None)
+
+    def summarize(self, durationSeconds):
+        commandDict = {}
+        for command in sorted({record["command"] for record in self.recordList}):
+            commandRecordList = [record for record in self.recordList if record["command"] == command]
+            okLatencyList = [record["latency"] for record in commandRecordList if record["outcome"] == "ok"]
+            outcomeCountDict = {}
+            for record in commandRecordList:
+                outcomeCountDict[record["outcome"]] = outcomeCountDict.get(record["outcome"], 0) + 1
+
+            commandDict[str(command)] = {
+                "requestCount": len(commandRecordList),
+                "outcomeCount": outcomeCountDict,
+                "p50Ms": percentile(okLatencyList, 50),
+                "p95Ms": percentile(okLatencyList, 95),
+                "p99Ms": percentile(okLatencyList, 99),
+            }
+
+        requestCount = len(self.recordList)
+        okCount = sum(record["outcome"] == "ok" for record in self.recordList)
+        okLatencyList = [record["latency"] for record in self.recordList if record["outcome"] == "ok"]
+
+        return {
+            "transport": self.args.transport,
+            # channel 방식은 socket 과 AI client 의 수신 / 분석 / 실행 / 송신 경로를 거치지 않으므로 end-to-end 수치가 아님
+            "throughSocket": self.args.transport == "stream",
+            "api": self.args.api,
+            "sessionCount": self.args.sessions,
+            "completedSessionCount": self.completedSessionCount,
+            "durationSeconds": round(durationSeconds, 3),
+            "requestCount": requestCount,
+            "throughput": round(okCount / durationSeconds, 3),
+            "p50Ms": percentile(okLatencyList, 50),
+            "p95Ms": percentile(okLatencyList, 95),
+            "p99Ms": percentile(okLatencyList, 99),
+            "errorRate": round((requestCount - okCount) / requestCount, 4) if requestCount else None,
+            "misdeliveryRate": round(self.misdeliveredCount / self.receivedCount, 4) if self.receivedCount else None,
+            "commandDict": commandDict,
+        }
+
+async def runLoadTest(args, baseUrl, stubAiClientList):
+    limits = httpx.Limits(max_connections=args.sessions + args.report_count + 8)
+    async with httpx.AsyncClient(base_url=baseUrl, limits=limits, timeout=args.timeout) as client:
+        if args.transport == "stream":
+            await waitForNode(client, args.node_count)
+
+        loadGenerator = InterviewLoadGenerator(client, args)
+        startTime = time.perf_counter()
+        await asyncio.gather(*[loadGenerator.runSession(sessionIndex) for sessionIndex in range(args.sessions)],
+                             *[loadGenerator.runReport() for _ in range(args.report_count)])
+
+        summary = loadGenerator.summarize(time.perf_counter() - startTime)
+        summary["aiRequestStatus"] = (await client.get("/ai-request/status")).json()
+        summary["stubHandledCount"] = [stubAiClient.handledCountDict for stubAiClient in stubAiClientList]
+
+        return summary
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="stub AI client 로 FastAPI ↔ AI client 경로의 동시 면접 처리량 / 지연 시간 측정")
+    parser.add_argument("--sessions", type=int, default=20, help="동시에 진행하는 면접 세션 수")
+    parser.add_argument("--question-count", type=int, default=5, help="세션마다 요청하는 질문 생성 횟수")
+    parser.add_argument("--report-count", type=int, default=0, help="면접 도중에 함께 요청하는 보고서 생성 수")
+    parser.add_argument("--ramp-up", type=float, default=1.0, help="세션들이 시작되는 데 걸리는 시간(초)")
+    parser.add_argument("--think-time", type=float, default=0.0, help="질문을 받은 뒤 다음 답변까지의 시간(초)")
+    parser.add_argument("--api", choices=["session", "request"], default="session",
+                        help="session: frontend 처럼 면접 세션 WebSocket 으로 요청, request: /ai-request 로 요청")
+    parser.add_argument("--transport", choices=["stream", "channel"], default="stream",
+                        help="stream: stub 이 token stream 노드로 socket 접속해서 명령을 받음, "
+                             "channel: stub 이 FastAPI 송신 / 수신 channel 에 같은 프로세스 안에서 바로 붙음 "
+                             "(socket 을 거치지 않으므로 end-to-end 수치가 아님)")
+    parser.add_argument("--timeout", type=float, default=60.0, help="요청 하나의 결과를 기다리는 최대 시간(초)")
+    parser.add_argument("--latency", default="", help='stub 의 protocol 별 평균 지연 시간(초), 예: "7:0.5,8:2,50:10"')
+    parser.add_argument("--jitter", type=float, default=0.2)
+    parser.add_argument("--slot-count", type=int, default=4, help="stub 노드 하나가 동시에 처리하는 명령 수")
+    parser.add_argument("--node-count", type=int, default=1, help="stream 방식에서 접속하는 stub 노드 수")
+    parser.add_argument("--host", default="127.0.0.1")
+    args = parser.parse_args()
+
+    fastApiPort = findFreePort(args.host)
+    streamPort = findFreePort(args.host) if args.transport == "stream" else None
+    fastApiServer = startFastApiServer(args.host, fastApiPort, streamPort)
+    stubAiClientList = startStubAiClient(args, streamPort)
+
+    loadTestSummary = asyncio.run(runLoadTest(args, f"http://{args.host}:{fastApiPort}", stubAiClientList))
+    fastApiServer.should_exit = True
+
+    # 마지막 줄은 항상 한 줄짜리 JSON 으로 출력해서 다른 프로세스가 결과를 읽을 수 있도록 함
+    print(json.dumps(loadTestSummary, ensure_ascii=False))
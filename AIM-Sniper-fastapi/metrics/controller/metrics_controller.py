@@ -0,0 +1,22 @@
+import os
+import sys
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+
+from metrics.service.metrics_service_impl import MetricsServiceImpl
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'template'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'template', 'include', 'socket_server'))
+
+
+metricsRouter = APIRouter()
+
+async def injectMetricsService() -> MetricsServiceImpl:
+    return MetricsServiceImpl()
+
+@metricsRouter.get('/metrics')
+async def getMetrics(metricsService: MetricsServiceImpl = Depends(injectMetricsService)):
+    # FastAPI 단계 지표와 token stream 으로 연결된 AI client 노드별 지표를 Prometheus text 형식으로 함께 노출
+    return PlainTextResponse(content=metricsService.getMetricsText(),
+                             media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -0,0 +1,27 @@
+from abc import ABC, abstractmethod
+
+
+class MetricsRepository(ABC):
+    @abstractmethod
+    def increment(self, name, labelDict, amount=1):
+        pass
+
+    @abstractmethod
+    def setGauge(self, name, labelDict, value):
+        pass
+
+    @abstractmethod
+    def observe(self, name, labelDict, value):
+        pass
+
+    @abstractmethod
+    def updateNodeSnapshot(self, nodeId, snapshot):
+        pass
+
+    @abstractmethod
+    def removeNodeSnapshot(self, nodeId):
+        pass
+
+    @abstractmethod
+    def render(self, gaugeList=()):
+        pass
@@ -0,0 +1,183 @@
+import bisect
+import re
+import threading
+
+from metrics.repository.metrics_repository import MetricsRepository
+
+
+class MetricsRepositoryImpl(MetricsRepository):
+    __instance = None
+
+    # FastAPI 에서 잰 metric 과 AI client 노드가 보내온 metric 의 이름 앞에 붙이는 값
+    LOCAL_PREFIX = "aim_"
+    NODE_PREFIX = "aim_ai_client_"
+
+    # 처리 시간 histogram 의 기본 구간(초) - AI client 와 같은 구간을 써서 두 쪽 단계 시간을 나란히 비교할 수 있게 함
+    DEFAULT_BUCKET_LIST = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+    METRIC_HELP_DICT = {
+        "http_request_seconds": "HTTP 요청 처리 시간 (route 는 path parameter 를 치환하기 전의 경로)",
+        "ai_request_seconds": "AI 결과 요청 하나가 전송부터 결과 수신 / 거절 / 시간 초과까지 걸린 시간",
+        "ai_request_stage_seconds": "AI 결과 요청의 단계별 시간 (fastapi_send / ai_client_queue / ai_client_execute / "
+                                    "transport: 전체에서 나머지 단계를 뺀 전송 / 수신 / 분석 대기 시간)",
+        "ai_request_in_flight": "command 별 결과를 기다리는 요청 수",
+        "ai_request_max_in_flight": "command 별 결과를 기다릴 수 있는 최대 요청 수",
+        "ai_transmitter_queue_size": "template socket 으로 AI client 에 보낼 명령 대기열 길이",
+        "ai_node_in_flight": "AI client 노드별로 보내고 결과를 받지 못한 요청 수",
+        "ai_node_load": "AI client 노드별 부하 (실행 / 대기 중인 명령 수 / slot 수)",
+        "ai_node_slots": "AI client 노드별 동시 실행 slot 수",
+    }
+
+    def __new__(cls):
+        if cls.__instance is None:
+            cls.__instance = super().__new__(cls)
+            cls.__instance.__lock = threading.Lock()
+
+            # (이름, 정렬된 label 목록) → 값 (histogram 은 구간 / 구간별 개수 / 합 / 개수)
+            cls.__instance.__counterDict = {}
+            cls.__instance.__gaugeDict = {}
+            cls.__instance.__histogramDict = {}
+
+            # nodeId → AI client 가 token stream 으로 보내온 가장 최근의 누적 metric snapshot
+            cls.__instance.__nodeSnapshotDict = {}
+
+        return cls.__instance
+
+    @classmethod
+    def getInstance(cls):
+        if cls.__instance is None:
+            cls.__instance = cls()
+
+        return cls.__instance
+
+    @staticmethod
+    def __toKey(name, labelDict):
+        return name, tuple(sorted((str(key), str(value)) for key, value in labelDict.items()))
+
+    def increment(self, name, labelDict, amount=1):
+        key = self.__toKey(name, labelDict)
+        with self.__lock:
+            self.__counterDict[key] = self.__counterDict.get(key, 0) + amount
+
+    def setGauge(self, name, labelDict, value):
+        with self.__lock:
+            self.__gaugeDict[self.__toKey(name, labelDict)] = value
+
+    def observe(self, name, labelDict, value):
+        key = self.__toKey(name, labelDict)
+        with self.__lock:
+            histogram = self.__histogramDict.get(key)
+            if histogram is None:
+                histogram = {"countList": [0] * len(self.DEFAULT_BUCKET_LIST), "sum": 0.0, "count": 0}
+                self.__histogramDict[key] = histogram
+
+            bucketIndex = bisect.bisect_left(self.DEFAULT_BUCKET_LIST, value)
+            if bucketIndex < len(self.DEFAULT_BUCKET_LIST):
+                histogram["countList"][bucketIndex] += 1
+            histogram["sum"] += value
+            histogram["count"] += 1
+
+    def updateNodeSnapshot(self, nodeId, snapshot):
+        with self.__lock:
+            self.__nodeSnapshotDict[nodeId] = snapshot
+
+    def removeNodeSnapshot(self, nodeId):
+        with self.__lock:
+            self.__nodeSnapshotDict.pop(nodeId, None)
+
+    def __getLocalSnapshot(self, gaugeList):
+        # AI client 가 보내오는 snapshot 과 같은 형식으로 만들어서 출력은 한 경로로 처리
+        histogramList = []
+        for (name, labelList), histogram in self.__histogramDict.items():
+            cumulativeCountList = []
+            cumulativeCount = 0
+            for count in histogram["countList"]:
+                cumulativeCount += count
+                cumulativeCountList.append(cumulativeCount)
+
+            histogramList.append({"name": name, "labels": dict(labelList),
+                                  "bucketList": list(self.DEFAULT_BUCKET_LIST),
+                                  "bucketCountList": cumulativeCountList,
+                                  "sum": histogram["sum"], "count": histogram["count"]})
+
+        return {
+            "helpDict": self.METRIC_HELP_DICT,
+            "counterList": [{"name": name, "labels": dict(labelList), "value": value}
+                            for (name, labelList), value in self.__counterDict.items()],
+            "gaugeList": [{"name": name, "labels": labelDict, "value": value} for name, labelDict, value in gaugeList]
+                         + [{"name": name, "labels": dict(labelList), "value": value}
+                            for (name, labelList), value in self.__gaugeDict.items()],
+            "histogramList": histogramList,
+        }
+
+    @staticmethod
+    def __formatName(prefix, name):
+        return re.sub(r"[^a-zA-Z0-9_:]", "_", prefix + name)
+
+    @staticmethod
+    def __formatLabel(labelDict):
+        if not labelDict:
+            return ""
+
+        escapedLabelList = []
+        for key, value in labelDict.items():
+            escapedValue = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+            escapedLabelList.append(f'{re.sub(r"[^a-zA-Z0-9_]", "_", str(key))}="{escapedValue}"')
+
+        return "{" + ",".join(escapedLabelList) + "}"
+
+    @staticmethod
+    def __formatValue(value):
+        return repr(float(value))
+
+    def __addSnapshot(self, familyDict, snapshot, prefix, extraLabelDict):
+        helpDict = snapshot.get("helpDict", {})
+
+        def getFamily(name, metricType):
+            familyName = self.__formatName(prefix, name)
+            if familyName not in familyDict:
+                familyDict[familyName] = {"type": metricType, "help": helpDict.get(name, name), "lineList": []}
+
+            return familyName, familyDict[familyName]["lineList"]
+
+        for counter in snapshot.get("counterList", []):
+            familyName, lineList = getFamily(counter["name"], "counter")
+            lineList.append(f"{familyName}{self.__formatLabel({**counter['labels'], **extraLabelDict})} "
+                            f"{self.__formatValue(counter['value'])}")
+
+        for gauge in snapshot.get("gaugeList", []):
+            if gauge["value"] is None:
+                continue
+
+            familyName, lineList = getFamily(gauge["name"], "gauge")
+            lineList.append(f"{familyName}{self.__formatLabel({**gauge['labels'], **extraLabelDict})} "
+                            f"{self.__formatValue(gauge['value'])}")
+
+        for histogram in snapshot.get("histogramList", []):
+            familyName, lineList = getFamily(histogram["name"], "histogram")
+            labelDict = {**histogram["labels"], **extraLabelDict}
+            for bucket, bucketCount in zip(histogram["bucketList"], histogram["bucketCountList"]):
+                lineList.append(f"{familyName}_bucket{self.__formatLabel({**labelDict, 'le': repr(float(bucket))})} "
+                                f"{bucketCount}")
+
+            lineList.append(f"{familyName}_bucket{self.__formatLabel({**labelDict, 'le': '+Inf'})} "
+                            f"{histogram['count']}")
+            lineList.append(f"{familyName}_sum{self.__formatLabel(labelDict)} {self.__formatValue(histogram['sum'])}")
+            lineList.append(f"{familyName}_count{self.__formatLabel(labelDict)} {histogram['count']}")
+
+    def render(self, gaugeList=()):
+        # Prometheus text 형식(0.0.4) - 같은 이름의 series 는 노드가 달라도 HELP / TYPE 아래에 모아서 출력해야 함
+        familyDict = {}
+        with self.__lock:
+            self.__addSnapshot(familyDict, self.__getLocalSnapshot(gaugeList), self.LOCAL_PREFIX, {})
+            for nodeId, snapshot in self.__nodeSnapshotDict.items():
+                self.__addSnapshot(familyDict, snapshot, self.NODE_PREFIX, {"node": nodeId})
+
+        outputLineList = []
+        for familyName, family in familyDict.items():
+            escapedHelp = family["help"].replace("\\", "\\\\").replace("\n", "\\n")
+            outputLineList.append(f"# HELP {familyName} {escapedHelp}")
+            outputLineList.append(f"# TYPE {familyName} {family['type']}")
+            outputLineList.extend(family["lineList"])
+
+        return "\n".join(outputLineList) + "\n"
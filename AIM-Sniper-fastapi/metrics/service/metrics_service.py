@@ -0,0 +1,19 @@
+from abc import ABC, abstractmethod
+
+
+class MetricsService(ABC):
+    @abstractmethod
+    def observeHttpRequest(self, method, route, statusCode, seconds):
+        pass
+
+    @abstractmethod
+    def updateNodeMetrics(self, nodeId, snapshot):
+        pass
+
+    @abstractmethod
+    def removeNodeMetrics(self, nodeId):
+        pass
+
+    @abstractmethod
+    def getMetricsText(self):
+        pass
@@ -0,0 +1,40 @@
+from ai_request.service.ai_request_service_impl import AiRequestServiceImpl
+from metrics.repository.metrics_repository_impl import MetricsRepositoryImpl
+from metrics.service.metrics_service import MetricsService
+from user_defined_queue.repository.user_defined_queue_repository_impl import UserDefinedQueueRepositoryImpl
+
+
+class MetricsServiceImpl(MetricsService):
+    def __init__(self):
+        self.__metricsRepository = MetricsRepositoryImpl.getInstance()
+
+    def observeHttpRequest(self, method, route, statusCode, seconds):
+        self.__metricsRepository.observe("http_request_seconds",
+                                         {"method": method, "route": route, "status": statusCode}, seconds)
+
+    def updateNodeMetrics(self, nodeId, snapshot):
+        self.__metricsRepository.updateNodeSnapshot(nodeId, snapshot)
+
+    def removeNodeMetrics(self, nodeId):
+        self.__metricsRepository.removeNodeSnapshot(nodeId)
+
+    def __getLiveGaugeList(self):
+        # 대기열 길이 / 노드 부하는 따로 쌓지 않고 /metrics 를 읽을 때의 값을 그대로 내보냄 (끊긴 노드의 값이 남지 않음)
+        aiRequestStatus = AiRequestServiceImpl(UserDefinedQueueRepositoryImpl.getInstance()).getStatus()
+
+        gaugeList = [("ai_request_in_flight", {"command": command}, inFlightCount)
+                     for command, inFlightCount in aiRequestStatus["inFlightCount"].items()]
+        gaugeList.extend(("ai_request_max_in_flight", {"command": command}, maxInFlightCount)
+                         for command, maxInFlightCount in aiRequestStatus["maxInFlightCount"].items())
+        gaugeList.append(("ai_transmitter_queue_size", {}, aiRequestStatus["transmitterQueueSize"]))
+
+        for node in aiRequestStatus["aiNodeList"]:
+            nodeLabelDict = {"node": node["nodeId"]}
+            gaugeList.append(("ai_node_in_flight", nodeLabelDict, node["inFlightCount"]))
+            gaugeList.append(("ai_node_load", nodeLabelDict, node["load"]))
+            gaugeList.append(("ai_node_slots", nodeLabelDict, node["slotCount"]))
+
+        return gaugeList
+
+    def getMetricsText(self):
+        return self.__metricsRepository.render(self.__getLiveGaugeList())
@@ -1,5 +0,0 @@
-from pydantic import BaseModel
-
-
-class OpenaiApiRequestForm(BaseModel):
-    userSendMessage: str
\ No newline at end of file
@@ -1,7 +0,0 @@
-from abc import ABC, abstractmethod
-
-
-class OpenaiApiRepository(ABC):
-    @abstractmethod
-    def getResult(self, userDefinedReceiverFastAPIChannel):
-        pass
\ No newline at end of file
@@ -1,7 +0,0 @@
-from abc import ABC, abstractmethod
-
-
-class OpenaiApiService(ABC):
-    @abstractmethod
-    def requestOpenaiApiResult(self):
-        pass
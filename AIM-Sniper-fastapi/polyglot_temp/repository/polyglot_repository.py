@@ -1,11 +0,0 @@
-from abc import ABC, abstractmethod
-
-
-class PolyglotRepository(ABC):
-    @abstractmethod
-    def getResult(self, userDefinedReceiverFastAPIChannel):
-        pass
-
-    @abstractmethod
-    def requestScore(self, userDefinedReceiverFastAPIChannel):
-        pass
\ No newline at end of file
@@ -1,11 +0,0 @@
-from abc import ABC, abstractmethod
-
-
-class PolyglotService(ABC):
-    @abstractmethod
-    def requestNextQuestion(self):
-        pass
-
-    @abstractmethod
-    def requestScore(self):
-        pass
\ No newline at end of file
@@ -1,9 +1,11 @@
+import asyncio
 import os
 import sys
 
 from fastapi import APIRouter, Depends, status
 from fastapi.responses import JSONResponse
 
+from ai_request.exception.ai_request_rejected_exception import AiRequestRejectedException
 from report_to_db.service.report_to_db_service_impl import ReportToDbServiceImpl
 from user_defined_queue.repository.user_defined_queue_repository_impl import UserDefinedQueueRepositoryImpl
 
@@ -34,6 +36,17 @@ async def requestReportToDb(reportToDbService: ReportToDbServiceImpl =
 
     ColorPrinter.print_important_message("requestReportToDbPoint()")
 
-    success = await reportToDbService.requestReportToAi()
+    try:
+        success = await reportToDbService.requestReportToAi()
+
+    except asyncio.TimeoutError:
+        return JSONResponse(content={"message": "AI 결과를 기다리는 시간이 초과되었습니다"},
+                            status_code=status.HTTP_504_GATEWAY_TIMEOUT)
+
+    except AiRequestRejectedException as exception:
+        return JSONResponse(content={"message": exception.reason,
+                                     "retryAfterSeconds": exception.retryAfterSeconds},
+                            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                            headers={"Retry-After": str(exception.retryAfterSeconds)})
 
     return JSONResponse(content=success, status_code=status.HTTP_200_OK)
\ No newline at end of file
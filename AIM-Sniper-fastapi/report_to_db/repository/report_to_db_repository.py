@@ -1,7 +0,0 @@
-from abc import ABC, abstractmethod
-
-
-class ReportToDbRepository(ABC):
-    @abstractmethod
-    def requestAiResult(self, userDefinedReceiverFastAPIChannel):
-        pass
\ No newline at end of file
@@ -3,5 +3,5 @@ from abc import ABC, abstractmethod
 
 class ReportToDbService(ABC):
     @abstractmethod
-    def requestReportToAi(self):
+    async def requestReportToAi(self):
         pass
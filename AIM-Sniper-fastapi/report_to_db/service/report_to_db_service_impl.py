@@ -1,7 +1,7 @@
 import os
 import sys
 
-from report_to_db.repository.report_to_db_repository_impl import ReportToDbRepositoryImpl
+from ai_request.service.ai_request_service_impl import AiRequestServiceImpl
 from report_to_db.service.report_to_db_service import ReportToDbService
 
 from api.django_http_client import DjangoHttpClient
@@ -14,20 +14,18 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'template', 'inclu
 from template.include.socket_server.utility.color_print import ColorPrinter
 
 class ReportToDbServiceImpl(ReportToDbService):
+    # AI client 의 REPORT_MAKING protocol 번호 (44 개 기업의 HTML 요약 / 재무 표를 만듦)
+    REPORT_MAKING_COMMAND = 50
 
     def __init__(self, userDefinedQueueRepository: UserDefinedQueueRepositoryImpl):
-        self.__reportToDbRepository = ReportToDbRepositoryImpl()
-        self.__userDefinedQueueRepository = userDefinedQueueRepository
+        self.__aiRequestService = AiRequestServiceImpl(userDefinedQueueRepository)
 
-    def requestReportToAi(self):
-        userDefinedReceiverFastAPIChannel = self.__userDefinedQueueRepository.getUserDefinedSocketReceiverFastAPIChannel()
+    async def requestReportToAi(self):
+        ColorPrinter.print_important_message("requestReportToAi()")
 
-        ColorPrinter.print_important_message("requestToCheckMultipleUserTestPoint()")
+        # 명령을 보낸 이 요청이 자기 requestId 의 결과를 직접 기다리므로 다른 요청의 결과를 받을 일이 없음
+        aiResponse = await self.__aiRequestService.requestAiResult(self.REPORT_MAKING_COMMAND, [])
 
-        aiResponse = self.__reportToDbRepository.requestAiResult(
-            userDefinedReceiverFastAPIChannel
-        )
-
-        success = DjangoHttpClient.post("/company_report/update", aiResponse)
+        success = await DjangoHttpClient.post("/company_report/update", aiResponse)
         print(f"success => {success}")
         return success
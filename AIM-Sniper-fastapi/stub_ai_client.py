@@ -0,0 +1,162 @@
+import argparse
+import asyncio
+import json
+import os
+import queue
+import random
+import re
+import socket
+import threading
+
+from token_stream.utility.stream_frame import encodeFrame, readFrameAsync
+
+# 부하 시험에서 세션이 답변에 심어 보내는 표시 - stub 이 결과에 그대로 돌려줘서 세션이 자기 결과인지 확인함
+SESSION_TAG_PATTERN = re.compile(r"\[LT:([^\]]+)\]")
+
+# protocol 번호 → 결과 하나를 만드는 데 걸리는 평균 시간(초) (질문 생성 / 면접 전체 채점 / 보고서 생성)
+DEFAULT_LATENCY_DICT = {7: 0.5, 8: 2.0, 50: 10.0}
+
+
+def parseLatencyDict(latencyText):
+    # "7:0.5,8:2,50:10" 형식 - 적지 않은 protocol 은 기본값 사용
+    latencyDict = dict(DEFAULT_LATENCY_DICT)
+    latencyDict.update({
+        int(protocolNumber): float(latencySeconds)
+        for protocolNumber, latencySeconds in (
+            protocolLatency.split(":") for protocolLatency in latencyText.split(",") if protocolLatency.strip())
+    })
+
+    return latencyDict
+
+def findSessionTag(data):
+    sessionTagMatch = SESSION_TAG_PATTERN.search(json.dumps(data, ensure_ascii=False))
+    return sessionTagMatch.group(1) if sessionTagMatch else None
+
+def buildResult(command, data):
+    # 실제 AI client 와 같은 모양의 결과에 세션 표시를 다시 심어서 돌려줌
+    sessionTag = findSessionTag(data)
+    tagText = f"[LT:{sessionTag}]" if sessionTag else ""
+
+    if command == 7:
+        return {"nextQuestion": f"{tagText} 그 경험에서 가장 어려웠던 점은 무엇이었나요?"}
+
+    if command == 8:
+        interviewList = data if isinstance(data, list) else []
+        return {"resultList": [f"score: 80점<s>feedback: {tagText} 경험을 구체적으로 설명했습니다."
+                               for _ in interviewList]}
+
+    if command == 50:
+        return {"aiResult": {"sessionTag": sessionTag}}
+
+    return {"error": f"stub AI client 가 처리하지 않는 command 입니다: {command}"}
+
+
+class StubAiClient:
+    # 모델 없이 protocol 7 / 8 / 50 을 정해진 지연 시간 뒤에 돌려주는 AI client
+    # - stream: FastAPI 의 token stream 서버에 노드로 접속해서 명령을 받음 (실제 socket / frame 경로)
+    # - channel: 같은 프로세스의 FastAPI 송신 / 수신 channel 에 바로 붙어서 template socket 과 AI client 자리를 대신함
+    #   (socket 을 거치지 않으므로 이 방식으로 잰 수치는 end-to-end 가 아님)
+    def __init__(self, latencyDict, jitterRatio=0.2, slotCount=4, nodeId=None):
+        self.latencyDict = latencyDict
+        self.jitterRatio = jitterRatio
+        self.slotCount = slotCount
+        self.nodeId = nodeId or f"stub-{socket.gethostname()}-{os.getpid()}"
+        self.handledCountDict = {}
+
+    def getLatency(self, command):
+        latencySeconds = self.latencyDict.get(command, 0.0)
+        return max(0.0, random.uniform(latencySeconds * (1 - self.jitterRatio), latencySeconds * (1 + self.jitterRatio)))
+
+    async def handleCommand(self, slotSemaphore, command, data):
+        # 실제 AI client 의 scheduler slot 처럼 동시에 slotCount 개까지만 처리하고 나머지는 기다림
+        async with slotSemaphore:
+            await asyncio.sleep(self.getLatency(command))
+
+        self.handledCountDict[command] = self.handledCountDict.get(command, 0) + 1
+        return buildResult(command, data)
+
+    async def runStreamNode(self, host, port, secret, stopEvent=None):
+        reader, writer = await asyncio.open_connection(host, port)
+        writer.write(encodeFrame({"type": "hello", "codecList": ["json"], "compressionList": [], "secret": secret,
+                                  "node": {"nodeId": self.nodeId, "protocolList": list(self.latencyDict),
+                                           "slotCount": self.slotCount}}))
+        await writer.drain()
+        await readFrameAsync(reader)
+
+        slotSemaphore = asyncio.Semaphore(self.slotCount)
+        pendingTaskSet = set()
+
+        async def replyResult(commandFrame):
+            try:
+                result = await self.handleCommand(slotSemaphore, commandFrame["command"], commandFrame.get("data"))
+            except Exception as exception:
+                result = {"error": str(exception)}
+
+            writer.write(encodeFrame({"type": "result", "requestId": commandFrame["requestId"],
+                                      "result": {**result, "requestId": commandFrame["requestId"]}}))
+            await writer.drain()
+
+        try:
+            while stopEvent is None or not stopEvent.is_set():
+                frame = await readFrameAsync(reader)
+                if frame.get("type") != "command":
+                    continue
+
+                pendingTask = asyncio.create_task(replyResult(frame))
+                pendingTaskSet.add(pendingTask)
+                pendingTask.add_done_callback(pendingTaskSet.discard)
+
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+
+        finally:
+            for pendingTask in pendingTaskSet:
+                pendingTask.cancel()
+            writer.close()
+
+    def startChannelWorker(self, transmitterChannel, receiverChannel):
+        # template socket 이 FastAPI 송신 channel 에서 꺼내 AI client 로 보내고, AI client 결과를 수신 channel 에 넣는
+        # 과정을 같은 프로세스 안에서 대신함
+        loop = asyncio.new_event_loop()
+        threading.Thread(target=loop.run_forever, name="StubAiClientLoop", daemon=True).start()
+        slotSemaphore = asyncio.run_coroutine_threadsafe(self.__createSemaphore(), loop).result()
+
+        async def replyResult(command, data, requestId):
+            result = await self.handleCommand(slotSemaphore, command, data)
+            if requestId is not None:
+                result["requestId"] = requestId
+
+            receiverChannel.put(json.dumps(result, ensure_ascii=False))
+
+        def receiveCommand():
+            while True:
+                try:
+                    commandMessage = transmitterChannel.get(timeout=1)
+                except queue.Empty:
+                    continue
+
+                if isinstance(commandMessage, (str, bytes)):
+                    commandMessage = json.loads(commandMessage)
+
+                asyncio.run_coroutine_threadsafe(replyResult(int(commandMessage["command"]), commandMessage.get("data"),
+                                                             commandMessage.get("requestId")), loop)
+
+        threading.Thread(target=receiveCommand, name="StubAiClientReceiver", daemon=True).start()
+
+    async def __createSemaphore(self):
+        return asyncio.Semaphore(self.slotCount)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="모델 없이 정해진 지연 시간으로 결과를 돌려주는 AI client 노드")
+    parser.add_argument("--host", default=os.getenv("AI_STREAM_HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("AI_STREAM_PORT", "37374")))
+    parser.add_argument("--secret", default=os.getenv("AI_STREAM_SECRET"), help="FastAPI 의 AI_STREAM_SECRET 과 같은 값")
+    parser.add_argument("--latency", default="", help='protocol 별 평균 지연 시간(초), 예: "7:0.5,8:2,50:10"')
+    parser.add_argument("--jitter", type=float, default=0.2, help="평균 지연 시간 대비 흔들림 비율")
+    parser.add_argument("--slot-count", type=int, default=4)
+    parser.add_argument("--node-id", default=None)
+    args = parser.parse_args()
+
+    stubAiClient = StubAiClient(parseLatencyDict(args.latency), args.jitter, args.slot_count, args.node_id)
+    asyncio.run(stubAiClient.runStreamNode(args.host, args.port, args.secret))
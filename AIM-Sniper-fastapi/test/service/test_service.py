@@ -1,7 +0,0 @@
-from abc import ABC, abstractmethod
-
-
-class TestService(ABC):
-    @abstractmethod
-    def requestTestResult(self):
-        pass
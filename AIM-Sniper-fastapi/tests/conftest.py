@@ -0,0 +1,5 @@
+import os
+import sys
+
+# 도메인 package 들을 최상위 이름으로 import 할 수 있도록 FastAPI 프로젝트 루트를 경로에 추가
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
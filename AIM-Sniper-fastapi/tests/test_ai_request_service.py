@@ -0,0 +1,30 @@
+import asyncio
+
+import pytest
+
+from ai_node.repository.ai_node_repository_impl import AiNodeRepositoryImpl
+from ai_request.repository.ai_request_repository_impl import AiRequestRepositoryImpl
+from ai_request.service.ai_request_service_impl import AiRequestServiceImpl
+from user_defined_queue.repository.user_defined_queue_repository_impl import UserDefinedQueueRepositoryImpl
+
+REPORT_MAKING_COMMAND = 50
+
+
+def test_send_failure_releases_in_flight_slot():
+    # 노드의 stream socket 이 전송 도중 끊기면 요청 등록이 지워져서 이후 요청이 429 로 거절되지 않아야 함
+    aiNodeRepository = AiNodeRepositoryImpl.getInstance()
+    aiRequestService = AiRequestServiceImpl(UserDefinedQueueRepositoryImpl.getInstance())
+    maxInFlightCount = aiRequestService.MAX_IN_FLIGHT_DICT[REPORT_MAKING_COMMAND]
+
+    async def brokenFrameSender(frame):
+        raise ConnectionResetError("stream socket closed")
+
+    aiNodeRepository.addNode("broken-node", [REPORT_MAKING_COMMAND], 4, brokenFrameSender)
+    try:
+        for _ in range(maxInFlightCount + 1):
+            with pytest.raises(ConnectionResetError):
+                asyncio.run(aiRequestService.requestAiResult(REPORT_MAKING_COMMAND, {}))
+
+            assert AiRequestRepositoryImpl.getInstance().getInFlightCountDict().get(REPORT_MAKING_COMMAND, 0) == 0
+    finally:
+        aiNodeRepository.removeNode("broken-node", brokenFrameSender)
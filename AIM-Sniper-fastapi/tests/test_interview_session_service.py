@@ -0,0 +1,68 @@
+import asyncio
+
+from interview_session.service.interview_session_service_impl import InterviewSessionServiceImpl
+from token_stream.repository.token_stream_repository_impl import TokenStreamRepositoryImpl
+from user_defined_queue.repository.user_defined_queue_repository_impl import UserDefinedQueueRepositoryImpl
+
+
+class SlowWebSocket:
+    # 전송이 느린 브라우저처럼 메시지 하나를 보낼 때마다 잠깐 기다림
+    def __init__(self):
+        self.messageList = []
+
+    async def send_json(self, message):
+        await asyncio.sleep(0.01)
+        self.messageList.append(message)
+
+
+class FakeAiRequestService:
+    def __init__(self, chunkCount=0, exception=None):
+        self.chunkCount = chunkCount
+        self.exception = exception
+
+    def createRequestId(self):
+        return "request-0"
+
+    async def requestAiResult(self, command, data, requestId=None):
+        chunkQueue = TokenStreamRepositoryImpl.getInstance()._TokenStreamRepositoryImpl__subscriberDict[requestId]
+        for index in range(self.chunkCount):
+            chunkQueue.put_nowait({"type": "chunk", "requestId": requestId, "index": 0, "chunk": str(index)})
+
+        # relay 가 첫 조각을 꺼내서 보내는 도중에 최종 결과가 도착하게 함
+        await asyncio.sleep(0.005)
+        if self.exception is not None:
+            raise self.exception
+
+        return {"nextQuestion": "다음 질문"}
+
+
+def runRequestAndPush(fakeAiRequestService):
+    async def run():
+        interviewSessionService = InterviewSessionServiceImpl(UserDefinedQueueRepositoryImpl.getInstance())
+        interviewSessionService._InterviewSessionServiceImpl__aiRequestService = fakeAiRequestService
+
+        websocket = SlowWebSocket()
+        interviewSessionService.subscribe("session-0", websocket)
+        try:
+            await interviewSessionService.requestAndPush("session-0", 7, [], "message-0")
+        finally:
+            interviewSessionService.unsubscribe("session-0", websocket)
+
+        return websocket.messageList
+
+    return asyncio.run(run())
+
+
+def test_every_chunk_is_pushed_before_final_result():
+    messageList = runRequestAndPush(FakeAiRequestService(chunkCount=3))
+
+    assert [message.get("chunk") for message in messageList[:-1]] == ["0", "1", "2"]
+    assert messageList[-1]["result"] == {"nextQuestion": "다음 질문"}
+
+
+def test_unexpected_error_is_pushed_as_error_message():
+    messageList = runRequestAndPush(FakeAiRequestService(exception=ConnectionResetError("stream socket closed")))
+
+    assert len(messageList) == 1
+    assert messageList[0]["messageId"] == "message-0"
+    assert "ConnectionResetError" in messageList[0]["error"]
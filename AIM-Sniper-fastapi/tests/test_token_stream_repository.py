@@ -0,0 +1,50 @@
+import asyncio
+
+from token_stream.repository.token_stream_repository_impl import TokenStreamRepositoryImpl
+from token_stream.utility.stream_frame import FRAME_HEADER, encodeFrame, readFrameAsync
+
+STREAM_SECRET = "test-secret"
+
+
+def test_malformed_frame_is_dropped_without_disconnecting_node():
+    # 인증된 노드가 잘못된 frame 을 보내도 연결은 유지되고, 이후의 올바른 result frame 은 그대로 전달되어야 함
+    resolvedList = []
+    disconnectedList = []
+
+    async def run():
+        tokenStreamRepository = TokenStreamRepositoryImpl.getInstance()
+        streamServer = await tokenStreamRepository.startServer(
+            "127.0.0.1", 0, STREAM_SECRET, [],
+            resultHandler=lambda requestId, result: resolvedList.append((requestId, result)),
+            nodeConnectedHandler=lambda nodeId, protocolList, slotCount, frameSender: None,
+            nodeDisconnectedHandler=lambda nodeId, frameSender: disconnectedList.append(nodeId))
+        port = streamServer.sockets[0].getsockname()[1]
+
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(encodeFrame({"type": "hello", "secret": STREAM_SECRET,
+                                  "node": {"nodeId": "node-0", "protocolList": [7], "slotCount": 1}}))
+        await readFrameAsync(reader)
+
+        for malformedFrame in (["not", "a", "dict"], {"type": "result", "result": {}},
+                               {"type": "result", "requestId": ["unhashable"], "result": {}},
+                               {"type": "result", "requestId": "request-0"}, {"type": "chunk", "chunk": "x"},
+                               {"type": "status"}):
+            writer.write(encodeFrame(malformedFrame))
+        writer.write(FRAME_HEADER.pack(3, 0) + b"{{{")
+        writer.write(encodeFrame({"type": "result", "requestId": "request-1", "result": {"ok": True}}))
+        await writer.drain()
+
+        for _ in range(50):
+            if resolvedList:
+                break
+            await asyncio.sleep(0.02)
+        nodeDisconnectedBeforeClose = list(disconnectedList)
+
+        writer.close()
+        streamServer.close()
+        await streamServer.wait_closed()
+
+        return nodeDisconnectedBeforeClose
+
+    assert asyncio.run(run()) == []
+    assert resolvedList == [("request-1", {"ok": True})]
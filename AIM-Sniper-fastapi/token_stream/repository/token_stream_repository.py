@@ -0,0 +1,16 @@
+from abc import ABC, abstractmethod
+
+
+class TokenStreamRepository(ABC):
+    @abstractmethod
+    def startServer(self, host, port, secret, resultProtocolList=(), resultHandler=None, statusHandler=None,
+                    nodeConnectedHandler=None, nodeDisconnectedHandler=None, metricsHandler=None):
+        pass
+
+    @abstractmethod
+    def subscribe(self, requestId):
+        pass
+
+    @abstractmethod
+    def unsubscribe(self, requestId):
+        pass
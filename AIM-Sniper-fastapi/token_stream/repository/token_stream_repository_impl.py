@@ -0,0 +1,186 @@
+import asyncio
+import hmac
+import os
+import sys
+
+from token_stream.repository.token_stream_repository import TokenStreamRepository
+from token_stream.utility.stream_frame import encodeFrame, getSupportedCodecList, getSupportedCompressionList, \
+    readFrameAsync
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'template'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'template', 'include', 'socket_server'))
+
+from template.include.socket_server.utility.color_print import ColorPrinter
+
+
+class TokenStreamRepositoryImpl(TokenStreamRepository):
+    __instance = None
+
+    # 인증 전의 상대가 연결을 붙잡고 있거나 큰 frame 으로 메모리를 쓰지 않도록 첫 hello 에만 두는 제한
+    HELLO_TIMEOUT_SECONDS = 10
+    HELLO_MAX_BODY_BYTES = 64 * 1024
+
+    def __new__(cls):
+        if cls.__instance is None:
+            cls.__instance = super().__new__(cls)
+
+            # requestId → 해당 요청의 생성 조각을 받을 asyncio.Queue
+            cls.__instance.__subscriberDict = {}
+            cls.__instance.__streamServer = None
+            cls.__instance.__secret = None
+
+            # 이 연결로 최종 결과를 받을 protocol 번호와, 받은 결과를 요청에 전달할 함수
+            cls.__instance.__resultProtocolList = []
+            cls.__instance.__resultHandler = None
+
+            # AI client 가 주기적으로 보내오는 명령 대기 현황과, 명령을 받는 노드로 접속 / 종료한 AI client 를 넘겨받을 함수
+            cls.__instance.__statusHandler = None
+            cls.__instance.__nodeConnectedHandler = None
+            cls.__instance.__nodeDisconnectedHandler = None
+
+            # AI client 가 주기적으로 보내오는 누적 metric snapshot 을 넘겨받을 함수
+            cls.__instance.__metricsHandler = None
+
+        return cls.__instance
+
+    @classmethod
+    def getInstance(cls):
+        if cls.__instance is None:
+            cls.__instance = cls()
+
+        return cls.__instance
+
+    async def startServer(self, host, port, secret, resultProtocolList=(), resultHandler=None, statusHandler=None,
+                          nodeConnectedHandler=None, nodeDisconnectedHandler=None, metricsHandler=None):
+        self.__secret = secret
+        self.__resultProtocolList = list(resultProtocolList)
+        self.__resultHandler = resultHandler
+        self.__statusHandler = statusHandler
+        self.__nodeConnectedHandler = nodeConnectedHandler
+        self.__nodeDisconnectedHandler = nodeDisconnectedHandler
+        self.__metricsHandler = metricsHandler
+
+        if self.__streamServer is None:
+            self.__streamServer = await asyncio.start_server(self.__receiveFrame, host, port)
+
+        return self.__streamServer
+
+    def __isAuthenticated(self, helloFrame):
+        if self.__secret is None or not isinstance(helloFrame, dict) or helloFrame.get("type") != "hello":
+            return False
+
+        secret = helloFrame.get("secret")
+        if not isinstance(secret, str):
+            return False
+
+        return hmac.compare_digest(secret.encode("utf-8"), self.__secret.encode("utf-8"))
+
+    def __findFrameError(self, frame):
+        # 처리할 수 없는 frame 이면 그 이유를, 처리할 수 있으면 None 을 돌려줌
+        if not isinstance(frame, dict):
+            return f"frame 이 dict 가 아닙니다: {type(frame).__name__}"
+
+        frameType = frame.get("type", "chunk")
+        if frameType in ("status", "metrics"):
+            return None if frameType in frame else f"{frameType} frame 에 {frameType} 값이 없습니다"
+
+        if frameType == "hello":
+            return None
+
+        if not isinstance(frame.get("requestId"), str):
+            return f"{frameType} frame 의 requestId 가 올바르지 않습니다: {frame.get('requestId')!r}"
+
+        if frameType == "result" and "result" not in frame:
+            return "result frame 에 result 값이 없습니다"
+
+        return None
+
+    async def __receiveFrame(self, reader, writer):
+        # AI client 하나가 연결 하나로 모든 요청의 조각을 보내므로 requestId 로 구독자를 찾아서 넘김
+        nodeId = None
+
+        async def frameSender(frame):
+            # 받는 쪽이 느리면 보낼 buffer 가 줄어들 때까지 기다려서 buffer 가 끝없이 커지지 않게 함
+            writer.write(encodeFrame(frame))
+            await writer.drain()
+
+        try:
+            # 첫 frame 은 공유 secret 이 맞는 hello 여야 하고, 아니면 노드 등록 / 결과 / 조각을 받지 않고 연결을 끊음
+            helloFrame = await asyncio.wait_for(readFrameAsync(reader, self.HELLO_MAX_BODY_BYTES),
+                                                self.HELLO_TIMEOUT_SECONDS)
+            if not self.__isAuthenticated(helloFrame):
+                return
+
+            await self.__replyHello(writer, helloFrame)
+
+            # 노드 정보를 보낸 AI client 는 이 연결로 명령을 받을 수 있음
+            node = helloFrame.get("node")
+            if node is not None and self.__nodeConnectedHandler is not None:
+                nodeId = node["nodeId"]
+                self.__nodeConnectedHandler(nodeId, node.get("protocolList", []), node.get("slotCount", 1),
+                                            frameSender)
+
+            while True:
+                # 인증된 노드가 보낸 frame 이라도 잘못된 frame 하나로 연결을 끊으면 이 노드의 진행 중인 요청이
+                # 모두 거절되므로, 읽을 수 없거나 처리할 수 없는 frame 은 기록만 하고 버림
+                # (frame 길이만큼은 이미 읽었으므로 다음 frame 은 그대로 이어서 읽을 수 있음)
+                try:
+                    frame = await readFrameAsync(reader)
+                except ValueError as exception:
+                    ColorPrinter.print_important_data("token stream frame dropped", f"{nodeId}: {exception}")
+                    continue
+
+                frameError = self.__findFrameError(frame)
+                if frameError is not None:
+                    ColorPrinter.print_important_data("token stream frame dropped", f"{nodeId}: {frameError}")
+                    continue
+
+                frameType = frame.get("type", "chunk")
+
+                if frameType == "hello":
+                    continue
+
+                elif frameType == "result":
+                    if self.__resultHandler is not None:
+                        self.__resultHandler(frame["requestId"], frame["result"])
+
+                elif frameType == "status":
+                    if self.__statusHandler is not None and nodeId is not None:
+                        self.__statusHandler(nodeId, frame["status"])
+
+                elif frameType == "metrics":
+                    if self.__metricsHandler is not None and nodeId is not None:
+                        self.__metricsHandler(nodeId, frame["metrics"])
+
+                else:
+                    chunkQueue = self.__subscriberDict.get(frame["requestId"])
+                    if chunkQueue is not None:
+                        chunkQueue.put_nowait(frame)
+
+        except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError, ValueError):
+            pass
+
+        finally:
+            if nodeId is not None and self.__nodeDisconnectedHandler is not None:
+                self.__nodeDisconnectedHandler(nodeId, frameSender)
+
+            writer.close()
+
+    async def __replyHello(self, writer, helloFrame):
+        # AI client 가 지원하는 것 중 양쪽 모두 지원하는 첫 번째 형식 / 압축 방식을 고름
+        codec = next((codec for codec in helloFrame.get("codecList", []) if codec in getSupportedCodecList()), "json")
+        compression = next((compression for compression in helloFrame.get("compressionList", [])
+                            if compression in getSupportedCompressionList()), None)
+
+        writer.write(encodeFrame({"type": "hello", "codec": codec, "compression": compression,
+                                  "resultProtocolList": self.__resultProtocolList}))
+        await writer.drain()
+
+    def subscribe(self, requestId):
+        chunkQueue = asyncio.Queue()
+        self.__subscriberDict[requestId] = chunkQueue
+
+        return chunkQueue
+
+    def unsubscribe(self, requestId):
+        self.__subscriberDict.pop(requestId, None)
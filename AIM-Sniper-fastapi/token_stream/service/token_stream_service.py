@@ -0,0 +1,15 @@
+from abc import ABC, abstractmethod
+
+
+class TokenStreamService(ABC):
+    @abstractmethod
+    def startStreamServer(self):
+        pass
+
+    @abstractmethod
+    def subscribe(self, requestId):
+        pass
+
+    @abstractmethod
+    def unsubscribe(self, requestId):
+        pass
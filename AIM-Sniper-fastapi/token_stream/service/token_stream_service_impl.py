@@ -0,0 +1,59 @@
+import os
+import sys
+
+from dotenv import load_dotenv
+
+from ai_node.service.ai_node_service_impl import AiNodeServiceImpl
+from ai_request.repository.ai_request_repository_impl import AiRequestRepositoryImpl
+from metrics.service.metrics_service_impl import MetricsServiceImpl
+from token_stream.repository.token_stream_repository_impl import TokenStreamRepositoryImpl
+from token_stream.service.token_stream_service import TokenStreamService
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'template'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'template', 'include', 'socket_server'))
+
+from template.include.socket_server.utility.color_print import ColorPrinter
+
+load_dotenv()
+
+class TokenStreamServiceImpl(TokenStreamService):
+    # AI client 가 생성 조각을 보내오는 포트 (설정하지 않으면 스트리밍 없이 최종 결과만 전달)
+    # 기본값은 같은 host 의 AI client 만 접속할 수 있는 주소 - 다른 host 의 AI client 를 받을 때만 바꿈
+    STREAM_HOST = os.getenv("AI_STREAM_HOST", "127.0.0.1")
+    STREAM_PORT = os.getenv("AI_STREAM_PORT")
+
+    # 이 연결로 노드 등록 / 명령 수신 / 결과 전달을 하므로 AI client 는 hello 에 같은 값을 실어 보내야 접속됨
+    STREAM_SECRET = os.getenv("AI_STREAM_SECRET")
+
+    # 최종 결과를 template socket(JSON) 대신 이 연결의 msgpack(+zstd) frame 으로 받을 protocol 번호
+    # (기본값은 44 개 기업의 HTML 요약 / 재무 표를 담아 가장 큰 REPORT_MAKING)
+    RESULT_PROTOCOL_LIST = [int(protocolNumber) for protocolNumber
+                            in os.getenv("AI_STREAM_RESULT_PROTOCOL_LIST", "50").split(",") if protocolNumber.strip()]
+
+    def __init__(self):
+        self.__tokenStreamRepository = TokenStreamRepositoryImpl.getInstance()
+
+    async def startStreamServer(self):
+        if not self.STREAM_PORT:
+            return
+
+        if not self.STREAM_SECRET:
+            ColorPrinter.print_important_message("AI_STREAM_SECRET 이 설정되지 않아 token stream 서버를 시작하지 않습니다")
+            return
+
+        # 여러 AI client 가 이 서버에 노드로 접속하면 protocol 별로 가장 한가한 노드에 명령을 나눠 보냄
+        aiNodeService = AiNodeServiceImpl()
+        await self.__tokenStreamRepository.startServer(self.STREAM_HOST, int(self.STREAM_PORT), self.STREAM_SECRET,
+                                                       self.RESULT_PROTOCOL_LIST,
+                                                       AiRequestRepositoryImpl.getInstance().resolveRequest,
+                                                       aiNodeService.updateNodeStatus,
+                                                       aiNodeService.connectNode,
+                                                       aiNodeService.disconnectNode,
+                                                       MetricsServiceImpl().updateNodeMetrics)
+        ColorPrinter.print_important_data("token stream server", f"{self.STREAM_HOST}:{self.STREAM_PORT}")
+
+    def subscribe(self, requestId):
+        return self.__tokenStreamRepository.subscribe(requestId)
+
+    def unsubscribe(self, requestId):
+        self.__tokenStreamRepository.unsubscribe(requestId)
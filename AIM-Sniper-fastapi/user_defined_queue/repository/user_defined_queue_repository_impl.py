@@ -1,11 +1,19 @@
 import multiprocessing
+import os
+
+from dotenv import load_dotenv
 
 from user_defined_queue.repository.user_defined_queue_repository import UserDefinedQueueRepository
 
+load_dotenv()
+
 
 class UserDefinedQueueRepositoryImpl(UserDefinedQueueRepository):
     __instance = None
 
+    # AI client 로 보낼 명령이 쌓일 수 있는 최대 개수 - 가득 차면 더 쌓지 않고 요청을 거절함
+    TRANSMITTER_QUEUE_MAX_SIZE = int(os.getenv("AI_TRANSMITTER_QUEUE_MAX_SIZE", "256"))
+
     __systemSocketReceiverFastAPIChannel = None
     __systemFastAPISocketTransmitterChannel = None
 
@@ -30,5 +38,5 @@ class UserDefinedQueueRepositoryImpl(UserDefinedQueueRepository):
 
     def create(self):
         self.__systemSocketReceiverFastAPIChannel = multiprocessing.Queue()
-        self.__systemFastAPISocketTransmitterChannel = multiprocessing.Queue()
+        self.__systemFastAPISocketTransmitterChannel = multiprocessing.Queue(maxsize=self.TRANSMITTER_QUEUE_MAX_SIZE)
     
\ No newline at end of file
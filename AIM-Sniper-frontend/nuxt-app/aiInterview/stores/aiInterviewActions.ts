@@ -1,7 +1,22 @@
 import * as axiosUtility from "../../utility/axiosInstance";
+import { InterviewSession } from "../../utility/interviewSession";
 import { AxiosResponse } from "axios"
+import { useRuntimeConfig } from "nuxt/app";
 import { useAiInterviewStore } from "./aiInterviewStore"
 
+// 면접 한 번 동안 질문 생성 / 채점 결과를 push 로 받는 연결 (첫 요청 때 열고 면접 화면을 나갈 때 닫음)
+let interviewSession: InterviewSession | null = null
+
+function getInterviewSession(): InterviewSession {
+    if (!interviewSession) {
+        const config = useRuntimeConfig();
+        const sessionId = `${Date.now()}-${Math.random().toString(36).slice(2)}`
+        interviewSession = new InterviewSession(config.public.AI_BASE_URL as string, sessionId)
+    }
+
+    return interviewSession
+}
+
 export const aiInterviewActions = {
     
     // async requestGetQuestionListToDjango(sessionId: number): Promise<AxiosResponse> {
@@ -27,8 +42,7 @@ export const aiInterviewActions = {
         }        
     },
 
-    async requestInferNextQuestionToFastAPI(payload: { answer: string, nextIntent: string }): Promise<string> {
-        const { fastapiAxiosInst } = axiosUtility.createAxiosInstances();
+    async requestInferNextQuestionToFastAPI(payload: { answer: string, nextIntent: string }): Promise<any> {
         // console.log("payload:", payload)
         const { answer, nextIntent } = payload
         
@@ -37,57 +51,27 @@ export const aiInterviewActions = {
             // console.log("userInput:", answer)
             const command = 7
 
-            const response = await fastapiAxiosInst.post(
-                '/request-ai-command', { command, "data":[answer, nextIntent] })
-            return response.data
+            // 결과는 면접 세션 연결로 도착하는 즉시 push 되므로 polling 하지 않음
+            return await getInterviewSession().request(command, [answer, nextIntent])
         } catch (error) {
             console.log('requestInferToFastAPI() 중 문제 발생:', error)
             throw error
         }
     },
-    async requestInferScoreResultToFastAPI(payload: {interviewResult: any[]}): Promise<string>{
-        const { fastapiAxiosInst } = axiosUtility.createAxiosInstances();
+    async requestInferScoreResultToFastAPI(payload: {interviewResult: any[]}): Promise<any>{
         const interviewResult = payload.interviewResult
         try{
             const command = 8
 
-            const response = await fastapiAxiosInst.post(
-                '/request-ai-command', { command, "data": interviewResult })
-            return response.data
+            return await getInterviewSession().request(command, interviewResult)
         }catch (error) {
             console.log('requestInferScoreResultToFastAPI() 중 문제 발생:', error)
             throw error
         }
     },
-    async requestInferedResultToFastAPI(): Promise<string> {
-        const { fastapiAxiosInst } = axiosUtility.createAxiosInstances();
-        try {
-            // console.log('requestInferedResultToFastAPI()')
-
-            let response: AxiosResponse<any>;
-            const maxAttempts = 500; // 최대 시도 횟수
-            const delay = 10000; // 각 시도 사이의 지연시간 (ms)
-            
-            for (let attempt = 1; attempt <= maxAttempts; attempt++) {
-                response = await fastapiAxiosInst.get('/polyglot-result');
-
-                if (response.data && response.data.nextQuestion) {
-                    // console.log('response.data', response.data);
-                    return response.data;
-                }
-                if (response.data && response.data.resultList){
-                    return response.data;
-                }
-
-                console.log(`Attempt ${attempt} failed. Retrying in ${delay}ms...`);
-                await new Promise(resolve => setTimeout(resolve, delay));
-            }
-
-            throw new Error('결과를 가져오는 데 실패했습니다.');
-        } catch (error) {
-            console.log('requestInferedResultToFastAPI() 중 문제 발생:', error)
-            throw error
-        }
+    closeInterviewSessionToFastAPI() {
+        interviewSession?.close()
+        interviewSession = null
     },
     async requestSaveInterviewResultToDjango(payload: { scoreResultList: [], accountId: string }): Promise<string>{
         const {djangoAxiosInst} = axiosUtility.createAxiosInstances()
@@ -1,16 +1,30 @@
 import { ActionContext } from "vuex"
 import { AxiosResponse } from "axios"
 import axiosInst from "@/utility/axiosInstance"
+import { InterviewSession } from "@/utility/interviewSession"
+import env from "@/env"
+
+// 면접 한 번 동안 질문 생성 / 채점 결과를 push 로 받는 연결 (첫 요청 때 열고 면접 화면을 나갈 때 닫음)
+let interviewSession: InterviewSession | null = null
+
+function getInterviewSession(): InterviewSession {
+    if (!interviewSession) {
+        const sessionId = `${Date.now()}-${Math.random().toString(36).slice(2)}`
+        interviewSession = new InterviewSession(env.api.AI_BASE_URL as string, sessionId)
+    }
+
+    return interviewSession
+}
 
 export type AIInterviewActions = {
     requestGetQuestionListToDjango(context: ActionContext<any, any>, sessionId: number): Promise<AxiosResponse>
     requestInferNextQuestionToFastAPI(
         context: ActionContext<any, any>,
-        payload: { answer: string, nextIntent: string }): Promise<string>
+        payload: { answer: string, nextIntent: string }): Promise<any>
     requestInferScoreResultToFastAPI(
         context: ActionContext<any, any>,
-        payload: { interviewResult: any[] }): Promise<string>
-    requestInferedResultToFastAPI(context: ActionContext<any, any>): Promise<string>
+        payload: { interviewResult: any[] }): Promise<any>
+    closeInterviewSessionToFastAPI(context: ActionContext<any, any>): void
     requestSaveInterviewResultToDjango(
         context: ActionContext<any, any>,
         payload: { scoreResultList: [], accountId: string }): Promise<string>
@@ -25,7 +39,7 @@ const actions: AIInterviewActions = {
     },
     async requestInferNextQuestionToFastAPI(
         context: ActionContext<any, any>,
-        payload: { answer: string, nextIntent: string }): Promise<string> {
+        payload: { answer: string, nextIntent: string }): Promise<any> {
         console.log("payload:", payload)
         const { answer, nextIntent } = payload
         try {
@@ -33,9 +47,8 @@ const actions: AIInterviewActions = {
             // console.log("userInput:", answer)
             const command = 7
 
-            const response = await axiosInst.fastapiAxiosInst.post(
-                '/request-ai-command', { command, "data":[answer, nextIntent] })
-            return response.data
+            // 결과는 면접 세션 연결로 도착하는 즉시 push 되므로 polling 하지 않음
+            return await getInterviewSession().request(command, [answer, nextIntent])
         } catch (error) {
             console.log('requestInferToFastAPI() 중 문제 발생:', error)
             throw error
@@ -43,47 +56,23 @@ const actions: AIInterviewActions = {
     },
     async requestInferScoreResultToFastAPI(
         context: ActionContext<any, any>,
-        payload: {  interviewResult: any[] }): Promise<string> {
+        payload: {  interviewResult: any[] }): Promise<any> {
         console.log("payload:", payload)
         const interviewResult = payload.interviewResult
         try {
             // console.log('requestInferScoreResultToFastAPI()')
             const command = 8
 
-            const response = await axiosInst.fastapiAxiosInst.post(
-                '/request-ai-command', { command, "data": interviewResult })
-            return response.data
+            return await getInterviewSession().request(command, interviewResult)
         } catch (error) {
             console.log('requestInferScoreResultToFastAPI() 중 문제 발생:', error)
             throw error
         }
     },
 
-    async requestInferedResultToFastAPI(context: ActionContext<any, any>): Promise<string> {
-        try {
-            // console.log('requestInferedResultToFastAPI()')
-
-            let response: AxiosResponse<any>;
-            const maxAttempts = 30; // 최대 시도 횟수
-            const delay = 1000; // 각 시도 사이의 지연시간 (ms)
-            
-            for (let attempt = 1; attempt <= maxAttempts; attempt++) {
-                response = await axiosInst.fastapiAxiosInst.get('/polyglot-result');
-
-                if (response.data && response.data.nextQuestion) {
-                    // console.log('response.data', response.data);
-                    return response.data;
-                }
-
-                console.log(`Attempt ${attempt} failed. Retrying in ${delay}ms...`);
-                await new Promise(resolve => setTimeout(resolve, delay));
-            }
-
-            throw new Error('결과를 가져오는 데 실패했습니다.');
-        } catch (error) {
-            console.log('requestInferedResultToFastAPI() 중 문제 발생:', error)
-            throw error
-        }
+    closeInterviewSessionToFastAPI(context: ActionContext<any, any>): void {
+        interviewSession?.close()
+        interviewSession = null
     },
     async requestSaveInterviewResultToDjango(
         context: ActionContext<any, any>,
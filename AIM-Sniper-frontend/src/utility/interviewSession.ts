@@ -0,0 +1,84 @@
+// FastAPI 의 /ws/interview-session/{sessionId} 에 면접 한 번당 연결 하나를 열고,
+// 보낸 명령의 결과가 도착하면 push 로 받음 (결과를 받으려고 polling 하지 않음)
+type PendingRequest = {
+    resolve: (result: any) => void
+    reject: (error: Error) => void
+    onChunk?: (chunkMessage: any) => void
+}
+
+export class InterviewSession {
+    private readonly url: string
+    private socket: WebSocket | null = null
+    private opening: Promise<WebSocket> | null = null
+    private messageCount = 0
+    private pendingRequestMap = new Map<string, PendingRequest>()
+
+    constructor(baseUrl: string, sessionId: string) {
+        // http(s) 주소를 같은 host 의 ws(s) 주소로 바꿈
+        this.url = `${baseUrl.replace(/^http/, 'ws').replace(/\/$/, '')}/ws/interview-session/${sessionId}`
+    }
+
+    // 명령을 보내고 그 결과를 돌려줌 - 생성 도중의 조각({ index, chunk, done? })은 onChunk 로 먼저 전달됨
+    async request(command: number, data: any, onChunk?: (chunkMessage: any) => void): Promise<any> {
+        const socket = await this.open()
+        const messageId = `${Date.now()}-${++this.messageCount}`
+
+        return new Promise((resolve, reject) => {
+            this.pendingRequestMap.set(messageId, { resolve, reject, onChunk })
+            socket.send(JSON.stringify({ messageId, command, data }))
+        })
+    }
+
+    close() {
+        this.socket?.close()
+        this.socket = null
+        this.opening = null
+    }
+
+    private open(): Promise<WebSocket> {
+        if (this.socket && this.socket.readyState === WebSocket.OPEN) {
+            return Promise.resolve(this.socket)
+        }
+
+        if (!this.opening) {
+            this.opening = new Promise((resolve, reject) => {
+                const socket = new WebSocket(this.url)
+                socket.onopen = () => {
+                    this.socket = socket
+                    resolve(socket)
+                }
+                socket.onmessage = (event) => this.handleMessage(JSON.parse(event.data))
+                socket.onerror = () => reject(new Error('면접 세션 연결에 실패했습니다.'))
+                socket.onclose = () => {
+                    // 결과를 기다리던 요청은 연결이 끊기면 실패로 끝내고, 다음 요청에서 다시 연결함
+                    this.socket = null
+                    this.opening = null
+                    this.pendingRequestMap.forEach((pendingRequest) =>
+                        pendingRequest.reject(new Error('면접 세션 연결이 끊겼습니다.')))
+                    this.pendingRequestMap.clear()
+                }
+            })
+        }
+
+        return this.opening
+    }
+
+    private handleMessage(message: any) {
+        const pendingRequest = this.pendingRequestMap.get(message.messageId)
+        if (!pendingRequest) {
+            return
+        }
+
+        if ('chunk' in message) {
+            pendingRequest.onChunk?.(message)
+            return
+        }
+
+        this.pendingRequestMap.delete(message.messageId)
+        if (message.error) {
+            pendingRequest.reject(new Error(message.error))
+        } else {
+            pendingRequest.resolve(message.result)
+        }
+    }
+}